@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
+
+from cache import CacheKey, ResultCache
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+DIR_NAME = "artifacts"
+
+
+class ArtifactStore:
+    """
+    Arrays parsed or precomputed from an input, saved as .npy files under
+    `dayN/{source hash}/{input hash}/{name}.npy`. Unlike results, artifacts don't
+    depend on the part, so part 2 reuses whatever part 1 saved. They're loaded
+    memory-mapped, so only the pages actually read are paid for. As with results,
+    least-recently-used artifacts are evicted past `max_bytes`.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def beside(cls, cache: ResultCache) -> ArtifactStore:
+        "A store kept alongside the result cache, sharing its size limit"
+        return cls(cache.root / DIR_NAME, cache.max_bytes)
+
+    def _day_dir(self, key: CacheKey) -> Path:
+        return self.root / f"day{key.day}"
+
+    def _path(self, key: CacheKey, name: str) -> Path:
+        return self._day_dir(key) / key.source_hash / key.input_hash / f"{name}.npy"
+
+    def _invalidate_stale(self, key: CacheKey):
+        "Drop artifacts for this day which were computed with different source"
+        day_dir = self._day_dir(key)
+        if not day_dir.is_dir():
+            return
+
+        import shutil
+
+        for src_dir in day_dir.iterdir():
+            if src_dir.name != key.source_hash:
+                shutil.rmtree(src_dir, ignore_errors=True)
+
+    def _evict(self):
+        entries = [(p, p.stat()) for p in self.root.glob("day*/*/*/*.npy")]
+        total = sum(st.st_size for _, st in entries)
+        for path, st in sorted(entries, key=lambda e: e[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= st.st_size
+
+    def load(self, key: CacheKey, name: str) -> Optional[NDArray[Any]]:
+        import numpy as np
+
+        path = self._path(key, name)
+        try:
+            arr = np.load(path, mmap_mode="r")
+        except (FileNotFoundError, ValueError):
+            return None
+
+        os.utime(path)
+        return arr
+
+    def save(self, key: CacheKey, name: str, arr: NDArray[Any]):
+        import numpy as np
+
+        self._invalidate_stale(key)
+        path = self._path(key, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # via a temporary file, so that concurrent readers never map partial data
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with tmp.open("wb") as f:
+            np.save(f, arr)
+        os.replace(tmp, path)
+        self._evict()
+
+
+_bound: Optional[tuple[ArtifactStore, CacheKey]] = None
+
+
+@contextmanager
+def bound(store: ArtifactStore, key: CacheKey) -> Iterator[None]:
+    "Save and load artifacts for the input identified by `key` while in this context"
+    global _bound
+    prev = _bound
+    _bound = (store, key)
+    try:
+        yield
+    finally:
+        _bound = prev
+
+
+def cached(name: str, compute: Callable[..., NDArray[Any]], *args: Any) -> NDArray[Any]:
+    """
+    The artifact `name` for the current input, computing it from `args` only if it
+    hasn't been saved yet. Loaded artifacts are read-only. With no store bound, this
+    always computes.
+    """
+    if _bound is None:
+        return compute(*args)
+
+    store, key = _bound
+    if (arr := store.load(key, name)) is not None:
+        return arr
+
+    arr = compute(*args)
+    store.save(key, name, arr)
+    return arr
@@ -0,0 +1,190 @@
+import io
+import json
+import re
+import statistics
+import time
+from contextlib import redirect_stdout
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+import click
+
+import memory
+from cli import adapt_input, get_mod, get_sol, iter_solutions, percentile
+from fastio import MappedInput
+
+Baseline = dict[str, dict[str, float]]
+
+
+@dataclass
+class Measurement:
+    median: float
+    p95: float
+    peak_mem: int
+    peak_rss: int
+
+
+def input_files(data_dir: Path, day: int) -> list[Path]:
+    "All inputs for the given day, i.e. dayN.txt as well as dayNtest*.txt"
+    pattern = re.compile(rf"day{day}(test\d*)?\.txt")
+    return sorted(p for p in data_dir.iterdir() if pattern.fullmatch(p.name))
+
+
+def iter_benchmarks(
+    data_dir: Path, days: tuple[int, ...], parts: tuple[int, ...]
+) -> Iterator[tuple[str, int, int, Path]]:
+    for day, part in iter_solutions():
+        if (days and day not in days) or (parts and part not in parts):
+            continue
+        # parts with the real input's details hardcoded can't be timed on examples
+        real_only = part in getattr(get_mod(day), "REAL_INPUT_ONLY", ())
+        for path in input_files(data_dir, day):
+            if real_only and path.stem != f"day{day}":
+                continue
+            yield (f"day{day}.part{part}:{path.name}", day, part, path)
+
+
+def run_once(day: int, part: int, inp: MappedInput) -> float:
+    sol = get_sol(day, part)
+    arg = adapt_input(day, inp)
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        sol(arg)
+        return time.perf_counter() - start
+
+
+def measure(day: int, part: int, path: Path, warmup: int, repeat: int) -> Measurement:
+    # Read the input up front so that disk I/O isn't part of the measurement
+    inp = MappedInput(path.read_bytes(), path)
+    for _ in range(warmup):
+        run_once(day, part, inp)
+
+    times = [run_once(day, part, inp) for _ in range(repeat)]
+
+    # tracing memory slows allocation-heavy code down considerably, so memory is
+    # captured in a separate run from the timed ones
+    with memory.tracking() as report:
+        run_once(day, part, inp)
+
+    return Measurement(
+        statistics.median(times),
+        percentile(times, 95),
+        report.peak_traced,
+        report.peak_rss,
+    )
+
+
+def load_baseline(path: Path) -> Baseline:
+    if not path.exists():
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def check_regression(
+    name: str, m: Measurement, baseline: Baseline, threshold: float
+) -> Optional[str]:
+    if (prev := baseline.get(name)) is None:
+        return None
+
+    limit = prev["median"] * (1 + threshold)
+    if m.median > limit:
+        return (
+            f"{name}: median {m.median:.4f}s exceeds baseline "
+            f"{prev['median']:.4f}s by more than {threshold:.0%}"
+        )
+    return None
+
+
+@click.command()
+@click.option("-d", "--day", "days", type=int, multiple=True)
+@click.option("-p", "--part", "parts", type=int, multiple=True)
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default="data",
+    show_default=True,
+)
+@click.option("--warmup", type=int, default=1, show_default=True)
+@click.option("--repeat", type=int, default=5, show_default=True)
+@click.option(
+    "--baseline",
+    "baseline_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default="bench_baseline.json",
+    show_default=True,
+)
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.25,
+    show_default=True,
+    help="Fail when a median is this fraction slower than its baseline.",
+)
+@click.option("--save", is_flag=True, help="Record the results as the new baseline.")
+def cli(
+    days: tuple[int, ...],
+    parts: tuple[int, ...],
+    data_dir: Path,
+    warmup: int,
+    repeat: int,
+    baseline_path: Path,
+    threshold: float,
+    save: bool,
+):
+    """
+    Time every part against each of its inputs, comparing medians to the baseline.
+    Exits with 1 if any regressed, 2 if any failed to run, or 3 if both. Benchmarks
+    with no baseline to compare to are listed, but don't fail.
+    """
+    if repeat < 1:
+        raise click.BadParameter("must be at least 1", param_hint="--repeat")
+
+    baseline = load_baseline(baseline_path)
+    results: Baseline = {}
+    errors: list[str] = []
+    regressions: list[str] = []
+    unchecked: list[str] = []
+
+    click.echo(
+        f"{'benchmark':<32} {'median':>10} {'p95':>10} {'peak mem':>12} "
+        f"{'peak RSS':>12}"
+    )
+    for name, day, part, path in iter_benchmarks(data_dir, days, parts):
+        try:
+            m = measure(day, part, path, warmup, repeat)
+        except Exception as e:
+            errors.append(f"{name}: {type(e).__name__}: {e}")
+            click.echo(f"{name:<32} {'ERROR':>10}")
+            continue
+
+        results[name] = asdict(m)
+        click.echo(
+            f"{name:<32} {m.median:>9.4f}s {m.p95:>9.4f}s "
+            f"{m.peak_mem / 1024:>9.0f} KiB {m.peak_rss / 1024:>9.0f} KiB"
+        )
+        if name not in baseline:
+            unchecked.append(name)
+        elif (regression := check_regression(name, m, baseline, threshold)) is not None:
+            regressions.append(regression)
+
+    if save:
+        with open(baseline_path, "w") as f:
+            json.dump(baseline | results, f, indent=2, sort_keys=True)
+
+    if unchecked and not save:
+        click.echo("No baseline for (record one with --save):", err=True)
+        for name in unchecked:
+            click.echo(f"  {name}", err=True)
+    for heading, failures in (("Regressions", regressions), ("Errors", errors)):
+        if failures:
+            click.echo(f"{heading}:", err=True)
+            for failure in failures:
+                click.echo(f"  {failure}", err=True)
+    if regressions or errors:
+        raise SystemExit((1 if regressions else 0) | (2 if errors else 0))
+
+
+if __name__ == "__main__":
+    cli()
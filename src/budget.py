@@ -0,0 +1,80 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import ContextManager, Iterator, Optional
+
+# Searches look at the clock only once every this many steps
+CHECK_EVERY = 1024
+
+
+@dataclass(frozen=True)
+class Outcome:
+    """
+    What a search found within its budget. `answer` is the best found so far, or
+    None if nothing feasible was found. `bound` is proven: the true answer is no
+    better than it. Both are equal when the answer is optimal.
+    """
+
+    answer: Optional[int]
+    bound: int
+
+    @property
+    def optimal(self) -> bool:
+        return self.answer == self.bound
+
+
+class Exhausted(Exception):
+    "The budget ran out before the search found any answer at all"
+
+    def __init__(self, outcome: Outcome):
+        super().__init__(f"time budget exhausted, answer is at least {outcome.bound}")
+        self.outcome = outcome
+
+
+# A wall-clock deadline, rather than a monotonic one, so that it means the same
+# thing in worker processes
+_deadline: Optional[float] = None
+_outcome: Optional[Outcome] = None
+
+
+@contextmanager
+def until(deadline: Optional[float]) -> Iterator[None]:
+    "Make searches within this context stop early at `deadline`, if there is one"
+    global _deadline, _outcome
+    prev = (_deadline, _outcome)
+    _deadline = deadline
+    _outcome = None
+    try:
+        yield
+    finally:
+        # so that a cut-short outcome isn't taken for that of later, unbudgeted parts
+        _deadline, _outcome = prev
+
+
+def limited(seconds: Optional[float]) -> ContextManager[None]:
+    "Give searches within this context `seconds` to finish, or forever if None"
+    return until(None if seconds is None else time.time() + seconds)
+
+
+def deadline() -> Optional[float]:
+    return _deadline
+
+
+def expired() -> bool:
+    return _deadline is not None and time.time() >= _deadline
+
+
+def settle(answer: int, bound: int) -> int:
+    "Record the outcome of a part's search under a budget, returning the answer"
+    global _outcome
+    if _deadline is not None:
+        _outcome = Outcome(answer, bound)
+    return answer
+
+
+def outcome(answer: int) -> Outcome:
+    """
+    The outcome of the part just solved within this budget, which returned `answer`.
+    Parts which never call `settle` are optimal whenever they return at all.
+    """
+    return _outcome or Outcome(answer, answer)
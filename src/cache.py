@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import mmap
+
+# hashlib and json are imported on first use, so that runs without a cache, which
+# still return Entry, don't pay for them
+
+DEFAULT_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "adventofcode2022"
+)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# The modules a line of source imports, whether inside a function or not
+IMPORT = re.compile(rb"^[ \t]*(?:from[ \t]+(\w+)[ \t]+import|import[ \t]+(\w+))", re.M)
+
+STATS_FILE = "stats.json"
+COUNTERS = ("hits", "misses", "evictions")
+
+
+def digest(data: bytes | mmap.mmap) -> str:
+    import hashlib
+
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    day: int
+    part: int
+    input_hash: str
+    source_hash: str
+
+
+@dataclass
+class Entry:
+    answer: int
+    output: str
+
+
+def source_files(path: Path) -> list[Path]:
+    """
+    The module at `path`, along with every module beside it that it imports, directly
+    or not, since a day's answers depend on the helpers it uses as much as its own code
+    """
+    found = set[Path]()
+    todo = [path]
+    while todo:
+        path = todo.pop()
+        if path in found:
+            continue
+        found.add(path)
+        for m in IMPORT.finditer(path.read_bytes()):
+            dep = path.with_name(f"{(m[1] or m[2]).decode()}.py")
+            if dep.is_file():
+                todo.append(dep)
+    return sorted(found)
+
+
+def source_digest(path: Path) -> str:
+    import hashlib
+
+    h = hashlib.sha256()
+    for src in source_files(path):
+        h.update(src.name.encode() + b"\0" + hashlib.sha256(src.read_bytes()).digest())
+    return h.hexdigest()
+
+
+# The source hash of each module as it was when imported. That's the code its results
+# actually come from, whatever is on disk by now.
+_imported: dict[str, str] = {}
+# Whether this process has a ResultCache, and so keys results as days are imported.
+# Merely importing this module, say for Entry, doesn't count.
+opened = False
+
+
+def source_hash(mod: ModuleType) -> str:
+    """
+    The hash of the source `mod` was imported with. It's recorded the first time it's
+    asked for, which cli.get_mod does straight after importing each day.
+    """
+    if mod.__name__ not in _imported:
+        assert mod.__file__ is not None
+        _imported[mod.__name__] = source_digest(Path(mod.__file__))
+    return _imported[mod.__name__]
+
+
+def is_stale(mod: ModuleType) -> bool:
+    "Whether the source on disk has changed since `mod` was imported"
+    assert mod.__file__ is not None
+    return source_hash(mod) != source_digest(Path(mod.__file__))
+
+
+def make_key(day: int, part: int, data: bytes | mmap.mmap, mod: ModuleType) -> CacheKey:
+    return CacheKey(day, part, digest(data), source_hash(mod))
+
+
+def write_atomic(path: Path, s: str):
+    "Write via a temporary file so that concurrent readers never see partial data"
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(s)
+    os.replace(tmp, path)
+
+
+class ResultCache:
+    """
+    Content-addressed cache of solution results. Entries live under
+    `dayN/{source hash}/partK-{input hash}.json`, so that changing a day's source
+    leaves other days' entries alone. The source hash covers the local modules a day
+    imports too. Least-recently-used entries (by mtime, which is
+    bumped on every hit) are evicted once the cache grows past `max_bytes`.
+    """
+
+    def __init__(self, root: Path = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        global opened
+        opened = True
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def __setstate__(self, state: dict):
+        # Worker processes get the cache by pickle, which skips __init__
+        global opened
+        opened = True
+        self.__dict__.update(state)
+
+    def _day_dir(self, day: int) -> Path:
+        return self.root / f"day{day}"
+
+    def _path(self, key: CacheKey) -> Path:
+        return (
+            self._day_dir(key.day)
+            / key.source_hash
+            / f"part{key.part}-{key.input_hash}.json"
+        )
+
+    def _entries(self) -> list[Path]:
+        return list(self.root.glob("day*/*/part*.json"))
+
+    def _invalidate_stale(self, key: CacheKey):
+        "Drop entries for this day which were computed with different source"
+        day_dir = self._day_dir(key.day)
+        if not day_dir.is_dir():
+            return
+
+        import shutil
+
+        for src_dir in day_dir.iterdir():
+            if src_dir.name != key.source_hash:
+                shutil.rmtree(src_dir, ignore_errors=True)
+
+    def _evict(self):
+        entries = [(p, p.stat()) for p in self._entries()]
+        total = sum(st.st_size for _, st in entries)
+        evicted = 0
+        for path, st in sorted(entries, key=lambda e: e[1].st_mtime):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= st.st_size
+            evicted += 1
+
+        if evicted:
+            self._record(evictions=evicted)
+
+    def get(self, key: CacheKey) -> Optional[Entry]:
+        import json
+
+        path = self._path(key)
+        try:
+            entry = Entry(**json.loads(path.read_text()))
+        except (FileNotFoundError, json.JSONDecodeError, TypeError):
+            self._record(misses=1)
+            return None
+
+        os.utime(path)
+        self._record(hits=1)
+        return entry
+
+    def put(self, key: CacheKey, entry: Entry):
+        import json
+
+        self._invalidate_stale(key)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, json.dumps(asdict(entry)))
+        self._evict()
+
+    def _counts(self) -> dict[str, int]:
+        import json
+
+        try:
+            counts = json.loads((self.root / STATS_FILE).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            counts = {}
+        return {name: counts.get(name, 0) for name in COUNTERS}
+
+    def _record(self, **deltas: int):
+        "Accumulate hit/miss/eviction counts. Concurrent updates may be lost."
+        import json
+
+        counts = self._counts()
+        for name, delta in deltas.items():
+            counts[name] += delta
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.root / STATS_FILE, json.dumps(counts))
+
+    def stats(self) -> dict[str, int]:
+        entries = self._entries()
+        return self._counts() | {
+            "entries": len(entries),
+            "bytes": sum(p.stat().st_size for p in entries),
+        }
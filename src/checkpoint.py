@@ -0,0 +1,112 @@
+import os
+import pickle
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from cache import CacheKey
+from shard import Shard
+
+DIR_NAME = "checkpoints"
+
+# Seconds between saves, by default
+INTERVAL = 60.0
+
+# Loops with cheap iterations should only ask whether a save is due every this many
+CHECK_EVERY = 4096
+
+
+class CheckpointStore:
+    """
+    Solver state saved part way through a long-running part, so that a rerun after
+    a crash can carry on from there. There's one checkpoint per part, input and
+    shard, at `dayN/partK-{input hash}.pickle`, with `-shardIofN` added when sharded.
+    Each records the source hash it was saved with, and is ignored once the day's
+    source changes.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def _path(self, key: CacheKey, shard: Optional[Shard] = None) -> Path:
+        name = f"part{key.part}-{key.input_hash}"
+        if shard is not None:
+            name += f"-shard{shard.index}of{shard.count}"
+        return self.root / f"day{key.day}" / f"{name}.pickle"
+
+    def load(self, key: CacheKey, shard: Optional[Shard] = None) -> Optional[Any]:
+        try:
+            source_hash, state = pickle.loads(self._path(key, shard).read_bytes())
+        except (FileNotFoundError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        return state if source_hash == key.source_hash else None
+
+    def save(self, key: CacheKey, state: Any, shard: Optional[Shard] = None):
+        path = self._path(key, shard)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # via a temporary file, so that dying part way through a save loses nothing
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(pickle.dumps((key.source_hash, state)))
+        os.replace(tmp, path)
+
+    def clear(self, key: CacheKey, shard: Optional[Shard] = None):
+        self._path(key, shard).unlink(missing_ok=True)
+
+
+@dataclass
+class Binding:
+    store: CheckpointStore
+    key: CacheKey
+    shard: Optional[Shard]
+    resume: bool
+    interval: float
+    next_save: float
+
+
+_bound: Optional[Binding] = None
+
+
+@contextmanager
+def bound(
+    store: CheckpointStore,
+    key: CacheKey,
+    resume: bool,
+    interval: Optional[float] = None,
+    shard: Optional[Shard] = None,
+) -> Iterator[None]:
+    """
+    Save checkpoints for the part identified by `key`, or for just the given shard of
+    it, every `interval` seconds, or INTERVAL if None, while in this context, and if
+    resuming, start from the last one saved
+    """
+    global _bound
+    if interval is None:
+        interval = INTERVAL
+    prev = _bound
+    _bound = Binding(store, key, shard, resume, interval, time.monotonic() + interval)
+    try:
+        yield
+    finally:
+        _bound = prev
+
+
+def load() -> Optional[Any]:
+    "The state last saved for this part, if resuming from it, otherwise None"
+    if _bound is None or not _bound.resume:
+        return None
+    return _bound.store.load(_bound.key, _bound.shard)
+
+
+def due() -> bool:
+    "Whether it's time to save another checkpoint"
+    return _bound is not None and time.monotonic() >= _bound.next_save
+
+
+def save(state: Any):
+    "Save the state needed to carry on from here. Does nothing unless bound."
+    if _bound is None:
+        return
+    _bound.store.save(_bound.key, state, _bound.shard)
+    _bound.next_save = time.monotonic() + _bound.interval
@@ -1,29 +1,907 @@
-import logging
-from importlib import import_module
+from __future__ import annotations
+
+import io
+import math
+import os
+import sys
+import time
+from contextlib import nullcontext, redirect_stdout
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
 from types import ModuleType
-from typing import Callable, TextIO
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Iterable,
+    Iterator,
+    Literal,
+    Optional,
+    TextIO,
+)
 
 import click
 
+import stats
+import timing
+
+if TYPE_CHECKING:
+    # These are imported only by the commands which use them, so that a plain run
+    # doesn't pay for hashing, profiling, progress or sharding machinery
+    from cache import Entry, ResultCache
+    from fastio import MappedInput
+    from shard import Shard
+
+# The days which take the longest to solve. These are scheduled first in batch mode so
+# that they don't end up as stragglers once everything else has finished.
+SLOW_DAYS = (16, 19, 20, 24)
+
+# Mirror executor.KINDS, profiling.PROFILERS and progress.MODES, which aren't
+# imported unless they're used
+EXECUTOR_KINDS = ("serial", "thread", "process")
+PROFILERS = ("cprofile", "line", "sample")
+PROGRESS_MODES = ("auto", "bar", "json", "off")
+
+# Every part of a day at once, through its `solve` hook if it has one
+ALL_PARTS = "all"
+Part = int | Literal["all"]
+
 
 def get_mod(n: int) -> ModuleType:
-    return import_module(f"day{n}")
+    # Unlike importlib.import_module, __import__ is visible to -X importtime
+    mod = __import__(f"day{n}")
+    # Results are keyed by the source the day was imported with, so note it right
+    # away whenever there's a cache to key them in. Otherwise it's noted when first
+    # asked for.
+    if (cache := sys.modules.get("cache")) is not None and cache.opened:
+        cache.source_hash(mod)
+    return mod
 
 
-def get_sol(day: int, part: int) -> Callable[[TextIO], int]:
+def get_sol(day: int, part: int) -> Callable[[Any], int]:
     return getattr(get_mod(day), f"part{part}")
 
 
+def adapt_input(day: int, inp: MappedInput) -> TextIO | MappedInput:
+    "Solutions take text, unless their module opts in to the raw mapped input"
+    if getattr(get_mod(day), "MAPPED_INPUT", False):
+        return inp
+    return inp.text()
+
+
+def day_parts(day: int) -> list[int]:
+    mod = get_mod(day)
+    parts = []
+    while hasattr(mod, f"part{len(parts) + 1}"):
+        parts.append(len(parts) + 1)
+    return parts
+
+
+def iter_solutions() -> Iterator[tuple[int, int]]:
+    "Yield (day, part) for every solution module, starting from day 1"
+    day = 1
+    while True:
+        try:
+            parts = day_parts(day)
+        except ModuleNotFoundError as e:
+            if e.name != f"day{day}":
+                raise
+            return
+
+        for part in parts:
+            yield (day, part)
+
+        day += 1
+
+
+def solve_all(day: int, inp: MappedInput) -> list[int]:
+    """
+    Answer every part of a day. A day's `solve` hook, if it has one, parses the input
+    once and returns every part's answer; otherwise each part is run in turn.
+    """
+    if (solve := getattr(get_mod(day), "solve", None)) is not None:
+        return list(solve(adapt_input(day, inp)))
+    return [get_sol(day, part)(adapt_input(day, inp)) for part in day_parts(day)]
+
+
+@dataclass
+class Result:
+    day: int
+    part: int
+    answer: Optional[int] = None
+    output: str = ""
+    wall: float = 0.0
+    cpu: float = 0.0
+    error: Optional[str] = None
+    cached: bool = False
+    # timed together with the day's other parts, as one run
+    joint: bool = False
+
+
+def cpu_time() -> float:
+    "CPU time used by this process, plus any children (e.g. worker pools) it reaped"
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def run_captured(
+    day: int, inp: MappedInput, sol: Callable[[Any], Any]
+) -> tuple[Any, str]:
+    "Pass the input to a solution, returning what it returns and anything it printed"
+    out = io.StringIO()
+    with redirect_stdout(out):
+        with timing.phase(timing.PARSE):
+            arg = adapt_input(day, inp)
+        # anything the solution doesn't attribute to a phase of its own is solving
+        with timing.phase(timing.SOLVE):
+            res = sol(arg)
+    return (res, out.getvalue())
+
+
+def optimal(answer: int) -> bool:
+    "Whether an answer is certain, rather than the best found within a time budget"
+    # without importing budget just to find out, since only searches under one do
+    budget = sys.modules.get("budget")
+    return budget is None or budget.outcome(answer).optimal
+
+
+def call_sol(
+    day: int, part: int, inp: MappedInput, cache: Optional[ResultCache] = None
+) -> tuple[Entry, bool]:
+    """
+    Run a solution, returning its answer along with anything it printed, and whether
+    the result came from the cache. On a miss, the solution can reuse artifacts saved
+    by earlier runs against the same input, including of the other part.
+    """
+    store: ContextManager[None] = nullcontext()
+    if cache is not None:
+        from cache import make_key
+
+        key = make_key(day, part, inp.data, get_mod(day))
+        if (entry := cache.get(key)) is not None:
+            return (entry, True)
+
+        import artifacts
+
+        store = artifacts.bound(artifacts.ArtifactStore.beside(cache), key)
+
+    from cache import Entry
+
+    with store:
+        answer, output = run_captured(day, inp, get_sol(day, part))
+    # numpy-backed solutions may hand back numpy integers
+    entry = Entry(int(answer), output)
+
+    # an answer cut short by the time budget might not be the right one
+    if cache is not None and optimal(entry.answer):
+        cache.put(key, entry)
+    return (entry, False)
+
+
+def call_all(
+    day: int, inp: MappedInput, cache: Optional[ResultCache] = None
+) -> list[tuple[Entry, bool]]:
+    """
+    Run every part of a day, returning what call_sol would for each. A day with a
+    `solve` hook answers all of them from one parse, and anything it prints is
+    attributed to the last part.
+    """
+    mod = get_mod(day)
+    if not hasattr(mod, "solve"):
+        return [call_sol(day, part, inp, cache) for part in day_parts(day)]
+
+    from cache import Entry
+
+    store: ContextManager[None] = nullcontext()
+    if cache is not None:
+        from cache import make_key
+
+        key = make_key(day, 0, inp.data, mod)
+        keys = [replace(key, part=part) for part in day_parts(day)]
+        entries = [cache.get(key) for key in keys]
+        if all(entry is not None for entry in entries):
+            return [(entry, True) for entry in entries if entry is not None]
+
+        import artifacts
+
+        store = artifacts.bound(artifacts.ArtifactStore.beside(cache), key)
+
+    with store:
+        answers, output = run_captured(day, inp, mod.solve)
+    entries = [Entry(int(answer), "") for answer in answers]
+    entries[-1].output = output
+
+    if cache is not None:
+        for key, entry in zip(keys, entries):
+            cache.put(key, entry)
+    return [(entry, False) for entry in entries]
+
+
+def run_parts(
+    day: int, part: Part, source: Path | bytes, cache: Optional[ResultCache] = None
+) -> list[Result]:
+    """
+    Run a solution against the given input file or raw input, capturing anything it
+    prints along with its answer and timing, or with ALL_PARTS, every part of the day
+    as one. Errors are recorded rather than raised, so that one failing solution
+    doesn't take down a whole batch.
+    """
+    from fastio import MappedInput
+
+    parts = day_parts(day) if part == ALL_PARTS else [part]
+    results = [Result(day, p, joint=part == ALL_PARTS) for p in parts]
+    start_wall = time.perf_counter()
+    start_cpu = cpu_time()
+    try:
+        if isinstance(source, bytes):
+            inp = MappedInput(source)
+        else:
+            inp = MappedInput.open(source)
+        with inp:
+            if part == ALL_PARTS:
+                solved = call_all(day, inp, cache)
+            else:
+                solved = [call_sol(day, part, inp, cache)]
+        for res, (entry, cached) in zip(results, solved):
+            res.answer = entry.answer
+            res.output = entry.output
+            res.cached = cached
+    except Exception as e:
+        for res in results:
+            res.error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - start_wall
+    cpu = cpu_time() - start_cpu
+    for res in results:
+        res.wall = wall
+        res.cpu = cpu
+    return results
+
+
+def schedule(sols: Iterable[tuple[int, Part]]) -> list[tuple[int, Part]]:
+    "Order solutions so that the slowest days are started first"
+    return sorted(
+        sols,
+        key=lambda sol: (
+            SLOW_DAYS.index(sol[0]) if sol[0] in SLOW_DAYS else len(SLOW_DAYS),
+            sol,
+        ),
+    )
+
+
+def run_batch(
+    sols: Iterable[tuple[int, Part]],
+    data_dir: Path,
+    jobs: Optional[int],
+    cache: Optional[ResultCache],
+) -> list[Result]:
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    import executor
+
+    # each worker solves with the executor settings chosen in this process
+    settings = (executor.kind(), executor.workers())
+    with ProcessPoolExecutor(
+        jobs, initializer=executor.configure, initargs=settings
+    ) as ex:
+        fs = [
+            ex.submit(run_parts, day, part, data_dir / f"day{day}.txt", cache)
+            for day, part in schedule(sols)
+        ]
+        results = [res for f in as_completed(fs) for res in f.result()]
+
+    return sorted(results, key=lambda res: (res.day, res.part))
+
+
+def format_table(results: Iterable[Result]) -> str:
+    lines = [f"{'day':>3} {'part':>4} {'answer':>20} {'wall':>9} {'cpu':>9}"]
+    for res in results:
+        answer = "ERROR" if res.error is not None else str(res.answer)
+        lines.append(
+            f"{res.day:>3} {res.part:>4} {answer:>20} "
+            f"{res.wall:>8.3f}s {res.cpu:>8.3f}s"
+            f"{' (cached)' if res.cached else ''}{' (joint)' if res.joint else ''}"
+        )
+    return "\n".join(lines)
+
+
+def batch(
+    day: Optional[int],
+    part: Optional[Part],
+    data_dir: Path,
+    jobs: Optional[int],
+    cache: Optional[ResultCache],
+) -> None:
+    sols: list[tuple[int, Part]] = [
+        (d, p)
+        for d, p in iter_solutions()
+        if (day is None or d == day) and (part in (None, ALL_PARTS) or p == part)
+    ]
+    if part == ALL_PARTS:
+        # each day as a whole, with its parts solved together
+        sols = [(d, ALL_PARTS) for d in dict.fromkeys(d for d, _ in sols)]
+
+    start_wall = time.perf_counter()
+    start_cpu = cpu_time()
+    results = run_batch(sols, data_dir, jobs, cache)
+    wall = time.perf_counter() - start_wall
+    cpu = cpu_time() - start_cpu
+
+    import json
+
+    click.echo(format_table(results), err=True)
+    click.echo(f"total: {wall:.3f}s wall, {cpu:.3f}s cpu", err=True)
+    for res in results:
+        if res.error is not None:
+            click.echo(f"day {res.day} part {res.part} failed: {res.error}", err=True)
+
+    summary = {"wall": wall, "cpu": cpu, "results": [asdict(res) for res in results]}
+    print(json.dumps(summary, indent=2))
+
+
+def expand_inputs(pattern: str) -> Iterator[Path]:
+    "The files in a directory, or matching a glob, in order"
+    import glob
+
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*")
+    for name in sorted(glob.iglob(os.path.expanduser(pattern), recursive=True)):
+        if os.path.isfile(name):
+            yield Path(name)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    "Nearest-rank percentile"
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def run_inputs(
+    day: int,
+    part: Part,
+    paths: Iterable[Path],
+    jobs: Optional[int],
+    cache: Optional[ResultCache],
+) -> Iterator[tuple[Path, list[Result]]]:
+    """
+    Run a solution against each input across a pool of processes, yielding each
+    input's results as they finish. Only a few inputs per worker are in flight at
+    once, so memory stays bounded however many inputs there are.
+    """
+    from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+    import executor
+
+    max_in_flight = 2 * (jobs or os.cpu_count() or 1)
+    settings = (executor.kind(), executor.workers())
+    with ProcessPoolExecutor(
+        jobs, initializer=executor.configure, initargs=settings
+    ) as ex:
+        in_flight: dict[Future[list[Result]], Path] = {}
+        paths = iter(paths)
+        while True:
+            for path in paths:
+                in_flight[ex.submit(run_parts, day, part, path, cache)] = path
+                if len(in_flight) >= max_in_flight:
+                    break
+            if not in_flight:
+                return
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for f in done:
+                yield (in_flight.pop(f), f.result())
+
+
+def fan_out(
+    day: int,
+    part: Part,
+    pattern: str,
+    jobs: Optional[int],
+    cache: Optional[ResultCache],
+) -> None:
+    import json
+
+    latencies: list[float] = []
+    failures = 0
+    start = time.perf_counter()
+    for path, results in run_inputs(day, part, expand_inputs(pattern), jobs, cache):
+        # an input's parts are timed together when run jointly
+        latencies.append(results[0].wall)
+        failures += any(res.error is not None for res in results)
+        for res in results:
+            print(json.dumps({"input": str(path)} | asdict(res)), flush=True)
+    wall = time.perf_counter() - start
+
+    if not latencies:
+        raise click.ClickException(f"No inputs match {pattern}")
+    click.echo(
+        f"{len(latencies)} inputs ({failures} failed) in {wall:.3f}s: "
+        f"{len(latencies) / wall:.1f} inputs/s",
+        err=True,
+    )
+    click.echo(
+        "latency: "
+        + ", ".join(
+            f"p{pct} {percentile(latencies, pct):.4f}s" for pct in (50, 90, 99, 100)
+        ),
+        err=True,
+    )
+
+
+def stream_input(day: int, part: Part, input: Path, interval: float, follow: bool):
+    import streaming
+
+    mod = get_mod(day)
+    if not hasattr(mod, "Stream"):
+        raise click.ClickException(f"Day {day} doesn't support --stream")
+    parts = day_parts(day) if part == ALL_PARTS else [part]
+
+    if str(input) == "-":
+        streaming.run(mod.Stream(), sys.stdin.buffer, parts, sys.stdout, interval)
+    else:
+        with open(input, "rb") as f:
+            streaming.run(mod.Stream(), f, parts, sys.stdout, interval, follow)
+
+
+def parse_part(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[Part]:
+    if value is None or value == ALL_PARTS:
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        raise click.BadParameter(f"must be a part number or {ALL_PARTS!r}")
+
+
+def parse_shard(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[Shard]:
+    if value is None:
+        return None
+
+    from shard import Shard
+
+    try:
+        return Shard.parse(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
 @click.command()
-@click.option("-d", "--day", required=True, type=int)
-@click.option("-p", "--part", required=True, type=int)
+@click.option("-d", "--day", type=int)
+@click.option(
+    "-p",
+    "--part",
+    callback=parse_part,
+    help=f"A part number, or {ALL_PARTS!r} to solve every part of the day together.",
+)
 @click.option("-v", "--verbose", is_flag=True, type=bool)
-@click.argument("input", type=click.File(mode="r"))
-def cli(day: int, part: int, verbose: bool, input: TextIO):
-    logging.basicConfig(level=logging.DEBUG if verbose else logging.WARNING)
+@click.option(
+    "-a",
+    "--all",
+    "run_all",
+    is_flag=True,
+    help="Run every solution against data/dayN.txt, optionally filtered by day/part.",
+)
+@click.option(
+    "--data-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default="data",
+    show_default=True,
+)
+@click.option(
+    "--inputs",
+    help="Run --day/--part against every file in this directory, or matching this "
+    "glob, streaming a JSON line per input.",
+)
+@click.option("-j", "--jobs", type=int, help="Worker processes for --all/--inputs.")
+@click.option(
+    "--executor",
+    "executor_kind",
+    type=click.Choice(EXECUTOR_KINDS),
+    help="How solutions parallelize their work. Defaults to serial when profiling, "
+    "timing or tracing memory, otherwise process.",
+)
+@click.option("--workers", type=int, help="Workers for the solution's executor.")
+@click.option("--profile", "profiler", type=click.Choice(PROFILERS))
+@click.option(
+    "--profile-out",
+    type=click.Path(dir_okay=False),
+    help="Profile output path. Defaults to dayN.partK.{prof,lprof,folded}.",
+)
+@click.option(
+    "--profile-func",
+    "profile_funcs",
+    multiple=True,
+    help="Function to line-profile, e.g. day20.Node.swap. May be repeated.",
+)
+@click.option(
+    "--sample-interval",
+    type=float,
+    default=0.005,
+    show_default=True,
+    help="Seconds between stack samples with --profile=sample.",
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    help="Report a JSON breakdown of time spent parsing, precomputing and solving.",
+)
+@click.option(
+    "--memory",
+    "memory_report",
+    is_flag=True,
+    help="Report peak RSS and the top allocation sites.",
+)
+@click.option(
+    "--stats",
+    "stats_report",
+    is_flag=True,
+    help="Report how much work searches did: states explored, pruning, memo hits and "
+    "visited-set sizes, with rates per second.",
+)
+@click.option(
+    "--time-budget",
+    type=float,
+    help="Seconds to give a single part. Searches which run out of time answer with "
+    "the best found so far, reporting a bound and whether it's optimal as JSON.",
+)
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Carry on from the last checkpoint saved by an interrupted run of the same "
+    "part and input.",
+)
+@click.option(
+    "--checkpoint-interval",
+    type=float,
+    help="Seconds between checkpoints of long-running parts, kept beside the cache. "
+    "0 checkpoints as often as possible. Defaults to once a minute.",
+)
+@click.option(
+    "--shard",
+    "selected_shard",
+    callback=parse_shard,
+    help="Only do the i/n'th slice of a part's work, counting from 0, and write its "
+    "partial answer as JSON for `merge` to combine with the other slices'. Only some "
+    "parts support this.",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Always recompute, bypassing cached results and precomputed artifacts.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    envvar="AOC_CACHE_DIR",
+    help="Defaults to adventofcode2022 in $XDG_CACHE_HOME or ~/.cache.",
+)
+@click.option(
+    "--cache-size",
+    type=int,
+    help="Size in MiB beyond which least-recently-used results are evicted. Defaults "
+    "to 64.",
+)
+@click.option("--cache-stats", is_flag=True, help="Report cache statistics on exit.")
+@click.option(
+    "--stream",
+    is_flag=True,
+    help="Read INPUT (or - for stdin) a line at a time, reporting running answers as "
+    "JSON lines. Only some days support this.",
+)
+@click.option(
+    "--follow",
+    is_flag=True,
+    help="With --stream, keep waiting for lines appended to INPUT, like tail -f.",
+)
+@click.option(
+    "--stream-interval",
+    type=float,
+    default=1.0,
+    show_default=True,
+    help="Seconds between reports with --stream.",
+)
+@click.option(
+    "--progress",
+    "progress_mode",
+    type=click.Choice(PROGRESS_MODES),
+    default="auto",
+    show_default=True,
+    help="How long-running solutions report progress: a bar, JSON lines for metrics, "
+    "or not at all. auto draws a bar on a terminal. Always off with --all/--inputs.",
+)
+@click.option(
+    "--progress-out",
+    type=click.File("w"),
+    help="Where to report progress. Defaults to stderr.",
+)
+@click.option(
+    "--startup-report",
+    is_flag=True,
+    help="Re-run under -X importtime and report import times grouped by day.",
+)
+@click.argument(
+    "input",
+    type=click.Path(dir_okay=False, allow_dash=True, path_type=Path),
+    required=False,
+)
+def cli(
+    day: Optional[int],
+    part: Optional[Part],
+    verbose: bool,
+    run_all: bool,
+    data_dir: Path,
+    inputs: Optional[str],
+    jobs: Optional[int],
+    executor_kind: Optional[str],
+    workers: Optional[int],
+    profiler: Optional[str],
+    profile_out: Optional[str],
+    profile_funcs: tuple[str, ...],
+    sample_interval: float,
+    timings: bool,
+    memory_report: bool,
+    stats_report: bool,
+    time_budget: Optional[float],
+    resume: bool,
+    checkpoint_interval: Optional[float],
+    selected_shard: Optional[Shard],
+    no_cache: bool,
+    cache_dir: Optional[Path],
+    cache_size: Optional[int],
+    cache_stats: bool,
+    stream: bool,
+    follow: bool,
+    stream_interval: float,
+    progress_mode: str,
+    progress_out: Optional[TextIO],
+    startup_report: bool,
+    input: Optional[Path],
+):
+    if startup_report:
+        import importtime
+
+        args = [arg for arg in sys.argv[1:] if arg != "--startup-report"]
+        sys.exit(importtime.run_with_report(__file__, args))
+
     if verbose:
+        # Only pay for importing logging when it's wanted
+        import logging
+
+        logging.basicConfig(level=logging.DEBUG)
         logging.info("Enabling verbose logging")
-    print(get_sol(day, part)(input))
+
+    # Stats are merged back from worker processes, so unlike the other measurements
+    # they don't need the work kept in this one
+    tracing = profiler is not None or timings or memory_report
+    measuring = tracing or stats_report
+    if follow and not stream:
+        raise click.UsageError("--follow requires --stream")
+    if stream and (run_all or inputs is not None or measuring):
+        raise click.UsageError(
+            "--stream cannot be combined with --all, --inputs, --profile, --timings, "
+            "--memory or --stats"
+        )
+
+    if run_all or inputs is not None:
+        flag = "--all" if run_all else "--inputs"
+        if run_all and inputs is not None:
+            raise click.UsageError("--all cannot be combined with --inputs")
+        if measuring:
+            raise click.UsageError(
+                f"--profile, --timings, --memory and --stats cannot be combined with "
+                f"{flag}"
+            )
+        if inputs is not None and (day is None or part is None):
+            raise click.UsageError("--inputs requires --day and --part")
+    elif day is None or part is None or input is None:
+        raise click.UsageError(
+            "--day, --part and INPUT are required without --all or --inputs"
+        )
+    elif profiler == "line" and not profile_funcs:
+        raise click.UsageError("--profile=line requires at least one --profile-func")
+    elif profiler is not None and stats_report:
+        raise click.UsageError("--stats cannot be combined with --profile")
+    if time_budget is not None and (
+        run_all or inputs is not None or stream or profiler is not None
+    ):
+        raise click.UsageError(
+            "--time-budget cannot be combined with --all, --inputs, --stream or "
+            "--profile"
+        )
+    if time_budget is not None and part == ALL_PARTS:
+        raise click.UsageError(
+            f"--time-budget applies to a single part, not {ALL_PARTS!r}"
+        )
+    if resume and (run_all or inputs is not None or stream or profiler is not None):
+        raise click.UsageError(
+            "--resume cannot be combined with --all, --inputs, --stream or --profile"
+        )
+    if resume and part == ALL_PARTS:
+        raise click.UsageError(f"--resume applies to a single part, not {ALL_PARTS!r}")
+    if selected_shard is not None:
+        if run_all or inputs is not None or stream or profiler is not None:
+            raise click.UsageError(
+                "--shard cannot be combined with --all, --inputs, --stream or "
+                "--profile"
+            )
+        assert day is not None and part is not None
+        if part not in getattr(get_mod(day), "SHARDS", {}):
+            raise click.UsageError(f"Day {day} part {part} doesn't support --shard")
+
+    # Measuring a cache hit would be pointless, and a shard's answer isn't the part's.
+    # The cache is set up before the day is imported, so that it notes the day's
+    # source as imported.
+    cache: Optional[ResultCache] = None
+    if not no_cache and not measuring and selected_shard is None:
+        from cache import DEFAULT_DIR, DEFAULT_MAX_BYTES, ResultCache
+
+        cache = ResultCache(
+            cache_dir or DEFAULT_DIR,
+            DEFAULT_MAX_BYTES if cache_size is None else cache_size * 1024 * 1024,
+        )
+
+    # Profilers, timers and memory tracing only see the main process, so keep the
+    # work there unless asked not to. Likewise when each input already has a worker
+    # process of its own.
+    if executor_kind is None:
+        executor_kind = "serial" if tracing or inputs is not None else "process"
+    # Only days which parallelize import the executor, so there's nothing to configure
+    # unless the day has imported it by now. Batches configure their workers from it.
+    if not (run_all or inputs is not None):
+        assert day is not None
+        get_mod(day)
+    if run_all or inputs is not None or "executor" in sys.modules:
+        import executor
+
+        executor.configure(executor_kind, workers)
+
+    # Batch workers are forked from this process, so only report progress when
+    # there's a single solution to report on. Likewise only days which report progress
+    # or shard their work import those, which they have by now.
+    if not (run_all or inputs is not None) and "progress" in sys.modules:
+        import progress
+
+        sink = progress.sink_for(progress_mode, progress_out or sys.stderr)
+        progress.configure(sink)
+    if selected_shard is not None or "shard" in sys.modules:
+        import shard
+
+        shard.configure(selected_shard)
+
+    if stream:
+        assert day is not None and part is not None and input is not None
+        stream_input(day, part, input, stream_interval, follow)
+    elif run_all:
+        batch(day, part, data_dir, jobs, cache)
+    elif inputs is not None:
+        assert day is not None and part is not None
+        fan_out(day, part, inputs, jobs, cache)
+    elif profiler is not None:
+        import profiling
+        from fastio import MappedInput
+
+        out = profile_out or profiling.default_out(profiler, day, part)
+        try:
+            with MappedInput.open(input) as inp, profiling.profiled(
+                profiler, out, profile_funcs, sample_interval
+            ):
+                if part == ALL_PARTS:
+                    answers = solve_all(day, inp)
+                else:
+                    answers = [get_sol(day, part)(adapt_input(day, inp))]
+        except ImportError as e:
+            raise click.ClickException(str(e))
+
+        click.echo(f"Wrote {profiler} profile to {out}", err=True)
+        for answer in answers:
+            print(answer)
+    else:
+        from fastio import MappedInput
+
+        if timings:
+            timing.enable()
+        if stats_report:
+            stats.enable()
+        tracker: ContextManager[Any] = nullcontext()
+        if memory_report:
+            import memory
+
+            tracker = memory.tracking()
+
+        start = time.perf_counter()
+        outcome = None
+        with MappedInput.open(input) as inp, tracker as report:
+            if part == ALL_PARTS:
+                solved = call_all(day, inp, cache)
+            else:
+                import budget
+
+                # The cache keys its own entries, so the key here is only hashed for
+                # checkpoints and shards. Only days which checkpoint import checkpoint,
+                # which they have by now. Checkpoints are kept until the part finishes
+                # with the right answer.
+                key = None
+                if "checkpoint" in sys.modules or selected_shard is not None:
+                    from cache import make_key
+
+                    key = make_key(day, part, inp.data, get_mod(day))
+                checkpoints = None
+                binding: ContextManager[None] = nullcontext()
+                if "checkpoint" in sys.modules:
+                    import checkpoint
+                    from cache import DEFAULT_DIR
+
+                    checkpoints = checkpoint.CheckpointStore(
+                        (cache_dir or DEFAULT_DIR) / checkpoint.DIR_NAME
+                    )
+                    binding = checkpoint.bound(
+                        checkpoints, key, resume, checkpoint_interval, selected_shard
+                    )
+                with binding, budget.limited(time_budget):
+                    try:
+                        solved = [call_sol(day, part, inp, cache)]
+                        outcome = budget.outcome(solved[0][0].answer)
+                    except budget.Exhausted as e:
+                        solved, outcome = [], e.outcome
+                if checkpoints is not None and outcome.optimal:
+                    checkpoints.clear(key, selected_shard)
+        wall = time.perf_counter() - start
+        if selected_shard is not None:
+            import json
+
+            import shard
+
+            assert outcome is not None and outcome.answer is not None
+            assert key is not None
+            combine = get_mod(day).SHARDS[part]
+            rec = shard.record(
+                selected_shard, key, combine, outcome.answer, outcome.bound
+            )
+            print(json.dumps(rec))
+        else:
+            for entry, _ in solved:
+                print(entry.output, end="")
+                print(entry.answer)
+
+        if memory_report:
+            click.echo(report.format(), err=True)
+
+        if timings:
+            import json
+
+            report = {
+                "day": day,
+                "part": part,
+                "wall": wall,
+                "phases": timing.results(),
+            }
+            click.echo(json.dumps(report, indent=2), err=True)
+
+        if stats_report:
+            import json
+
+            report = {"day": day, "part": part, "wall": wall} | stats.report(wall)
+            click.echo(json.dumps(report, indent=2), err=True)
+
+        if time_budget is not None:
+            import json
+
+            assert outcome is not None
+            report = {"day": day, "part": part} | asdict(outcome)
+            report["optimal"] = outcome.optimal
+            click.echo(json.dumps(report), err=True)
+            if outcome.answer is None:
+                raise click.ClickException(
+                    f"no answer within the time budget, but it is at least "
+                    f"{outcome.bound}"
+                )
+
+    if cache is not None and cache_stats:
+        counts = cache.stats()
+        click.echo(", ".join(f"{k}: {v}" for k, v in counts.items()), err=True)
 
 
 if __name__ == "__main__":
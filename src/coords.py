@@ -0,0 +1,38 @@
+# Points are packed into a single int, with BITS bits per axis. Each coordinate is
+# biased so that negative ones pack too. Packing is linear, so points and offsets can
+# be added and subtracted as plain ints, as long as no coordinate leaves
+# [-BIAS, BIAS). That keeps hot loops free of tuple or dataclass allocations, and
+# makes hashing a point as cheap as hashing an int.
+BITS = 24
+BIAS = 1 << (BITS - 1)
+MASK = (1 << BITS) - 1
+Y_UNIT = 1 << BITS
+
+Point = int
+
+ORIGIN = BIAS * Y_UNIT + BIAS
+
+
+def pack(x: int, y: int) -> Point:
+    return (y + BIAS) * Y_UNIT + x + BIAS
+
+
+def x_of(p: Point) -> int:
+    return (p & MASK) - BIAS
+
+
+def y_of(p: Point) -> int:
+    return ((p >> BITS) & MASK) - BIAS
+
+
+def unpack(p: Point) -> tuple[int, int]:
+    return (x_of(p), y_of(p))
+
+
+def offset(dx: int, dy: int) -> int:
+    "The difference between two points (dx, dy) apart, as added to a packed point"
+    return dy * Y_UNIT + dx
+
+
+def manhattan(p: Point, q: Point) -> int:
+    return abs(x_of(p) - x_of(q)) + abs(y_of(p) - y_of(q))
@@ -1,20 +1,54 @@
+from __future__ import annotations
+
 import heapq
-from typing import Generator, TextIO
+from typing import TYPE_CHECKING
+
+from fastio import MappedInput
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+MAPPED_INPUT = True
+
+
+def elf_totals(inp: MappedInput) -> NDArray[np.int64]:
+    "Total calories carried by each elf, whose items are separated by blank lines"
+    import numpy as np
+
+    values, blank = inp.ints()
+    # blank lines parse as 0, so each elf's group may include the blank line before it
+    group_starts = np.concatenate(([0], np.flatnonzero(blank) + 1))
+    return np.add.reduceat(values, group_starts[group_starts < len(values)])
+
+
+def part1(inp: MappedInput) -> int:
+    return int(elf_totals(inp).max())
+
+
+def part2(inp: MappedInput) -> int:
+    import numpy as np
+
+    return int(np.sort(elf_totals(inp))[-3:].sum())
 
 
-def gen_elf_totals(inp: TextIO) -> Generator[int, None, None]:
-    this_elf_total = 0
-    for line in inp:
-        if line := line.rstrip():
-            this_elf_total += int(line)
-        else:
-            yield this_elf_total
-            this_elf_total = 0
+class Stream:
+    "Only the three largest totals so far are kept, along with the current elf's"
 
+    def __init__(self):
+        self.top3: list[int] = []
+        self.current = 0
 
-def part1(inp: TextIO) -> int:
-    return max(gen_elf_totals(inp))
+    def feed(self, line: bytes):
+        if line.strip():
+            self.current += int(line)
+            return
 
+        heapq.heappush(self.top3, self.current)
+        if len(self.top3) > 3:
+            heapq.heappop(self.top3)
+        self.current = 0
 
-def part2(inp: TextIO) -> int:
-    return sum(heapq.nlargest(3, gen_elf_totals(inp)))
+    def answers(self) -> tuple[int, int]:
+        top3 = heapq.nlargest(3, self.top3 + [self.current])
+        return (top3[0], sum(top3))
@@ -1,3 +1,4 @@
+from itertools import islice
 from typing import Callable, Generator, TextIO
 
 
@@ -44,7 +45,9 @@ CRT_HEIGHT = 6
 
 def part2(inp: TextIO) -> int:
     crt = ["."] * CRT_HEIGHT * CRT_WIDTH
-    for cycle_num, x in enumerate(gen_states(inp), start=1):
+    # the state after the last instruction would wrap around to the first pixel
+    states = islice(gen_states(inp), CRT_HEIGHT * CRT_WIDTH)
+    for cycle_num, x in enumerate(states, start=1):
         # which pixel in the crt is being drawn
         crt_idx = (cycle_num - 1) % (CRT_WIDTH * CRT_HEIGHT)
 
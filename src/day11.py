@@ -1,10 +1,13 @@
 from collections import deque
+import copy
 from dataclasses import dataclass
 import heapq
 import math
 import operator
 from typing import Callable, Generator, TextIO
 
+import timing
+
 
 @dataclass
 class Item:
@@ -85,6 +88,7 @@ def parse_target(line: str) -> int:
     return int(line.strip().split()[5])
 
 
+@timing.phase(timing.PARSE)
 def gen_monkeys(inp: TextIO) -> Generator[Monkey, None, None]:
     while inp.readline():
         items = parse_starting_items(inp.readline())
@@ -97,8 +101,9 @@ def gen_monkeys(inp: TextIO) -> Generator[Monkey, None, None]:
         yield Monkey(items, operation, test_divisor, true_target, false_target)
 
 
-def get_monkey_business(inp: TextIO, decrease_worry: bool, rounds: int) -> int:
-    monkeys = list(gen_monkeys(inp))
+def get_monkey_business(
+    monkeys: list[Monkey], decrease_worry: bool, rounds: int
+) -> int:
     lcm = math.lcm(*(monkey.test_divisor for monkey in monkeys))
 
     for _ in range(rounds):
@@ -111,8 +116,17 @@ def get_monkey_business(inp: TextIO, decrease_worry: bool, rounds: int) -> int:
 
 
 def part1(inp: TextIO) -> int:
-    return get_monkey_business(inp, True, 20)
+    return get_monkey_business(list(gen_monkeys(inp)), True, 20)
 
 
 def part2(inp: TextIO) -> int:
-    return get_monkey_business(inp, False, 10000)
+    return get_monkey_business(list(gen_monkeys(inp)), False, 10000)
+
+
+def solve(inp: TextIO) -> tuple[int, int]:
+    monkeys = list(gen_monkeys(inp))
+    # each part throws the items around, so part 1 plays with a copy
+    return (
+        get_monkey_business(copy.deepcopy(monkeys), True, 20),
+        get_monkey_business(monkeys, False, 10000),
+    )
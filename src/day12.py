@@ -1,120 +1,71 @@
-from collections import deque
-from dataclasses import dataclass
-from typing import Callable, TextIO
+from typing import AbstractSet, Callable, TextIO
 
+import search
+import stats
+import timing
+from grid import Grid
 
-@dataclass(frozen=True)
-class Vec2:
-    x: int
-    y: int
+# Elevations are stored as their letters, so that the padding (0) is far below any of
+# them and can never be stepped onto
+START = ord("S")
+END = ord("E")
+LOWEST = ord("a")
+HIGHEST = ord("z")
 
-    def __add__(self, other: "Vec2") -> "Vec2":
-        return Vec2(self.x + other.x, self.y + other.y)
 
-
-@dataclass
 class Map:
-    data: list[list[int]]
-    start: Vec2
-    end: Vec2
-
-    @property
-    def height(self) -> int:
-        return len(self.data)
-
-    @property
-    def width(self) -> int:
-        return len(self.data[0])
-
-    def __getitem__(self, coords: Vec2) -> int:
-        return self.data[coords.y][coords.x]
-
-    def __contains__(self, coords: Vec2) -> bool:
-        return (
-            0 <= coords.x
-            and coords.x < self.width
-            and 0 <= coords.y
-            and coords.y < self.height
-        )
-
-
-def elev(c: str) -> int:
-    "Encode elevations from a=0 to z=25"
-    if c == "S":
-        return 0
-    elif c == "E":
-        return 25
-    else:
-        return ord(c) - ord("a")
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        self.start = grid.find(START)
+        self.end = grid.find(END)
+        grid.cells[self.start] = LOWEST
+        grid.cells[self.end] = HIGHEST
 
 
+@timing.phase(timing.PARSE)
 def get_map(inp: TextIO) -> Map:
-    data: list[list[int]] = []
-    start = None
-    end = None
-    for y, line in enumerate(inp):
-        row: list[int] = []
-        for x, c in enumerate(line.rstrip()):
-            row.append(elev(c))
-            if c == "S":
-                start = Vec2(x, y)
-            elif c == "E":
-                end = Vec2(x, y)
-
-        data.append(row)
-
-    assert start
-    assert end
+    return Map(Grid.parse(inp.read(), pad=1, fill=0))
 
-    return Map(data, start, end)
 
-
-@dataclass
-class SearchNode:
-    dist: int
-    coords: Vec2
-
-
-POSSIBLE_STEPS = [Vec2(-1, 0), Vec2(1, 0), Vec2(0, -1), Vec2(0, 1)]
-
-
-def bfs_reverse_dist(
-    map: Map,
-    start_pred: Callable[[Map, Vec2], bool],
-) -> int:
+def bfs_reverse_dist(map: Map, starts: Callable[[Map], AbstractSet[int]]) -> int:
     """
-    Breadth-first-search backwards from `map.end` until finding coords that satisfy the
-    given predicate, then return the path distance
+    Breadth-first-search backwards from `map.end` until reaching any of the given
+    start cells, then return the path distance
     """
-    q: deque[SearchNode] = deque()
-    q.append(SearchNode(0, map.end))
-
-    visited: set[Vec2] = {map.end}
-    while q:
-        cur = q.popleft()
-
-        for step in POSSIBLE_STEPS:
-            prev = cur.coords + step
-            if prev in visited:
-                continue
-            elif prev not in map:
-                continue
-            elif map[cur.coords] > map[prev] + 1:
-                continue
-            elif start_pred(map, prev):
-                return cur.dist + 1
-
-            visited.add(prev)
-            q.append(SearchNode(cur.dist + 1, prev))
+    elev = map.grid.cells
+    offsets = map.grid.offsets4
+
+    def steps_from(cur: int) -> list[int]:
+        # walking backwards, so any climb is allowed but drops are limited
+        min_elev = elev[cur] - 1
+        return [
+            prev for prev in (cur + step for step in offsets) if elev[prev] >= min_elev
+        ]
+
+    targets = starts(map)
+    visited = bytearray(len(elev))
+    expanded = 0
+    reached = search.levels(len(elev), (map.end,), steps_from, visited)
+    for dist, frontier in enumerate(reached):
+        expanded += len(frontier)
+        if not targets.isdisjoint(frontier):
+            break
+    else:
+        dist = -1
 
-    return -1
+    stats.add("day12.expanded", expanded)
+    if stats.is_enabled():
+        stats.peak("day12.visited", visited.count(1))
+    return dist
 
 
 def part1(inp: TextIO) -> int:
     map = get_map(inp)
-    return bfs_reverse_dist(map, lambda map, coords: coords == map.start)
+    return bfs_reverse_dist(map, lambda map: {map.start})
 
 
 def part2(inp: TextIO) -> int:
     map = get_map(inp)
-    return bfs_reverse_dist(map, lambda map, coords: map[coords] == 0)
+    return bfs_reverse_dist(
+        map, lambda map: {i for i in map.grid.indices() if map.grid.cells[i] == LOWEST}
+    )
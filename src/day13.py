@@ -3,6 +3,8 @@ from enum import Enum, auto
 from itertools import zip_longest
 from typing import Generator, TextIO
 
+import timing
+
 
 class Order(Enum):
     LESS = auto()
@@ -79,6 +81,7 @@ def parse_packet(s: str) -> Packet:
     raise ValueError
 
 
+@timing.phase(timing.PARSE)
 def gen_pairs(inp: TextIO) -> Generator[tuple[Packet, Packet], None, None]:
     while line1 := inp.readline():
         line2 = inp.readline()
@@ -94,6 +97,7 @@ def part1(inp: TextIO) -> int:
     )
 
 
+@timing.phase(timing.PARSE)
 def gen_packets(inp: TextIO) -> Generator[Packet, None, None]:
     for (a, b) in gen_pairs(inp):
         yield a
@@ -1,63 +1,70 @@
-from dataclasses import dataclass
 from typing import TextIO
 
+import timing
+from grid import Grid
 
-@dataclass(frozen=True)
-class Vec2:
-    x: int
-    y: int
+SOURCE_X = 500
 
+Path = list[tuple[int, int]]
 
-def parse_vec2(s: str) -> Vec2:
-    xs, ys = s.split(",")
-    return Vec2(int(xs), int(ys))
 
+def parse_path(s: str) -> Path:
+    return [
+        (int(xs), int(ys))
+        for xs, ys in (marker.split(",") for marker in s.split(" -> "))
+    ]
 
-def mark_line(occupied: set[Vec2], s: str):
-    markers = s.split(" -> ")
-    start_point = parse_vec2(markers[0])
-    occupied.add(start_point)
-    for end_point_s in markers[1:]:
-        end_point = parse_vec2(end_point_s)
-        if start_point.x == end_point.x:
-            smaller_y, larger_y = sorted((start_point.y, end_point.y))
-            occupied.update(
-                Vec2(start_point.x, y) for y in range(smaller_y, larger_y + 1)
-            )
-        else:
-            smaller_x, larger_x = sorted((start_point.x, end_point.x))
-            occupied.update(
-                Vec2(x, start_point.y) for x in range(smaller_x, larger_x + 1)
-            )
-        start_point = end_point
+
+@timing.phase(timing.PARSE)
+def get_cave(inp: TextIO, has_floor: bool) -> tuple[Grid, int, int]:
+    """
+    The cave, with rock and the floor (if any) filled in, along with the flat index of
+    the source of the sand and the depth of the lowest rock
+    """
+    paths = [parse_path(line.rstrip()) for line in inp]
+    xs = [x for path in paths for x, _ in path]
+    max_y = max(y for path in paths for _, y in path)
+
+    # sand can't spread further than the floor is deep, so this always leaves room
+    # for it to settle without wrapping around the edge of a row
+    min_x = min(min(xs), SOURCE_X - max_y - 3)
+    max_x = max(max(xs), SOURCE_X + max_y + 3)
+    grid = Grid(max_x - min_x + 1, max_y + 3)
+    for path in paths:
+        for (x1, y1), (x2, y2) in zip(path, path[1:]):
+            for x in range(min(x1, x2), max(x1, x2) + 1):
+                for y in range(min(y1, y2), max(y1, y2) + 1):
+                    grid[x - min_x, y] = 1
+
+    if has_floor:
+        floor = grid.index(0, max_y + 2)
+        grid.cells[floor : floor + grid.width] = b"\x01" * grid.width
+
+    return (grid, grid.index(SOURCE_X - min_x, 0), max_y)
 
 
 def sim(inp: TextIO, has_floor: bool) -> int:
-    occupied: set[Vec2] = set()
-    for line in inp:
-        mark_line(occupied, line.rstrip())
+    grid, cur, max_y = get_cave(inp, has_floor)
+    occupied = grid.cells
+    down = grid.stride
 
-    max_y = max(point.y for point in occupied)
-    cur = Vec2(500, 0)
+    # without a floor, sand which falls past the lowest rock falls forever
+    abyss = len(occupied) if has_floor else grid.index(0, max_y)
     num_placed = 0
-    backtrack: list[Vec2] = []
-    while has_floor or cur.y < max_y:
-        if has_floor and cur.y + 1 == max_y + 2:
-            num_placed += 1
-            occupied.add(cur)
-            cur = backtrack.pop()
-        elif (next := Vec2(cur.x, cur.y + 1)) not in occupied:
+    backtrack: list[int] = []
+    while cur < abyss:
+        if not occupied[next := cur + down]:
             backtrack.append(cur)
             cur = next
-        elif (next := Vec2(cur.x - 1, cur.y + 1)) not in occupied:
+        elif not occupied[next := cur + down - 1]:
             backtrack.append(cur)
             cur = next
-        elif (next := Vec2(cur.x + 1, cur.y + 1)) not in occupied:
+        elif not occupied[next := cur + down + 1]:
             backtrack.append(cur)
             cur = next
         else:
             num_placed += 1
-            occupied.add(cur)
+            occupied[cur] = 1
             if not backtrack:
                 break
             cur = backtrack.pop()
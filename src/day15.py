@@ -1,20 +1,22 @@
+from __future__ import annotations
+
 from dataclasses import dataclass, field
-from functools import cached_property
-from typing import Collection, Generator, Optional, TextIO
+from typing import TYPE_CHECKING, Collection, Optional, TextIO
 
+import artifacts
+import checkpoint
+import progress
+import timing
 
-@dataclass(frozen=True)
-class Vec2:
-    x: int
-    y: int
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
 
-    def __sub__(self, other: "Vec2") -> "Vec2":
-        return Vec2(self.x - other.x, self.y - other.y)
+# Both parts have the real input's row and search area hardcoded, so give nonsense on
+# the example
+REAL_INPUT_ONLY = {1, 2}
 
-    @cached_property
-    def magnitude(self) -> int:
-        "Taxicab distance"
-        return abs(self.x) + abs(self.y)
+Point = tuple[int, int]
 
 
 @dataclass(frozen=True)
@@ -46,30 +48,45 @@ class Range:
 
 @dataclass(frozen=True, order=True)
 class ExclusionZone:
-    sensor: Vec2
-    beacon: Vec2
+    sensor: Point
+    beacon: Point
     radius: int = field(init=False)
 
     def __post_init__(self):
-        object.__setattr__(self, "radius", (self.beacon - self.sensor).magnitude)
+        (sensor_x, sensor_y), (beacon_x, beacon_y) = self.sensor, self.beacon
+        object.__setattr__(
+            self, "radius", abs(beacon_x - sensor_x) + abs(beacon_y - sensor_y)
+        )
 
     def intersect_y(self, y: int) -> Optional[Range]:
-        remaining = self.radius - abs(y - self.sensor.y)
+        sensor_x, sensor_y = self.sensor
+        remaining = self.radius - abs(y - sensor_y)
         if remaining < 0:
             return None
         else:
-            return Range(self.sensor.x - remaining, self.sensor.x + remaining)
+            return Range(sensor_x - remaining, sensor_x + remaining)
 
 
-def get_exclusion_zones(inp: TextIO) -> Generator[ExclusionZone, None, None]:
+@timing.phase(timing.PARSE)
+def parse_zones(inp: TextIO) -> NDArray[np.int64]:
+    "A row per sensor: its x and y, its beacon's x and y, and the radius between them"
+    import numpy as np
+
+    rows = []
     for line in inp:
         tokens = line.split()
         sensor_x = int(tokens[2][2:-1])
         sensor_y = int(tokens[3][2:-1])
         beacon_x = int(tokens[8][2:-1])
         beacon_y = int(tokens[9][2:])
+        radius = abs(sensor_x - beacon_x) + abs(sensor_y - beacon_y)
+        rows.append((sensor_x, sensor_y, beacon_x, beacon_y, radius))
+
+    return np.array(rows, dtype=np.int64).reshape(-1, 5)
 
-        yield ExclusionZone(Vec2(sensor_x, sensor_y), Vec2(beacon_x, beacon_y))
+
+def get_zone_table(inp: TextIO) -> list[list[int]]:
+    return artifacts.cached("zones", parse_zones, inp).tolist()
 
 
 def calc_y_projection(
@@ -99,14 +116,16 @@ def calc_y_projection(
     return ranges
 
 
-def part1(inp: TextIO) -> int:
-    TARGET_Y = 2000000
-
-    excl_zones = list(get_exclusion_zones(inp))
+def count_excluded(zone_table: list[list[int]], target_y: int) -> int:
+    "The number of positions on the row which can't contain a beacon"
+    excl_zones = [
+        ExclusionZone((sensor_x, sensor_y), (beacon_x, beacon_y))
+        for sensor_x, sensor_y, beacon_x, beacon_y, _ in zone_table
+    ]
     on_target_line: set[int] = set(
-        excl_zone.beacon.x for excl_zone in excl_zones if excl_zone.beacon.y == TARGET_Y
+        beacon_x for _, _, beacon_x, beacon_y, _ in zone_table if beacon_y == target_y
     )
-    excl_ranges = calc_y_projection(excl_zones, TARGET_Y)
+    excl_ranges = calc_y_projection(excl_zones, target_y)
 
     total_points = sum(range.num_points for range in excl_ranges)
     occupied_by_beacons = sum(
@@ -118,17 +137,24 @@ def part1(inp: TextIO) -> int:
     return total_points - occupied_by_beacons
 
 
-def part2(inp: TextIO) -> int:
-    excl_zones = list(get_exclusion_zones(inp))
-    for y in range(0, 4000001):
+def find_tuning_frequency(zone_table: list[list[int]]) -> int:
+    # plain tuples, as this loop runs for millions of rows
+    excl_zones = [
+        (sensor_x, sensor_y, radius) for sensor_x, sensor_y, _, _, radius in zone_table
+    ]
+    # a checkpoint holds the first row left to scan
+    rows = range(checkpoint.load() or 0, 4000001)
+    for y in progress.track(rows, len(rows), "rows"):
+        if y % checkpoint.CHECK_EVERY == 0 and checkpoint.due():
+            checkpoint.save(y)
         x = 0
         while x <= 4000000:
-            for zone in excl_zones:
-                remaining = zone.radius - abs(zone.sensor.y - y)
+            for sensor_x, sensor_y, radius in excl_zones:
+                remaining = radius - abs(sensor_y - y)
                 if remaining < 0:
                     continue
-                lower = zone.sensor.x - remaining
-                upper = zone.sensor.x + remaining
+                lower = sensor_x - remaining
+                upper = sensor_x + remaining
                 if lower <= x <= upper:
                     x = upper + 1
                     break
@@ -137,3 +163,16 @@ def part2(inp: TextIO) -> int:
                 return 4000000 * x + y
 
     return -1
+
+
+def part1(inp: TextIO) -> int:
+    return count_excluded(get_zone_table(inp), 2000000)
+
+
+def part2(inp: TextIO) -> int:
+    return find_tuning_frequency(get_zone_table(inp))
+
+
+def solve(inp: TextIO) -> tuple[int, int]:
+    zone_table = get_zone_table(inp)
+    return (count_excluded(zone_table, 2000000), find_tuning_frequency(zone_table))
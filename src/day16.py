@@ -1,12 +1,29 @@
-from concurrent.futures import Future, ProcessPoolExecutor, as_completed
-from typing import Generator, Iterable, Iterator, TextIO, TypeVar
-from itertools import chain, combinations
-from tqdm import tqdm
-import numpy as np
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, TextIO
+
+import artifacts
+import budget
+import checkpoint
+import executor
+import progress
+import search
+import shard
+import stats
+import timing
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
 
 Node = int
 ValveGraph = dict[Node, tuple[int, set[Node]]]
-NodeDistances = dict[tuple[Node, Node], int]
+
+# Part 2's partitions can be split across machines with --shard, taking the best
+SHARDS = {2: "max"}
+
+# Far enough that no path is ever worth taking, without overflowing when two are added
+UNREACHABLE = 1 << 29
 
 
 class BitSet:
@@ -19,17 +36,22 @@ class BitSet:
         return bv | (1 << node)
 
 
-def parse_line(line: str) -> tuple[str, int, set[str]]:
+def parse_line(line: str) -> tuple[str, int, list[str]]:
     tokens = line.split()
     node_name = tokens[1]
     flow_rate = int(tokens[4][5:-1])
-    next_nodes = set(node.rstrip(",") for node in tokens[9:])
+    # in input order, so that nodes are numbered the same way in every process
+    next_nodes = [node.rstrip(",") for node in tokens[9:]]
     return (node_name, flow_rate, next_nodes)
 
 
 class NodeAssignmentHelper:
-    _mapping = dict[str, Node]()
-    _next = 0
+    _mapping: dict[str, Node]
+    _next: int
+
+    def __init__(self) -> None:
+        self._mapping = {}
+        self._next = 0
 
     def get(self, node: str) -> Node:
         if (val := self._mapping.get(node)) is not None:
@@ -41,6 +63,7 @@ class NodeAssignmentHelper:
         return res
 
 
+@timing.phase(timing.PARSE)
 def get_graph(inp: TextIO) -> tuple[NodeAssignmentHelper, ValveGraph]:
     helper = NodeAssignmentHelper()
     graph = ValveGraph()
@@ -55,51 +78,80 @@ def get_graph(inp: TextIO) -> tuple[NodeAssignmentHelper, ValveGraph]:
     return helper, graph
 
 
-def get_distances(graph: ValveGraph) -> NodeDistances:
-    distances = NodeDistances()
-
-    # Initialize with self-edges and neighbors
-    for i, v in graph.items():
-        distances[(i, i)] = 0
-        for j in v[1]:
-            distances[(i, j)] = 1
+@timing.phase(timing.PRECOMPUTE)
+def get_distances(graph: ValveGraph) -> NDArray[np.int32]:
+    "The length of the shortest path between every pair of nodes, by BFS from each"
+    import numpy as np
 
-    # Floyd Warshall
-    for k in graph.keys():
-        for i in graph.keys():
-            for j in graph.keys():
-                if (dist_ik := distances.get((i, k))) is None or (
-                    dist_kj := distances.get((k, j))
-                ) is None:
-                    continue
+    def tunnels(node: Node) -> set[Node]:
+        return graph[node][1]
 
-                dist_via_k = dist_ik + dist_kj
-                if (i, j) not in distances or distances[(i, j)] > dist_via_k:
-                    distances[(i, j)] = dist_via_k
+    distances = np.full((len(graph), len(graph)), UNREACHABLE, dtype=np.int32)
+    for source in graph:
+        reached = search.levels(len(graph), (source,), tunnels)
+        for dist, frontier in enumerate(reached):
+            distances[source, frontier] = dist
 
     return distances
 
 
+def cached_distances(graph: ValveGraph) -> NDArray[np.int32]:
+    return artifacts.cached("distances", get_distances, graph)
+
+
 def max_flow(
     graph: ValveGraph,
-    distances: NodeDistances,
+    distances: memoryview,
     to_open: set[Node],
     start_node: Node,
     time: int,
-) -> int:
+) -> tuple[int, int]:
+    """
+    The max total flow from opening the valves in `to_open`, and an upper bound on
+    it. The two are equal unless the time budget runs out first, after which the
+    search stops descending, counting each unexplored branch as if all of its closed
+    valves could be opened straight away.
+    """
+    import numpy as np
+
     mapping = {node: i for i, node in enumerate(to_open)}
+
+    def optimistic(cur_node: int, time_left: int, open_valves: int) -> int:
+        return sum(
+            graph[node][0] * max(0, time_left - distances[cur_node, node] - 1)
+            for node in to_open
+            if not BitSet.contains(open_valves, mapping[node])
+        )
+
+    if budget.expired():
+        return 0, optimistic(start_node, time, 0)
+
     table = np.full((len(graph), time + 1, 1 << len(to_open)), -1, dtype=np.int32)
+    calls = 0
+    hits = 0
+    stopped = False
+    # no unexplored branch could have added more than this to the flow found
+    slack = 0
 
     def max_flow_recursive(cur_node: int, time_left: int, open_valves: int = 0) -> int:
         """
         The max total flow that can be achieved by opening more valves, given current
         conditions.
         """
+        nonlocal calls, hits, stopped, slack
+        calls += 1
         if time_left <= 0:
             return 0
         elif (res := table[cur_node, time_left, open_valves]) >= 0:
+            hits += 1
             return res
+        elif stopped or calls % budget.CHECK_EVERY == 0 and budget.expired():
+            stopped = True
+            slack = max(slack, optimistic(cur_node, time_left, open_valves))
+            return 0
 
+        # memoized under the state as it was on entry, which is what's looked up
+        key = (cur_node, time_left, open_valves)
         flow_rate, _ = graph[cur_node]
         total_flow = 0
         if flow_rate > 0:
@@ -110,7 +162,7 @@ def max_flow(
         total_flow += max(
             (
                 max_flow_recursive(
-                    next_node, time_left - distances[(cur_node, next_node)], open_valves
+                    next_node, time_left - distances[cur_node, next_node], open_valves
                 )
                 for next_node in to_open
                 if not BitSet.contains(open_valves, mapping[next_node])
@@ -118,70 +170,107 @@ def max_flow(
             default=0,
         )
 
-        table[cur_node, time_left, open_valves] = total_flow
+        table[key] = total_flow
         return total_flow
 
-    return max_flow_recursive(start_node, time)
+    res = max_flow_recursive(start_node, time)
+    if stats.is_enabled():
+        memoized = int((table >= 0).sum())
+        stats.add("day16.calls", calls)
+        stats.add("day16.memo_hits", hits)
+        stats.peak("day16.memo_size", memoized)
+    return res, res + slack
 
 
-def part1(inp: TextIO) -> int:
-    assignments, graph = get_graph(inp)
-    distances = get_distances(graph)
+def max_flow_alone(
+    graph: ValveGraph, distances: NDArray[np.int32], start_node: Node, time: int
+) -> int:
     nonzero_nodes = {k for k, v in graph.items() if v[0] > 0}
-    return max_flow(graph, distances, nonzero_nodes, assignments.get("AA"), 30)
+    # a memoryview indexes to plain ints, much faster than a numpy array does
+    view = memoryview(distances)
+    return budget.settle(*max_flow(graph, view, nonzero_nodes, start_node, time))
 
 
-T = TypeVar("T")
-
-
-def powerset(iterable: Iterable[T]) -> Iterator[Iterable[T]]:
-    "powerset([1,2,3]) --> () (1,) (2,) (3,) (1,2) (1,3) (2,3) (1,2,3)"
-    s = list(iterable)
-    return chain.from_iterable(combinations(s, r) for r in range(len(s) + 1))
-
-
-def all_set_partitions(
-    orig: set[str],
-) -> Generator[tuple[set[str], set[str]], None, None]:
-    for my_nodes in powerset(orig):
-        yield set(my_nodes), orig.difference(my_nodes)
+def part1(inp: TextIO) -> int:
+    assignments, graph = get_graph(inp)
+    return max_flow_alone(graph, cached_distances(graph), assignments.get("AA"), 30)
 
 
 def max_flow_partitioned(
-    graph: ValveGraph,
-    distances: NodeDistances,
-    my_set: set[Node],
-    eleph_set: set[Node],
+    mask: int,
+    problem: executor.Published[tuple[list[Node], ValveGraph]],
+    distances: executor.Published[NDArray[np.int32]],
     start_node: Node,
     time: int,
+) -> tuple[int, int, int]:
+    """
+    Split the valves as the bits of `mask` say, between me (1) and the elephant (0),
+    returning the mask with the total flow and its bound
+    """
+    valves, graph = problem.get()
+    my_set = set[Node]()
+    eleph_set = set[Node]()
+    for i, valve in enumerate(valves):
+        (my_set if BitSet.contains(mask, i) else eleph_set).add(valve)
+
+    view = memoryview(distances.get())
+    my_flow, my_bound = max_flow(graph, view, my_set, start_node, time)
+    eleph_flow, eleph_bound = max_flow(graph, view, eleph_set, start_node, time)
+    return mask, my_flow + eleph_flow, my_bound + eleph_bound
+
+
+def max_flow_with_elephant(
+    graph: ValveGraph, distances: NDArray[np.int32], start_node: Node, time: int
 ) -> int:
-    return max_flow(graph, distances, my_set, start_node, time) + max_flow(
-        graph, distances, eleph_set, start_node, time
-    )
+    nonzero_nodes = sorted(k for k, v in graph.items() if v[0] > 0)
+
+    # Each partition is equivalent to its mirror image, so only consider those in
+    # which the elephant opens the last valve
+    masks = range(1 << (len(nonzero_nodes) - 1))
+
+    # A checkpoint holds which partitions are done, and the best flow among them.
+    # Those cut short by the time budget aren't done, and need doing again.
+    done, best = checkpoint.load() or (bytearray(len(masks)), 0)
+    todo = [mask for mask in shard.select(masks) if not done[mask]]
+    found = bound = best
+
+    # workers are sent just the mask of each, with everything else published once
+    with executor.publish((nonzero_nodes, graph)) as problem:
+        with executor.publish(distances) as shared_distances:
+            results = executor.map_chunked(
+                max_flow_partitioned,
+                todo,
+                problem,
+                shared_distances,
+                start_node,
+                time,
+            )
+            for mask, flow, flow_bound in progress.track(
+                results, len(todo), "partitions"
+            ):
+                found = max(found, flow)
+                bound = max(bound, flow_bound)
+                if flow == flow_bound:
+                    done[mask] = 1
+                    best = max(best, flow)
+                if checkpoint.due():
+                    checkpoint.save((done, best))
+
+    return budget.settle(found, bound)
 
 
 def part2(inp: TextIO) -> int:
     assignments, graph = get_graph(inp)
-    distances = get_distances(graph)
-    nonzero_nodes = {k for k, v in graph.items() if v[0] > 0}
-    aa = assignments.get("AA")
+    return max_flow_with_elephant(
+        graph, cached_distances(graph), assignments.get("AA"), 26
+    )
 
-    with ProcessPoolExecutor() as ex:
-        fs: list[Future[int]] = []
-        pset = list(powerset(nonzero_nodes))
-        for my_nodes in pset[: len(pset) // 2]:
-            my_set = set(my_nodes)
-            eleph_set = nonzero_nodes.difference(my_nodes)
-            fs.append(
-                ex.submit(
-                    max_flow_partitioned,
-                    graph,
-                    distances,
-                    my_set,
-                    eleph_set,
-                    aa,
-                    26,
-                )
-            )
 
-        return max(f.result() for f in tqdm(as_completed(fs), total=len(pset) // 2))
+def solve(inp: TextIO) -> tuple[int, int]:
+    assignments, graph = get_graph(inp)
+    distances = cached_distances(graph)
+    aa = assignments.get("AA")
+    return (
+        max_flow_alone(graph, distances, aa, 30),
+        max_flow_with_elephant(graph, distances, aa, 26),
+    )
@@ -1,18 +1,22 @@
+from __future__ import annotations
+
 from collections import deque
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from itertools import cycle
-from typing import Iterator, Optional, TextIO
+from typing import TYPE_CHECKING, Iterator, Optional, TextIO
+
+import stats
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
 
-import numpy as np
-from more_itertools import peekable
-from numpy.typing import NDArray
+    Shape = NDArray[np.bool_]
 
 MAP_WIDTH = 7
 ROCK_INITIAL_X = 2
 ROCK_INITIAL_HEIGHT_OFFSET = 3
 
-Shape = NDArray[np.bool_]
-
 
 @dataclass
 class Piece:
@@ -29,10 +33,16 @@ class Piece:
         return self.data.shape[0]
 
 
+def empty_tower() -> Shape:
+    import numpy as np
+
+    return np.zeros((MAP_WIDTH, 0), dtype=bool)
+
+
 @dataclass
 class Map:
     floor_level = 0
-    occupied = np.zeros((MAP_WIDTH, 0), dtype=bool)
+    occupied: Shape = field(default_factory=empty_tower)
 
     def tower_height(self) -> int:
         return (
@@ -45,6 +55,8 @@ class Map:
         "Extend the underlying NDArray to accommodate a tower of the requested height"
         top_level = self.occupied.shape[1] + self.floor_level
         if height > top_level:
+            import numpy as np
+
             self.occupied = np.pad(self.occupied, ((0, 0), (0, height - top_level)))
 
     def _check_collision(self, piece: Piece, dx: int, dy: int):
@@ -81,6 +93,8 @@ class Map:
         Determine the effective floor, i.e. the highest row in the map which is
         unreachable by falling pieces
         """
+        import numpy as np
+
         reachability = np.zeros_like(self.occupied)
         visited = set[tuple[int, int]]()
         to_visit = deque[tuple[int, int]](
@@ -168,29 +182,35 @@ class Map:
         print(s)
 
 
-SHAPE_SEQ = [
-    np.array([[True, True, True, True]]),
-    np.array([[False, True, False], [True, True, True], [False, True, False]]),
-    np.array([[True, True, True], [False, False, True], [False, False, True]]),
-    np.array([[True], [True], [True], [True]]),
-    np.array([[True, True], [True, True]]),
-]
+def shape_seq() -> list[Shape]:
+    "The rocks, in the order they fall"
+    import numpy as np
+
+    return [
+        np.array([[True, True, True, True]]),
+        np.array([[False, True, False], [True, True, True], [False, True, False]]),
+        np.array([[True, True, True], [False, False, True], [False, False, True]]),
+        np.array([[True], [True], [True], [True]]),
+        np.array([[True, True], [True, True]]),
+    ]
 
 
 def part1(inp: TextIO) -> int:
-    shape_seq = cycle(SHAPE_SEQ)
+    shapes = cycle(shape_seq())
     jet_seq = cycle(enumerate(inp.readline().rstrip()))
     map = Map()
     for _ in range(2022):
-        map.drop_piece(next(shape_seq), jet_seq)
+        map.drop_piece(next(shapes), jet_seq)
 
     return map.tower_height()
 
 
 def part2(inp: TextIO) -> int:
+    from more_itertools import peekable
+
     TOTAL_STEPS = 1000000000000
 
-    shape_seq = peekable(cycle(enumerate(SHAPE_SEQ)))
+    shapes = peekable(cycle(enumerate(shape_seq())))
     jet_seq = peekable(cycle(enumerate(inp.readline().rstrip())))
     map = Map()
 
@@ -198,7 +218,7 @@ def part2(inp: TextIO) -> int:
     # when it was encountered. This allows us to discover repetitions and fast-forward.
     seen = dict[tuple[int, int, int], tuple[int, int]]()
     for steps_completed in range(TOTAL_STEPS):
-        i, _ = shape_seq.peek()
+        i, _ = shapes.peek()
         j, _ = jet_seq.peek()
         state = (i, j, map.digest())
         if state in seen:
@@ -206,7 +226,7 @@ def part2(inp: TextIO) -> int:
         else:
             seen[state] = (steps_completed, map.tower_height())
 
-        _, shape = next(shape_seq)
+        _, shape = next(shapes)
         map.drop_piece(shape, jet_seq)
     else:
         # Should not get here without first encountering a repetition
@@ -216,12 +236,15 @@ def part2(inp: TextIO) -> int:
     prev_steps_completed, prev_tower_height = seen[state]
     period = steps_completed - prev_steps_completed
     periods_skipped = (TOTAL_STEPS - steps_completed) // period
+    stats.add("day17.cycle_steps", steps_completed)
+    stats.add("day17.periods_skipped", periods_skipped)
+    stats.peak("day17.seen", len(seen))
     map.floor_level += (map.tower_height() - prev_tower_height) * periods_skipped
     steps_completed += periods_skipped * period
 
     # resume simulating the remaining steps
     for _ in range(steps_completed, TOTAL_STEPS):
-        _, shape = next(shape_seq)
+        _, shape = next(shapes)
         map.drop_piece(shape, jet_seq)
 
     return map.tower_height()
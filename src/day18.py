@@ -1,7 +1,10 @@
-from collections import defaultdict, deque
+from collections import defaultdict
 from enum import Enum, auto
+from itertools import chain
 from typing import TextIO
 
+import search
+
 Point = tuple[int, int, int]
 
 
@@ -36,44 +39,38 @@ def part1(inp: TextIO) -> int:
 def part2(inp: TextIO) -> int:
     points: set[Point] = {tuple(int(s) for s in line.split(",")) for line in inp}
 
-    # Floodfill the region containing the droplets from the outside, marking each time
-    # we run into an exposed face
-    x_min = min(x for x, _, _ in points)
-    x_max = max(x for x, _, _ in points)
-    y_min = min(y for _, y, _ in points)
-    y_max = max(y for _, y, _ in points)
-    z_min = min(z for _, _, z in points)
-    z_max = max(z for _, _, z in points)
+    # Cubes are numbered densely within a box around the droplet, leaving a layer of
+    # air all around for the flood to flow through, and beyond that a layer of wall
+    # to keep it from leaving the box
+    x_min = min(x for x, _, _ in points) - 2
+    y_min = min(y for _, y, _ in points) - 2
+    z_min = min(z for _, _, z in points) - 2
+    x_len = max(x for x, _, _ in points) - x_min + 3
+    y_len = max(y for _, y, _ in points) - y_min + 3
+    z_len = max(z for _, _, z in points) - z_min + 3
 
-    num_faces = 0
-    start_point = (x_min - 1, y_min - 1, z_min - 1)
-    visited = {start_point}
-    to_visit = deque((start_point,))
-    while to_visit:
-        x, y, z = to_visit.popleft()
+    def index(x: int, y: int, z: int) -> int:
+        return ((z - z_min) * y_len + (y - y_min)) * x_len + x - x_min
 
-        for dx, dy, dz in [
-            (-1, 0, 0),
-            (1, 0, 0),
-            (0, -1, 0),
-            (0, 1, 0),
-            (0, 0, -1),
-            (0, 0, 1),
-        ]:
-            next_point = (x + dx, y + dy, z + dz)
-            nx, ny, nz = next_point
-            if not (
-                x_min - 1 <= nx <= x_max + 1
-                and y_min - 1 <= ny <= y_max + 1
-                and z_min - 1 <= nz <= z_max + 1
-            ):
-                continue
-            elif next_point in visited:
-                continue
-            elif next_point in points:
-                num_faces += 1
-            else:
-                visited.add(next_point)
-                to_visit.append(next_point)
+    size = x_len * y_len * z_len
+    offsets = (-1, 1, -x_len, x_len, -x_len * y_len, x_len * y_len)
+    walls = (
+        index(x, y, z)
+        for x in range(x_min, x_min + x_len)
+        for y in range(y_min, y_min + y_len)
+        for z in range(z_min, z_min + z_len)
+        if x in (x_min, x_min + x_len - 1)
+        or y in (y_min, y_min + y_len - 1)
+        or z in (z_min, z_min + z_len - 1)
+    )
+    cubes = [index(*p) for p in points]
 
-    return num_faces
+    # Floodfill the region containing the droplets from the outside, then count each
+    # face of a cube which that region touches
+    outside = search.flood(
+        size,
+        (index(x_min + 1, y_min + 1, z_min + 1),),
+        lambda i: [i + step for step in offsets],
+        chain(walls, cubes),
+    )
+    return sum(outside[cube + step] == 1 for cube in cubes for step in offsets)
@@ -1,12 +1,20 @@
 from collections import UserDict
-from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from enum import IntEnum
 from itertools import islice
 from math import prod
 from typing import Generator, TextIO
 
-from tqdm import tqdm
+import budget
+import executor
+import progress
+import shard
+import stats
+import timing
+
+# The blueprints can be split across machines with --shard, combining their quality
+# levels, or their geodes in part 2, as usual
+SHARDS = {1: "sum", 2: "prod"}
 
 
 class Resource(IntEnum):
@@ -52,7 +60,21 @@ class State:
     resources: ResourceCount
 
 
-def max_geodes(bp: Blueprint, init_minutes: int) -> int:
+def geode_bound(state: State) -> int:
+    "The most geodes a state could end with, were a geode robot built every minute"
+    return (
+        state.resources[Resource.GEODE]
+        + state.robots[Resource.GEODE] * state.minutes
+        + (state.minutes + 1) * state.minutes // 2
+    )
+
+
+def search_geodes(bp: Blueprint, init_minutes: int) -> tuple[int, int]:
+    """
+    The most geodes that can be opened, and an upper bound on it. The two are equal
+    unless the time budget runs out first, in which case the bound is the best that
+    any state still left to explore could do.
+    """
     init_state = State(init_minutes, ResourceCount({Resource.ORE: 1}), ResourceCount())
 
     cost_bound = bp.cost_bound()
@@ -60,19 +82,23 @@ def max_geodes(bp: Blueprint, init_minutes: int) -> int:
     visited = set((init_state,))
     queue = [init_state]
     best_seen = 0
+    bound = 0
+    explored = pruned = 0
     while queue:
         state = queue.pop()
+        explored += 1
+        if explored % budget.CHECK_EVERY == 0 and budget.expired():
+            bound = max(geode_bound(state), *map(geode_bound, queue))
+            break
+
         best_seen = max(
             best_seen,
             state.resources[Resource.GEODE]
             + state.robots[Resource.GEODE] * state.minutes,
         )
 
-        upper_bound = (
-            state.robots[Resource.GEODE] * state.minutes
-            + (state.minutes + 1) * state.minutes // 2
-        )
-        if state.resources[Resource.GEODE] + upper_bound <= best_seen:
+        if geode_bound(state) <= best_seen:
+            pruned += 1
             continue
 
         # what if we choose not to build another robot?
@@ -137,7 +163,10 @@ def max_geodes(bp: Blueprint, init_minutes: int) -> int:
                 visited.add(new_state)
                 queue.append(new_state)
 
-    return best_seen
+    stats.add("day19.states", explored)
+    stats.add("day19.pruned", pruned)
+    stats.peak("day19.visited", len(visited))
+    return best_seen, max(best_seen, bound)
 
 
 def parse_blueprint(s: str) -> Blueprint:
@@ -161,28 +190,40 @@ def parse_blueprint(s: str) -> Blueprint:
     return Blueprint(id, robots)
 
 
+@timing.phase(timing.PARSE)
 def get_blueprints(inp: TextIO) -> Generator[Blueprint, None, None]:
     for line in inp:
         yield parse_blueprint(line)
 
 
-def get_quality_score(bp: Blueprint) -> int:
-    return bp.id * max_geodes(bp, 24)
+def search_blueprint(
+    index: int, bps: executor.Published[list[Blueprint]], minutes: int
+) -> tuple[int, int, int]:
+    "The blueprint's id, the most geodes it can open, and a bound on that"
+    bp = bps.get()[index]
+    return (bp.id, *search_geodes(bp, minutes))
 
 
-def part1(inp: TextIO) -> int:
-    fs = list[Future[int]]()
-    with ProcessPoolExecutor() as ex:
-        for bp in get_blueprints(inp):
-            fs.append(ex.submit(get_quality_score, bp))
+def search_blueprints(bps: list[Blueprint], minutes: int) -> list[tuple[int, int, int]]:
+    # the blueprints are published to workers once, which are then sent only indexes
+    indexes = shard.select(range(len(bps)))
+    with executor.publish(bps) as shared:
+        results = executor.map_chunked(
+            search_blueprint, indexes, shared, minutes, chunksize=1
+        )
+        return list(progress.track(results, len(indexes), "blueprints"))
+
 
-        return sum(f.result() for f in tqdm(as_completed(fs), total=len(fs)))
+def part1(inp: TextIO) -> int:
+    results = search_blueprints(list(get_blueprints(inp)), 24)
+    return budget.settle(
+        sum(id * geodes for id, geodes, _ in results),
+        sum(id * bound for id, _, bound in results),
+    )
 
 
 def part2(inp: TextIO) -> int:
-    fs = list[Future[int]]()
-    with ProcessPoolExecutor() as ex:
-        for bp in islice(get_blueprints(inp), 3):
-            fs.append(ex.submit(max_geodes, bp, 32))
-
-        return prod(f.result() for f in tqdm(as_completed(fs), total=len(fs)))
+    results = search_blueprints(list(islice(get_blueprints(inp), 3)), 32)
+    return budget.settle(
+        prod(geodes for _, geodes, _ in results), prod(bound for _, _, bound in results)
+    )
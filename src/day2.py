@@ -1,8 +1,9 @@
-import logging
 from enum import Enum
-from typing import Callable, Generator, TextIO, Tuple
+from typing import Callable, Generator, Tuple
 
-logger = logging.getLogger(__file__)
+from fastio import MappedInput
+
+MAPPED_INPUT = True
 
 
 class Outcome(Enum):
@@ -30,11 +31,11 @@ class Shape(Enum):
 
 
 Round = Tuple[Shape, Outcome]
-RoundFunc = Callable[[Shape, str], Round]
+RoundFunc = Callable[[Shape, bytes], Round]
 
-OPP_CODE = {"A": Shape.ROCK, "B": Shape.PAPER, "C": Shape.SCISSORS}
-P1_CODE = {"X": Shape.ROCK, "Y": Shape.PAPER, "Z": Shape.SCISSORS}
-P2_CODE = {"X": Outcome.LOSS, "Y": Outcome.DRAW, "Z": Outcome.WIN}
+OPP_CODE = {b"A": Shape.ROCK, b"B": Shape.PAPER, b"C": Shape.SCISSORS}
+P1_CODE = {b"X": Shape.ROCK, b"Y": Shape.PAPER, b"Z": Shape.SCISSORS}
+P2_CODE = {b"X": Outcome.LOSS, b"Y": Outcome.DRAW, b"Z": Outcome.WIN}
 
 
 def get_outcome(opp_shape: Shape, my_shape: Shape) -> Outcome:
@@ -46,30 +47,50 @@ def get_outcome(opp_shape: Shape, my_shape: Shape) -> Outcome:
         return Outcome.LOSS
 
 
-def p1_round_func(opp_shape: Shape, code: str) -> Round:
+def p1_round_func(opp_shape: Shape, code: bytes) -> Round:
     shape = P1_CODE[code]
     return (shape, get_outcome(opp_shape, shape))
 
 
-def p2_round_func(opp_shape: Shape, code: str) -> Round:
+def p2_round_func(opp_shape: Shape, code: bytes) -> Round:
     outcome = P2_CODE[code]
     return (opp_shape + outcome, outcome)
 
 
-def get_scores(inp: TextIO, round_fn: RoundFunc) -> Generator[int, None, None]:
-    for line in inp:
-        first, second = line.rstrip().split()
-        shape, outcome = round_fn(OPP_CODE[first], second)
-        yield shape.score() + outcome.score()
+def score_round(first: bytes, second: bytes, round_fn: RoundFunc) -> int:
+    shape, outcome = round_fn(OPP_CODE[first], second)
+    return shape.score() + outcome.score()
+
 
+def get_scores(inp: MappedInput, round_fn: RoundFunc) -> Generator[int, None, None]:
+    for first, second in inp.fields():
+        yield score_round(first, second, round_fn)
 
-def get_total(inp: TextIO, round_fn: RoundFunc) -> int:
+
+def get_total(inp: MappedInput, round_fn: RoundFunc) -> int:
     return sum(get_scores(inp, round_fn))
 
 
-def part1(inp: TextIO) -> int:
+def part1(inp: MappedInput) -> int:
     return get_total(inp, p1_round_func)
 
 
-def part2(inp: TextIO) -> int:
+def part2(inp: MappedInput) -> int:
     return get_total(inp, p2_round_func)
+
+
+class Stream:
+    def __init__(self):
+        self.totals = (0, 0)
+
+    def feed(self, line: bytes):
+        if not line.strip():
+            return
+        first, second = line.split()
+        self.totals = (
+            self.totals[0] + score_round(first, second, p1_round_func),
+            self.totals[1] + score_round(first, second, p2_round_func),
+        )
+
+    def answers(self) -> tuple[int, int]:
+        return self.totals
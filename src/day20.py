@@ -1,7 +1,8 @@
-from itertools import cycle, islice
+from itertools import islice
 from typing import Callable, Iterator, Optional, TextIO
 
-from tqdm import tqdm
+import checkpoint
+import progress
 
 
 class Node:
@@ -87,6 +88,12 @@ class List:
         assert self.first
         return NodeIterator(self.first, lambda node: node.next_orig_order)
 
+    def relink(self, order: list[Node]):
+        "Put the nodes into the given decoded order"
+        for prev, node in zip(order, order[1:] + order[:1]):
+            prev.next_decoded = node
+            node.prev_decoded = prev
+
     def zero_order(self) -> NodeIterator:
         assert self.zero
         return NodeIterator(self.zero, lambda node: node.next_decoded)
@@ -97,14 +104,25 @@ def decode(inp: TextIO, multiplier: int, num_rounds: int) -> int:
     for line in inp:
         ls.insert(int(line) * multiplier)
 
-    for cur in tqdm(
-        islice(cycle(ls.orig_order()), len(ls) * num_rounds), total=len(ls) * num_rounds
-    ):
-        for _ in range(abs(cur.val) % (len(ls) - 1)):
-            forward = cur.val > 0
-            cur.swap(forward)
-
-        cur = cur.next_orig_order
+    nodes = list(ls.orig_order())
+    index = {node: i for i, node in enumerate(nodes)}
+    first_round = 0
+    # a checkpoint holds the rounds done, and the decoded order after them as indexes
+    # into the original order
+    if (saved := checkpoint.load()) is not None:
+        first_round, order = saved
+        ls.relink([nodes[i] for i in order])
+
+    for round in range(first_round, num_rounds):
+        for cur in progress.track(nodes, len(nodes), f"mixing round {round + 1}"):
+            for _ in range(abs(cur.val) % (len(ls) - 1)):
+                forward = cur.val > 0
+                cur.swap(forward)
+
+        if checkpoint.due():
+            decoded = NodeIterator(nodes[0], lambda node: node.next_decoded)
+            order = [index[node] for node in islice(decoded, len(nodes))]
+            checkpoint.save((round + 1, order))
 
     return sum(cur.val for cur in islice(ls.zero_order(), None, 3001, 1000))
 
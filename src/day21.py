@@ -2,6 +2,8 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import TextIO, Type
 
+import timing
+
 Value = complex
 
 
@@ -54,6 +56,7 @@ class Monkey:
     expr: Expression
 
 
+@timing.phase(timing.PARSE)
 def parse_monkeys(inp: TextIO):
     res = dict[str, Monkey]()
     for line in inp:
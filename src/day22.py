@@ -1,6 +1,21 @@
-from dataclasses import dataclass, field
+from __future__ import annotations
+
 from enum import IntEnum
-from typing import Iterator, Optional, TextIO, Type
+from typing import TYPE_CHECKING, Iterable, Iterator, TextIO
+
+import artifacts
+import timing
+from grid import Grid
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+WALL = ord("#")
+VOID = ord(" ")
+
+# Part 2 has the real input's cube layout hardcoded, and fails on the example's
+REAL_INPUT_ONLY = {2}
 
 
 class Heading(IntEnum):
@@ -14,85 +29,64 @@ class Heading(IntEnum):
         return Heading((self.value + delta) % len(Heading))
 
 
-@dataclass
-class State:
-    x: int
-    y: int
-    hdg: Heading
-
-
-@dataclass
 class Map:
-    data: list[list[Optional[bool]]]
-    leftmost: list[int] = field(init=False)
-    y_rng: list[tuple[int, int]] = field(init=False)
-    width: int = field(init=False)
-
-    def __post_init__(self):
-        self.leftmost = [
-            next((i for i, val in enumerate(row) if val is not None))
-            for row in self.data
-        ]
-        self.width = max(len(row) for row in self.data)
-        self.y_rng = [
-            (
-                next(
-                    (
-                        i
-                        for i, row in enumerate(self.data)
-                        if col < len(row) and row[col] is not None
-                    )
-                ),
-                next(
-                    (
-                        len(self.data) - 1 - i
-                        for i, row in enumerate(reversed(self.data))
-                        if col < len(row) and row[col] is not None
-                    )
-                ),
-            )
-            for col in range(self.width)
-        ]
-
-    def get_next(self, s: State) -> State:
-        match s.hdg:
+    """
+    The board, padded with void so that stepping off any edge of it lands on void.
+    Positions are flat indexes into the grid, and only wrapping around needs to deal
+    in coordinates.
+    """
+
+    def __init__(self, grid: Grid):
+        self.grid = grid
+        # in the same order as Heading
+        self.steps = (
+            grid.offset(1, 0),
+            grid.offset(0, 1),
+            grid.offset(-1, 0),
+            grid.offset(0, -1),
+        )
+        # indexed by [row, 0] for the first x on the board and [row, 1] for the last
+        self.x_rng = memoryview(artifacts.cached("x_rng", get_spans, grid, 1))
+        # likewise by column, for y
+        self.y_rng = memoryview(artifacts.cached("y_rng", get_spans, grid, 0))
+
+    def wrap(self, x: int, y: int, hdg: Heading) -> tuple[int, Heading]:
+        match hdg:
             case Heading.UP:
-                if s.y > 0 and self.data[s.y - 1][s.x] is not None:
-                    return State(s.x, s.y - 1, s.hdg)
-                else:
-                    return State(s.x, self.y_rng[s.x][1], s.hdg)
+                return (self.grid.index(x, self.y_rng[x, 1]), hdg)
             case Heading.LEFT:
-                if s.x > 0 and self.data[s.y][s.x - 1] is not None:
-                    return State(s.x - 1, s.y, s.hdg)
-                else:
-                    return State(len(self.data[s.y]) - 1, s.y, s.hdg)
+                return (self.grid.index(self.x_rng[y, 1], y), hdg)
             case Heading.DOWN:
-                if s.y < len(self.data) - 1 and s.x < len(self.data[s.y + 1]):
-                    return State(s.x, s.y + 1, s.hdg)
-                else:
-                    return State(s.x, self.y_rng[s.x][0], s.hdg)
+                return (self.grid.index(x, self.y_rng[x, 0]), hdg)
             case Heading.RIGHT:
-                if s.x < len(self.data[s.y]) - 1:
-                    return State(s.x + 1, s.y, s.hdg)
-                else:
-                    return State(self.leftmost[s.y], s.y, s.hdg)
+                return (self.grid.index(self.x_rng[y, 0], y), hdg)
 
+    def get_next(self, i: int, hdg: Heading) -> tuple[int, Heading]:
+        if self.grid.cells[next := i + self.steps[hdg]] != VOID:
+            return (next, hdg)
+        return self.wrap(*self.grid.coords(i), hdg)
 
-def parse_char(c: str) -> Optional[bool]:
-    match c:
-        case " ":
-            return None
-        case ".":
-            return False
-        case "#":
-            return True
-        case _:
-            raise ValueError(c)
+
+@timing.phase(timing.PRECOMPUTE)
+def get_spans(grid: Grid, axis: int) -> NDArray[np.intp]:
+    """
+    The first and last positions on the board along each row (axis 1) or column
+    (axis 0)
+    """
+    import numpy as np
+
+    on_board = grid.array() != VOID
+    if axis == 0:
+        on_board = on_board.T
+    first = on_board.argmax(axis=1)
+    last = on_board.shape[1] - 1 - on_board[:, ::-1].argmax(axis=1)
+    return np.stack((first, last), axis=1)
 
 
 Move = int | str
 
 
+@timing.phase(timing.PARSE)
 def iter_moves(s: str) -> Iterator[Move]:
     buf = ""
     for c in s:
@@ -107,93 +101,90 @@ def iter_moves(s: str) -> Iterator[Move]:
         yield int(buf)
 
 
-def parse_inp(inp: TextIO, map_type: Type[Map]) -> tuple[Map, Iterator[Move]]:
-    m = list[list[Optional[bool]]]()
-    for line in inp:
-        line = line.rstrip()
-        if not line:
-            break
-
-        m.append([parse_char(c) for c in line])
-
-    return (map_type(m), iter_moves(inp.readline().rstrip()))
+@timing.phase(timing.PARSE)
+def parse_inp(inp: TextIO) -> tuple[Grid, list[Move]]:
+    board, moves = inp.read().split("\n\n")
+    return (Grid.parse(board, pad=1, fill=VOID), list(iter_moves(moves.strip())))
 
 
-def do_move(m: Map, move: Move, state: State) -> State:
+def do_move(m: Map, move: Move, i: int, hdg: Heading) -> tuple[int, Heading]:
     if isinstance(move, str):
-        state.hdg = state.hdg.rotate(move)
-        return state
+        return (i, hdg.rotate(move))
 
+    cells = m.grid.cells
     for _ in range(move):
-        new_s = m.get_next(state)
-        if m.data[new_s.y][new_s.x]:
-            return state
+        next, next_hdg = m.get_next(i, hdg)
+        if cells[next] == WALL:
+            break
 
-        state = new_s
+        i, hdg = next, next_hdg
 
-    return state
+    return (i, hdg)
 
 
-def navigate(m: Map, moves: Iterator[Move]) -> int:
-    s = State(m.leftmost[0], 0, Heading.RIGHT)
+def navigate(m: Map, moves: Iterable[Move]) -> int:
+    i = m.grid.index(m.x_rng[0, 0], 0)
+    hdg = Heading.RIGHT
     for move in moves:
-        s = do_move(m, move, s)
+        i, hdg = do_move(m, move, i, hdg)
 
-    return 1000 * (1 + s.y) + 4 * (1 + s.x) + s.hdg.value
+    x, y = m.grid.coords(i)
+    return 1000 * (1 + y) + 4 * (1 + x) + hdg.value
 
 
 def part1(inp: TextIO) -> int:
-    m, moves = parse_inp(inp, Map)
+    grid, moves = parse_inp(inp)
 
-    return navigate(m, moves)
+    return navigate(Map(grid), moves)
 
 
 class HardcodedCubeMap(Map):
-    def get_next(self, s: State) -> State:
-        match s.hdg:
+    def wrap(self, x: int, y: int, hdg: Heading) -> tuple[int, Heading]:
+        match hdg:
             case Heading.UP:
-                if s.y > 0 and self.data[s.y - 1][s.x] is not None:
-                    return State(s.x, s.y - 1, s.hdg)
-                elif s.x < 50:
-                    return State(50, 50 + s.x, Heading.RIGHT)
-                elif s.x < 100:
-                    return State(0, 150 + s.x - 50, Heading.RIGHT)
+                if x < 50:
+                    x, y, hdg = 50, 50 + x, Heading.RIGHT
+                elif x < 100:
+                    x, y, hdg = 0, 150 + x - 50, Heading.RIGHT
                 else:
-                    return State(s.x - 100, 199, Heading.UP)
+                    x, y, hdg = x - 100, 199, Heading.UP
             case Heading.LEFT:
-                if s.x > 0 and self.data[s.y][s.x - 1] is not None:
-                    return State(s.x - 1, s.y, s.hdg)
-                elif s.y < 50:
-                    return State(0, 149 - s.y, Heading.RIGHT)
-                elif s.y < 100:
-                    return State(s.y - 50, 100, Heading.DOWN)
-                elif s.y < 150:
-                    return State(50, 49 - (s.y - 100), Heading.RIGHT)
+                if y < 50:
+                    x, y, hdg = 0, 149 - y, Heading.RIGHT
+                elif y < 100:
+                    x, y, hdg = y - 50, 100, Heading.DOWN
+                elif y < 150:
+                    x, y, hdg = 50, 49 - (y - 100), Heading.RIGHT
                 else:
-                    return State(50 + (s.y - 150), 0, Heading.DOWN)
+                    x, y, hdg = 50 + (y - 150), 0, Heading.DOWN
             case Heading.DOWN:
-                if s.y < len(self.data) - 1 and s.x < len(self.data[s.y + 1]):
-                    return State(s.x, s.y + 1, s.hdg)
-                elif s.x < 50:
-                    return State(100 + s.x, 0, Heading.DOWN)
-                elif s.x < 100:
-                    return State(49, 150 + (s.x - 50), Heading.LEFT)
+                if x < 50:
+                    x, y, hdg = 100 + x, 0, Heading.DOWN
+                elif x < 100:
+                    x, y, hdg = 49, 150 + (x - 50), Heading.LEFT
                 else:
-                    return State(99, 50 + (s.x - 100), Heading.LEFT)
+                    x, y, hdg = 99, 50 + (x - 100), Heading.LEFT
             case Heading.RIGHT:
-                if s.x < len(self.data[s.y]) - 1:
-                    return State(s.x + 1, s.y, s.hdg)
-                elif s.y < 50:
-                    return State(99, 149 - s.y, Heading.LEFT)
-                elif s.y < 100:
-                    return State(100 + (s.y - 50), 49, Heading.UP)
-                elif s.y < 150:
-                    return State(149, 49 - (s.y - 100), Heading.LEFT)
+                if y < 50:
+                    x, y, hdg = 99, 149 - y, Heading.LEFT
+                elif y < 100:
+                    x, y, hdg = 100 + (y - 50), 49, Heading.UP
+                elif y < 150:
+                    x, y, hdg = 149, 49 - (y - 100), Heading.LEFT
                 else:
-                    return State(50 + (s.y - 150), 149, Heading.UP)
+                    x, y, hdg = 50 + (y - 150), 149, Heading.UP
+
+        return (self.grid.index(x, y), hdg)
 
 
 def part2(inp: TextIO) -> int:
-    m, moves = parse_inp(inp, HardcodedCubeMap)
+    grid, moves = parse_inp(inp)
+
+    return navigate(HardcodedCubeMap(grid), moves)
+
+
+def solve(inp: TextIO) -> tuple[int, int]:
+    # neither map changes the grid, so they can share it
+    grid, moves = parse_inp(inp)
 
-    return navigate(m, moves)
+    return (navigate(Map(grid), moves), navigate(HardcodedCubeMap(grid), moves))
@@ -1,20 +1,21 @@
 from collections import Counter, deque
-from typing import Iterable, Optional, Sequence, TextIO
+from itertools import islice
+from typing import Iterable, Iterator, Optional, Sequence, TextIO
 
-Vec2 = complex
+import timing
+from grid import Grid
 
+ELF = ord("#")
 
-N = complex(0, -1)
-NW = complex(-1, -1)
-NE = complex(1, -1)
-W = complex(-1, 0)
-E = complex(1, 0)
-SW = complex(-1, 1)
-S = complex(0, 1)
-SE = complex(1, 1)
-
-ALL_DIRECTIONS = (NW, N, NE, W, E, SW, S, SE)
-
+# Neighbour offsets depend on the grid's stride, so directions are given as (dx, dy)
+N = (0, -1)
+NW = (-1, -1)
+NE = (1, -1)
+W = (-1, 0)
+E = (1, 0)
+SW = (-1, 1)
+S = (0, 1)
+SE = (1, 1)
 
 NORTH = (N, NW, NE)
 SOUTH = (S, SW, SE)
@@ -25,77 +26,129 @@ EAST = (E, NE, SE)
 INIT_ORDER = (NORTH, SOUTH, WEST, EAST)
 
 
-def parse_inp(inp: TextIO) -> list[Vec2]:
-    res = list[Vec2]()
-    for y, line in enumerate(inp):
-        for x, c in enumerate(line.rstrip()):
-            if c == "#":
-                res.append(complex(x, y))
-    return res
+class Grove:
+    """
+    Elves are kept both as a list of flat indexes and as an occupancy grid. Whenever an
+    elf reaches the edge of the grid, it's rebuilt with more padding, so that every
+    elf's neighbours are always in bounds.
+    """
+
+    def __init__(self, grid: Grid, elves: list[int]):
+        self.grid = grid
+        self.elves = elves
+
+    @classmethod
+    def from_coords(cls, coords: Iterable[tuple[int, int]], like: Grid) -> "Grove":
+        grid = Grid(like.width, like.height, max(like.pad * 2, 1))
+        elves = [grid.index(x, y) for x, y in coords]
+        for i in elves:
+            grid.cells[i] = 1
+        return cls(grid, elves)
+
+    def coords(self) -> list[tuple[int, int]]:
+        return [self.grid.coords(i) for i in self.elves]
+
+    def grow(self) -> "Grove":
+        return Grove.from_coords(self.coords(), self.grid)
+
+
+@timing.phase(timing.PARSE)
+def parse_inp(inp: TextIO) -> Grove:
+    grid = Grid.parse(inp.read())
+    coords = [grid.coords(i) for i in grid.indices() if grid.cells[i] == ELF]
+    return Grove.from_coords(coords, grid)
 
 
 def propose_next(
-    order: Iterable[Sequence[Vec2]], occupied: set[Vec2], pos: Vec2
-) -> Optional[Vec2]:
-    for dir in ALL_DIRECTIONS:
-        if (pos + dir) in occupied:
+    order: Iterable[Sequence[int]],
+    all_directions: Sequence[int],
+    occupied: bytearray,
+    pos: int,
+) -> Optional[int]:
+    for dir in all_directions:
+        if occupied[pos + dir]:
             break
     else:
         return None
 
     for check in order:
         for dir in check:
-            if (pos + dir) in occupied:
+            if occupied[pos + dir]:
                 break
         else:
             return pos + check[0]
 
 
-def bounding_box_area(elf_pos: Iterable[Vec2]) -> int:
-    min_x = min(int(pos.real) for pos in elf_pos)
-    max_x = max(int(pos.real) for pos in elf_pos)
-    min_y = min(int(pos.imag) for pos in elf_pos)
-    max_y = max(int(pos.imag) for pos in elf_pos)
-
-    return (max_x - min_x + 1) * (max_y - min_y + 1)
+def bounding_box_area(elf_pos: Iterable[tuple[int, int]]) -> int:
+    xs, ys = zip(*elf_pos)
+    return (max(xs) - min(xs) + 1) * (max(ys) - min(ys) + 1)
 
 
-def sim_elves(elf_pos: list[Vec2], max_rounds: Optional[int]) -> tuple[int, list[Vec2]]:
+def sim_elves(grove: Grove) -> Iterator[Grove]:
+    """
+    The grove after each round, until the first in which no elf has anywhere to move.
+    The grove may be updated in place from one round to the next.
+    """
     order = deque(INIT_ORDER)
 
-    round_num = 1
-    while max_rounds is None or round_num <= max_rounds:
-        all_pos = set(elf_pos)
-        proposals = [propose_next(order, all_pos, elf) for elf in elf_pos]
+    while True:
+        grid = grove.grid
+        occupied = grid.cells
+        offset_order = [tuple(grid.offset(*dir) for dir in check) for check in order]
+        proposals = [
+            propose_next(offset_order, grid.offsets8, occupied, elf)
+            for elf in grove.elves
+        ]
 
-        proposal_counts = Counter[Vec2]()
+        proposal_counts = Counter[int]()
         for proposal in proposals:
             if proposal is not None:
                 proposal_counts[proposal] += 1
 
         if len(proposal_counts) == 0:
-            break
+            return
 
-        new_pos = list[Vec2]()
-        for elf, proposal in zip(elf_pos, proposals):
+        new_pos = list[int]()
+        reached_edge = False
+        for elf, proposal in zip(grove.elves, proposals):
             if proposal is None or proposal_counts[proposal] > 1:
                 new_pos.append(elf)
             else:
+                occupied[elf] = 0
+                occupied[proposal] = 1
                 new_pos.append(proposal)
+                reached_edge = reached_edge or grid.on_edge(proposal)
 
-        elf_pos = new_pos
+        grove.elves = new_pos
+        if reached_edge:
+            grove = grove.grow()
         order.rotate(-1)
-        round_num += 1
+        yield grove
+
 
-    return round_num, elf_pos
+def empty_ground(grove: Grove) -> int:
+    return bounding_box_area(grove.coords()) - len(grove.elves)
 
 
 def part1(inp: TextIO) -> int:
-    _, elf_pos = sim_elves(parse_inp(inp), 10)
+    grove = parse_inp(inp)
+    for grove in islice(sim_elves(grove), 10):
+        pass
 
-    return bounding_box_area(elf_pos) - len(elf_pos)
+    return empty_ground(grove)
 
 
 def part2(inp: TextIO) -> int:
-    rounds, _ = sim_elves(parse_inp(inp), None)
-    return rounds
+    # the answer is the first round in which no elf moves
+    return 1 + sum(1 for _ in sim_elves(parse_inp(inp)))
+
+
+def solve(inp: TextIO) -> tuple[int, int]:
+    grove = parse_inp(inp)
+    empty = empty_ground(grove)
+    rounds = 0
+    for rounds, grove in enumerate(sim_elves(grove), 1):
+        if rounds <= 10:
+            empty = empty_ground(grove)
+
+    return (empty, rounds + 1)
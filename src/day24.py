@@ -1,119 +1,132 @@
-from collections import defaultdict, deque
-from dataclasses import dataclass
-from typing import TextIO
+from __future__ import annotations
 
-Blizzards = dict[int, set[int]]
-State = tuple[int, int, int, int, int]  # row, col, h_offset, v_offset, dest_idx
+from dataclasses import dataclass
+from math import lcm
+from typing import TYPE_CHECKING, TextIO
+
+import artifacts
+import budget
+import search
+import stats
+import timing
+from grid import Grid
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+# Each cell of the valley holds a bit per direction of blizzard starting there, or a
+# bit of its own for a wall
+LEFT = 1
+RIGHT = 2
+UP = 4
+DOWN = 8
+WALL = 16
+BLIZZARD_BITS = bytes.maketrans(b".<>^v#", bytes((0, LEFT, RIGHT, UP, DOWN, WALL)))
 
 
 @dataclass
 class Map:
     rows: int
     cols: int
-    start_col: int
-    end_col: int
-    left_blizzards: Blizzards
-    right_blizzards: Blizzards
-    up_blizzards: Blizzards
-    down_blizzards: Blizzards
-
-
-MOVES = ((0, 0), (1, 0), (-1, 0), (0, 1), (0, -1))
-
-
-def find_shortest_path(
-    map: Map,
-    waypoints: list[tuple[int, int]],
-) -> int:
-    init_state = (waypoints[0][0], waypoints[0][1], 1, 1, 1)
-    visited = set[State]((init_state,))
-    queue = deque[tuple[State, int]](((init_state, 1),))
-    while queue:
-        (r, c, h_offset, v_offset, dest_idx), minute = queue.popleft()
-
-        next_h_offset = (h_offset + 1) % (map.cols - 2)
-        next_v_offset = (v_offset + 1) % (map.rows - 2)
-
-        for (dr, dc) in MOVES:
-            next_r = r + dr
-            next_c = c + dc
-            if waypoints[dest_idx][0] == next_r and waypoints[dest_idx][1] == next_c:
-                dest_idx += 1
-                if dest_idx == len(waypoints):
-                    return minute
-            elif next_r < -1:
-                continue
-            elif next_r == -1 and next_c != map.start_col:
-                continue
-            elif next_r > map.rows - 2:
-                continue
-            elif next_r == map.rows - 2 and next_c != map.end_col:
-                continue
-            elif next_c < 0 or next_c > map.cols - 2:
-                continue
-            elif (next_c + h_offset) % (map.cols - 2) in map.left_blizzards[next_r]:
-                continue
-            elif (next_c - h_offset) % (map.cols - 2) in map.right_blizzards[next_r]:
-                continue
-            elif (next_r + v_offset) % (map.rows - 2) in map.up_blizzards[next_c]:
-                continue
-            elif (next_r - v_offset) % (map.rows - 2) in map.down_blizzards[next_c]:
-                continue
-            elif (next_r, next_c, next_h_offset, next_v_offset, dest_idx) in visited:
-                continue
-
-            next_state = (next_r, next_c, next_h_offset, next_v_offset, dest_idx)
-            visited.add(next_state)
-            queue.append((next_state, minute + 1))
+    start: int  # the flat index of the gap in the top wall
+    end: int  # and in the bottom wall
+    period: int  # minutes after which the blizzards are back where they started
+    clear: bytes  # whether each cell is free to stand in, for each minute of a period
+
+
+def find_shortest_path(map: Map, waypoints: list[int]) -> int:
+    "Minutes to visit each waypoint in turn. Raises budget.Exhausted if out of time."
+    cells = map.rows * map.cols
+    clear = map.clear
+    period = map.period
+    # waiting, or moving to any neighbour
+    steps = (0, 1, -1, map.cols, -map.cols)
+
+    # A state is the leg of the trip, the minute within the period and the cell. The
+    # search is done on reaching the last waypoint, so there's one leg past the end.
+    minute_size = cells
+    leg_size = period * minute_size
+    last_leg = len(waypoints) - 1
+
+    def moves(state: int) -> list[int]:
+        leg, rest = divmod(state, leg_size)
+        minute, cell = divmod(rest, minute_size)
+        base = (minute + 1) % period * minute_size
+        dest = waypoints[leg + 1]
+        res = []
+        for step in steps:
+            next_cell = cell + step
+            if 0 <= next_cell < cells and clear[base + next_cell]:
+                next_leg = leg + 1 if next_cell == dest else leg
+                res.append(next_leg * leg_size + base + next_cell)
+        return res
+
+    targets = {
+        last_leg * leg_size + minute * minute_size + waypoints[-1]
+        for minute in range(period)
+    }
+    size = (last_leg + 1) * leg_size
+    reached = 0
+    for minute, frontier in enumerate(search.levels(size, (waypoints[0],), moves)):
+        reached += len(frontier)
+        if not targets.isdisjoint(frontier):
+            stats.add("day24.expanded", reached)
+            stats.peak("day24.visited", reached)
+            return minute
+        elif budget.expired():
+            # every state from this minute or earlier has been reached without
+            # getting to the end, so no path can be any shorter than the next minute
+            raise budget.Exhausted(budget.Outcome(None, minute + 1))
 
     raise ValueError
 
 
+@timing.phase(timing.PARSE)
+def parse_valley(inp: TextIO) -> NDArray[np.uint8]:
+    "The whole valley, walls included, with a byte of blizzard bits per cell"
+    return Grid.parse(inp.read().strip().encode().translate(BLIZZARD_BITS)).array()
+
+
+@timing.phase(timing.PRECOMPUTE)
+def get_clear(valley: NDArray[np.uint8]) -> NDArray[np.uint8]:
+    """
+    For each minute until the blizzards repeat, whether each cell of the valley is
+    free of both walls and blizzards
+    """
+    import numpy as np
+
+    inner = valley[1:-1, 1:-1]
+    height, width = inner.shape
+    period = lcm(width, height)
+    clear = np.empty((period,) + valley.shape, dtype=np.uint8)
+    clear[:] = valley & WALL == 0
+    for minute in range(period):
+        # each blizzard is wherever it started, shifted by a cell per minute
+        blocked = (
+            np.roll(inner & LEFT, -minute, 1)
+            | np.roll(inner & RIGHT, minute, 1)
+            | np.roll(inner & UP, -minute, 0)
+            | np.roll(inner & DOWN, minute, 0)
+        )
+        clear[minute, 1:-1, 1:-1] = blocked == 0
+    return clear
+
+
 def get_map(inp: TextIO) -> Map:
-    "To simplify math later on, indexes are from [-1, width/col - 1)"
-    s = [line.rstrip() for line in inp.readlines()]
-    rows = len(s)
-    cols = len(s[0])
-    start_col = s[0].index(".") - 1
-    end_col = s[-1].index(".") - 1
-
-    left_blizzards: Blizzards = defaultdict(set)
-    right_blizzards: Blizzards = defaultdict(set)
-    up_blizzards: Blizzards = defaultdict(set)
-    down_blizzards: Blizzards = defaultdict(set)
-    for r in range(rows - 2):
-        for c in range(cols - 2):
-            match s[1 + r][1 + c]:
-                case "<":
-                    left_blizzards[r].add(c)
-                case ">":
-                    right_blizzards[r].add(c)
-                case "^":
-                    up_blizzards[c].add(r)
-                case "v":
-                    down_blizzards[c].add(r)
-                case _:
-                    continue
-
-    return Map(
-        rows,
-        cols,
-        start_col,
-        end_col,
-        left_blizzards,
-        right_blizzards,
-        up_blizzards,
-        down_blizzards,
-    )
+    valley = artifacts.cached("valley", parse_valley, inp)
+    clear = artifacts.cached("clear", get_clear, valley)
+    period, rows, cols = clear.shape
+    start = valley[0].tolist().index(0)
+    end = (rows - 1) * cols + valley[-1].tolist().index(0)
+    return Map(rows, cols, start, end, period, clear.tobytes())
 
 
 def part1(inp: TextIO) -> int:
     map = get_map(inp)
-    return find_shortest_path(map, [(-1, map.start_col), (map.rows - 2, map.end_col)])
+    return find_shortest_path(map, [map.start, map.end])
 
 
 def part2(inp: TextIO) -> int:
     map = get_map(inp)
-    start = (-1, map.start_col)
-    end = (map.rows - 2, map.end_col)
-    return find_shortest_path(map, [start, end, start, end])
+    return find_shortest_path(map, [map.start, map.end, map.start, map.end])
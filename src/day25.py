@@ -1,5 +1,8 @@
 from collections import deque
-from typing import TextIO
+
+from fastio import MappedInput
+
+MAPPED_INPUT = True
 
 BASE = 5
 
@@ -13,6 +16,10 @@ def decode_digit(c: str) -> int:
         return -2
 
 
+# decode_digit for each possible byte of an input line
+BYTE_DIGITS = {ord(c): decode_digit(c) for c in "210-="}
+
+
 def encode_digit(digit: int) -> str:
     if digit >= 0:
         return str(digit)
@@ -23,12 +30,15 @@ def encode_digit(digit: int) -> str:
 
 
 class SnafuCodedInt:
-    digits = deque[int]()
+    digits: deque[int]
 
-    def __init__(self, val: int | str):
+    def __init__(self, val: int | str | bytes):
         if isinstance(val, str):
             self.digits = deque(decode_digit(c) for c in val)
+        elif isinstance(val, bytes):
+            self.digits = deque(BYTE_DIGITS[c] for c in val)
         else:
+            self.digits = deque()
             carry = 0
             while val > 0:
                 min_digit = val % 5 + carry
@@ -51,7 +61,18 @@ class SnafuCodedInt:
         return "".join(encode_digit(digit) for digit in self.digits)
 
 
-def part1(inp: TextIO) -> int:
-    res = sum(SnafuCodedInt(line.rstrip()).to_decimal() for line in inp)
+def part1(inp: MappedInput) -> int:
+    res = sum(SnafuCodedInt(line.rstrip()).to_decimal() for line in inp.lines())
     print(SnafuCodedInt(res).to_string())
     return res
+
+
+class Stream:
+    def __init__(self):
+        self.total = 0
+
+    def feed(self, line: bytes):
+        self.total += SnafuCodedInt(line.strip()).to_decimal()
+
+    def answers(self) -> tuple[int]:
+        return (self.total,)
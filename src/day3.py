@@ -1,40 +1,47 @@
-from typing import Callable, Generator, Iterator, Set, TextIO, Tuple, TypeVar
+from typing import Callable, Generator, Iterator, Set, Tuple, TypeVar
 
-Rucksack = str
+from fastio import MappedInput
+
+MAPPED_INPUT = True
+
+Rucksack = bytes
 
 T = TypeVar("T")
 
 RucksackTupleGen = Generator[Tuple[Rucksack, ...], None, None]
 
-GetRucksacksFunc = Callable[[TextIO], RucksackTupleGen]
+GetRucksacksFunc = Callable[[MappedInput], RucksackTupleGen]
 
 
-def common(rucksacks: Tuple[Rucksack, ...]) -> str:
-    res: Set[str] = set.intersection(*(set(rs) for rs in rucksacks))  # type: ignore
+def common(rucksacks: Tuple[Rucksack, ...]) -> int:
+    "The item (as a byte value) common to all of the given rucksacks"
+    res: Set[int] = set.intersection(*(set(rs) for rs in rucksacks))  # type: ignore
     assert len(res) == 1
     return res.pop()
 
 
-def score(badge: str) -> int:
-    if badge.islower():
-        return 1 + ord(badge) - ord("a")
+def score(badge: int) -> int:
+    if badge >= ord("a"):
+        return 1 + badge - ord("a")
     else:
-        return 27 + ord(badge) - ord("A")
+        return 27 + badge - ord("A")
 
 
-def get_total_score(inp: TextIO, get_rucksacks_fn: GetRucksacksFunc) -> int:
+def get_total_score(inp: MappedInput, get_rucksacks_fn: GetRucksacksFunc) -> int:
     return sum(score(common(tup)) for tup in get_rucksacks_fn(inp))
 
 
-def get_rucksacks_p1(inp: TextIO) -> RucksackTupleGen:
-    for line in inp:
-        line = line.rstrip()
+def compartments(line: bytes) -> Tuple[Rucksack, Rucksack]:
+    demarcation = len(line) // 2
+    return (line[:demarcation], line[demarcation:])
 
-        demarcation = len(line) // 2
-        yield (line[:demarcation], line[demarcation:])
 
+def get_rucksacks_p1(inp: MappedInput) -> RucksackTupleGen:
+    for line in inp.lines():
+        yield compartments(line.rstrip())
 
-def part1(inp: TextIO) -> int:
+
+def part1(inp: MappedInput) -> int:
     return get_total_score(inp, get_rucksacks_p1)
 
 
@@ -50,9 +57,33 @@ def yield3(iter: Iterator[T]) -> Generator[Tuple[T, T, T], None, None]:
         pass
 
 
-def get_rucksacks_p2(inp: TextIO) -> RucksackTupleGen:
-    return yield3(line.rstrip() for line in inp)
+def get_rucksacks_p2(inp: MappedInput) -> RucksackTupleGen:
+    return yield3(line.rstrip() for line in inp.lines())
 
 
-def part2(inp: TextIO) -> int:
+def part2(inp: MappedInput) -> int:
     return get_total_score(inp, get_rucksacks_p2)
+
+
+class Stream:
+    "Part 2 holds back up to two rucksacks, until their group is complete"
+
+    def __init__(self):
+        self.totals = (0, 0)
+        self.group: list[Rucksack] = []
+
+    def feed(self, line: bytes):
+        line = line.rstrip()
+        if not line:
+            return
+
+        p1 = score(common(compartments(line)))
+        p2 = 0
+        self.group.append(line)
+        if len(self.group) == 3:
+            p2 = score(common(tuple(self.group)))
+            self.group.clear()
+        self.totals = (self.totals[0] + p1, self.totals[1] + p2)
+
+    def answers(self) -> tuple[int, int]:
+        return self.totals
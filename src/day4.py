@@ -1,5 +1,9 @@
 from dataclasses import dataclass
-from typing import Generator, TextIO, Tuple
+from typing import Generator, Tuple
+
+from fastio import MappedInput
+
+MAPPED_INPUT = True
 
 
 @dataclass
@@ -12,17 +16,19 @@ class Range:
         return self.upper - self.lower
 
 
-def parse_range(s: str) -> Range:
-    ls, us = s.split("-")
+def parse_range(s: bytes) -> Range:
+    ls, us = s.split(b"-")
     return Range(int(ls), int(us))
 
 
-def get_pairs(inp: TextIO) -> Generator[Tuple[Range, Range], None, None]:
-    for line in inp:
-        line = line.rstrip()
+def parse_pair(line: bytes) -> Tuple[Range, Range]:
+    r1s, r2s = line.rstrip().split(b",")
+    return (parse_range(r1s), parse_range(r2s))
 
-        r1s, r2s = line.split(",")
-        yield (parse_range(r1s), parse_range(r2s))
+
+def get_pairs(inp: MappedInput) -> Generator[Tuple[Range, Range], None, None]:
+    for line in inp.lines():
+        yield parse_pair(line)
 
 
 def totally_overlap(p1: Range, p2: Range) -> bool:
@@ -31,7 +37,7 @@ def totally_overlap(p1: Range, p2: Range) -> bool:
     return larger.lower <= smaller.lower and smaller.upper <= larger.upper
 
 
-def part1(inp: TextIO) -> int:
+def part1(inp: MappedInput) -> int:
     return sum(int(totally_overlap(p1, p2)) for p1, p2 in get_pairs(inp))
 
 
@@ -41,5 +47,22 @@ def partially_overlap(p1: Range, p2: Range) -> bool:
     return rlower.upper >= rupper.lower
 
 
-def part2(inp: TextIO) -> int:
+def part2(inp: MappedInput) -> int:
     return sum(int(partially_overlap(p1, p2)) for p1, p2 in get_pairs(inp))
+
+
+class Stream:
+    def __init__(self):
+        self.counts = (0, 0)
+
+    def feed(self, line: bytes):
+        if not line.strip():
+            return
+        p1, p2 = parse_pair(line)
+        self.counts = (
+            self.counts[0] + int(totally_overlap(p1, p2)),
+            self.counts[1] + int(partially_overlap(p1, p2)),
+        )
+
+    def answers(self) -> tuple[int, int]:
+        return self.counts
@@ -2,6 +2,8 @@ from collections import deque
 from dataclasses import dataclass
 from typing import Callable, Deque, Generator, List, TextIO
 
+import timing
+
 Stacks = List[Deque[str]]
 
 
@@ -12,6 +14,7 @@ class Move:
     dest: int
 
 
+@timing.phase(timing.PARSE)
 def get_init(inp: TextIO) -> Stacks:
     stacks: Stacks = []
     for line in inp:
@@ -29,6 +32,7 @@ def get_init(inp: TextIO) -> Stacks:
     return stacks
 
 
+@timing.phase(timing.PARSE)
 def get_moves(inp: TextIO) -> Generator[Move, None, None]:
     for line in inp:
         tokens = line.split()
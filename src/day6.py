@@ -5,8 +5,12 @@ T = TypeVar("T")
 
 
 class CounterWithUniqueNonzero(Generic[T]):
-    _counter: Counter[T] = Counter()
-    num_unique: int = 0
+    _counter: Counter[T]
+    num_unique: int
+
+    def __init__(self) -> None:
+        self._counter = Counter()
+        self.num_unique = 0
 
     def __getitem__(self, c: T) -> int:
         return self._counter[c]
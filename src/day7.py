@@ -1,6 +1,8 @@
 from itertools import chain
 from typing import Generator, Optional, TextIO
 
+import timing
+
 
 class File:
     name: str
@@ -61,6 +63,7 @@ def do_cd(root: Directory, cur: Directory, arg: str) -> Directory:
         return file
 
 
+@timing.phase(timing.PARSE)
 def discover_filesystem(inp: TextIO) -> Directory:
     root = Directory("/", None)
     cur = root
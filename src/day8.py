@@ -1,111 +1,65 @@
-from dataclasses import dataclass
-from typing import Generator, Iterator, TextIO
+from __future__ import annotations
 
-Coords = tuple[int, int]
+from typing import TYPE_CHECKING, TextIO
 
+import timing
+from grid import Grid
 
-@dataclass
-class HeightMap:
-    grid: list[list[int]]
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
 
-    @property
-    def height(self) -> int:
-        return len(self.grid)
 
-    @property
-    def width(self) -> int:
-        return len(self.grid[0])
+@timing.phase(timing.PARSE)
+def parse_heightmap(inp: TextIO) -> Grid:
+    return Grid.parse(inp.read())
 
-    def __getitem__(self, coords: Coords) -> int:
-        return self.grid[coords[0]][coords[1]]
 
+def visible_from_left(heights: NDArray[np.int16]) -> NDArray[np.bool_]:
+    "Which trees are taller than every tree to their left"
+    import numpy as np
 
-def parse_heightmap(inp: TextIO) -> HeightMap:
-    grid: list[list[int]] = []
-    for line in inp:
-        line = line.rstrip()
-
-        grid.append(list(int(c) for c in line))
-
-    return HeightMap(grid)
-
-
-def scan_for_visible(
-    heightmap: HeightMap, coords_it: Iterator[Coords]
-) -> Generator[Coords, None, None]:
-    max_height = -1
-    for coords in coords_it:
-        if (height := heightmap[coords]) > max_height:
-            max_height = height
-            yield coords
+    tallest_before = np.full_like(heights, -1)
+    np.maximum.accumulate(heights[:, :-1], axis=1, out=tallest_before[:, 1:])
+    return heights > tallest_before
 
 
 def part1(inp: TextIO):
-    heightmap = parse_heightmap(inp)
-
-    visible_coords: set[tuple[int, int]] = set()
-
-    for r in range(heightmap.height):
-        # scan row left to right
-        visible_coords.update(
-            scan_for_visible(heightmap, ((r, c) for c in range(heightmap.width)))
-        )
-        # right to left
-        visible_coords.update(
-            scan_for_visible(
-                heightmap, ((r, c) for c in range(heightmap.width - 1, -1, -1))
-            )
-        )
+    heights = parse_heightmap(inp).array().astype("int16")
 
-    for c in range(heightmap.width):
-        # scan col top to bottom
-        visible_coords.update(
-            scan_for_visible(heightmap, ((r, c) for r in range(heightmap.height)))
-        )
-        # bottom to top
-        visible_coords.update(
-            scan_for_visible(
-                heightmap, ((r, c) for r in range(heightmap.height - 1, -1, -1))
-            )
-        )
+    visible = visible_from_left(heights)
+    visible |= visible_from_left(heights[:, ::-1])[:, ::-1]
+    visible |= visible_from_left(heights.T).T
+    visible |= visible_from_left(heights.T[:, ::-1])[:, ::-1].T
 
-    return len(visible_coords)
+    return int(visible.sum())
 
 
-def get_blockage_dist(
-    heightmap: HeightMap, height: int, coord_it: Iterator[Coords]
-) -> int:
-    n = 0
-    for coord in coord_it:
-        n += 1
-        if heightmap[coord] >= height:
-            break
+def get_blockage_dist(cells: bytearray, i: int, step: int, num_steps: int) -> int:
+    "How many trees can be seen from cell i, looking `num_steps` trees in one direction"
+    height = cells[i]
+    for n in range(1, num_steps + 1):
+        if cells[i + n * step] >= height:
+            return n
 
-    return n
+    return num_steps
 
 
 def part2(inp: TextIO):
-    heightmap = parse_heightmap(inp)
+    grid = parse_heightmap(inp)
+    cells = grid.cells
+    up, right, down, left = grid.offsets4
 
     max_score = 0
-    for r in range(heightmap.height):
-        for c in range(heightmap.width):
-            height = heightmap[(r, c)]
-            score = (
-                get_blockage_dist(
-                    heightmap, height, ((r, c) for r in range(r - 1, -1, -1))
-                )
-                * get_blockage_dist(
-                    heightmap, height, ((r, c) for r in range(r + 1, heightmap.height))
-                )
-                * get_blockage_dist(
-                    heightmap, height, ((r, c) for c in range(c - 1, -1, -1))
-                )
-                * get_blockage_dist(
-                    heightmap, height, ((r, c) for c in range(c + 1, heightmap.width))
-                )
-            )
-
-            max_score = max(max_score, score)
+    for i in grid.indices():
+        x, y = grid.coords(i)
+        score = (
+            get_blockage_dist(cells, i, up, y)
+            * get_blockage_dist(cells, i, down, grid.height - 1 - y)
+            * get_blockage_dist(cells, i, left, x)
+            * get_blockage_dist(cells, i, right, grid.width - 1 - x)
+        )
+
+        max_score = max(max_score, score)
 
     return max_score
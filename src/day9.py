@@ -1,59 +1,56 @@
 from dataclasses import dataclass
-from enum import Enum
 from typing import Generator, TextIO
 
+import coords
+import timing
+from coords import Point
 
-@dataclass(frozen=True)
-class Vec2:
-    x: int
-    y: int
-
-    def __add__(self, other: "Vec2") -> "Vec2":
-        return Vec2(self.x + other.x, self.y + other.y)
+DIRECTIONS = {
+    "U": coords.offset(0, -1),
+    "D": coords.offset(0, 1),
+    "L": coords.offset(-1, 0),
+    "R": coords.offset(1, 0),
+}
 
-    def __sub__(self, other: "Vec2") -> "Vec2":
-        return Vec2(self.x - other.x, self.y - other.y)
 
-    @property
-    def magnitude(self) -> int:
-        return max(abs(self.x), abs(self.y))
+def sign(n: int) -> int:
+    return (n > 0) - (n < 0)
 
 
-class Direction(Enum):
-    U = Vec2(0, -1)
-    D = Vec2(0, 1)
-    L = Vec2(-1, 0)
-    R = Vec2(1, 0)
+# How a knot moves, given the difference between the position of the knot ahead of it
+# and its own. Knots more than two apart on either axis can't happen.
+FOLLOW = {
+    coords.offset(dx, dy): (
+        0 if max(abs(dx), abs(dy)) <= 1 else coords.offset(sign(dx), sign(dy))
+    )
+    for dx in range(-2, 3)
+    for dy in range(-2, 3)
+}
 
 
 @dataclass(frozen=True)
 class Move:
-    direction: Direction
+    direction: int
     steps: int
 
 
-Rope = list[Vec2]
-
-
-def update_coord(h: int, t: int) -> int:
-    return t + max(-1, min(h - t, 1))
+Rope = list[Point]
 
 
-def do_step(r: Rope, d: Direction) -> None:
-    r[0] += d.value
+def do_step(r: Rope, d: int) -> None:
+    r[0] += d
     for i in range(1, len(r)):
-        h = r[i - 1]
-        t = r[i]
-        if (h - t).magnitude <= 1:
+        if not (step := FOLLOW[r[i - 1] - r[i]]):
             # this knot doesn't move, and neither does any following
             break
-        r[i] = Vec2(update_coord(h.x, t.x), update_coord(h.y, t.y))
+        r[i] += step
 
 
+@timing.phase(timing.PARSE)
 def get_moves(inp: TextIO) -> Generator[Move, None, None]:
     for line in inp:
         ds, ss = line.rstrip().split()
-        yield Move(Direction[ds], int(ss))  # type: ignore
+        yield Move(DIRECTIONS[ds], int(ss))
 
 
 def do_sim(inp: TextIO, length: int) -> int:
@@ -61,8 +58,8 @@ def do_sim(inp: TextIO, length: int) -> int:
     Simulate the sequence of moves specified by the input on a rope with the specified
     length. Return the number of positions occupied by the tail of the rope
     """
-    rope: Rope = [Vec2(0, 0)] * length
-    tail_positions: set[Vec2] = {rope[length - 1]}
+    rope: Rope = [coords.ORIGIN] * length
+    tail_positions: set[Point] = {rope[length - 1]}
     for move in get_moves(inp):
         for _ in range(move.steps):
             do_step(rope, move.direction)
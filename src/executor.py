@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import os
+import sys
+from contextlib import contextmanager
+from itertools import islice
+from math import ceil
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Optional,
+    TypeVar,
+)
+
+import budget
+import stats
+
+if TYPE_CHECKING:
+    # concurrent.futures is imported on first use, since most days never need it
+    from concurrent.futures import Executor
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+KINDS = ("serial", "thread", "process")
+
+# Work is split into about this many chunks per worker, which keeps workers busy
+# towards the end of a run without paying per-item submission overhead
+CHUNKS_PER_WORKER = 4
+
+# Chunks submitted to each thread ahead of their results being taken
+MAX_IN_FLIGHT_PER_WORKER = 2
+
+_kind = "process"
+_workers: Optional[int] = None
+
+# A pool kept running between solutions, when one has been requested
+_shared: Optional[Executor] = None
+
+
+def configure(kind: str = "process", workers: Optional[int] = None):
+    """
+    Choose what kind of executor `pool()` provides, and how many workers it has. The
+    serial executor runs everything in-process, which is what profilers want.
+    """
+    global _kind, _workers
+    if kind not in KINDS:
+        raise ValueError(kind)
+    shutdown()
+    _kind = kind
+    _workers = workers
+
+
+def kind() -> str:
+    return _kind
+
+
+def workers() -> Optional[int]:
+    return _workers
+
+
+def num_workers() -> int:
+    if _kind == "serial":
+        return 1
+    return _workers or os.cpu_count() or 1
+
+
+def serial_executor() -> Executor:
+    "An executor which runs each task to completion as it is submitted, in this thread"
+    from concurrent.futures import Executor, Future
+
+    class SerialExecutor(Executor):
+        def submit(
+            self, fn: Callable[..., R], /, *args: Any, **kwargs: Any
+        ) -> Future[R]:
+            f = Future[R]()
+            try:
+                f.set_result(fn(*args, **kwargs))
+            except BaseException as e:
+                f.set_exception(e)
+            return f
+
+    return SerialExecutor()
+
+
+def make_executor() -> Executor:
+    match _kind:
+        case "serial":
+            return serial_executor()
+        case "thread":
+            from concurrent.futures import ThreadPoolExecutor
+
+            return ThreadPoolExecutor(_workers)
+        case _:
+            from concurrent.futures import ProcessPoolExecutor
+            from multiprocessing import resource_tracker
+
+            # Workers must share this process's resource tracker, or each would
+            # start its own and unlink anything published to it when it exits
+            resource_tracker.ensure_running()
+            return ProcessPoolExecutor(_workers)
+
+
+def keep_alive():
+    "Start an executor which is reused by every later `pool()`, until `shutdown()`"
+    global _shared
+    if _shared is None:
+        _shared = make_executor()
+
+
+def shutdown():
+    global _shared
+    if _shared is not None:
+        _shared.shutdown()
+        _shared = None
+
+
+@contextmanager
+def pool() -> Iterator[Executor]:
+    "The shared executor if there is one, otherwise one just for the enclosed block"
+    if _shared is not None:
+        yield _shared
+        return
+
+    with make_executor() as ex:
+        yield ex
+
+
+class Published(Generic[T]):
+    """
+    A read-only value published once to worker processes, rather than pickled into
+    every task that uses it. Only a small descriptor is pickled; each worker reads
+    the value from shared memory the first time it sees that descriptor. Arrays are
+    shared in place, and anything else is unpickled once per worker.
+    """
+
+    def __init__(self, value: T, descriptor: Optional[tuple[Any, ...]] = None):
+        self._value = value
+        self._descriptor = descriptor
+
+    def get(self) -> T:
+        return self._value
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        if self._descriptor is None:
+            raise TypeError("only values published for a process executor can be sent")
+        return (_attach, (self._descriptor,))
+
+
+def _is_array(value: Any) -> bool:
+    # without importing numpy just to find out
+    np = sys.modules.get("numpy")
+    return np is not None and isinstance(value, np.ndarray)
+
+
+@contextmanager
+def publish(value: T) -> Iterator[Published[T]]:
+    """
+    Publish `value` to the workers of tasks submitted within this context. Workers
+    must treat it as read-only. Threads and the serial executor share it as is.
+    """
+    if _kind != "process":
+        yield Published(value)
+        return
+
+    import pickle
+    from multiprocessing.shared_memory import SharedMemory
+
+    if _is_array(value):
+        import numpy as np
+
+        arr = np.ascontiguousarray(value)
+        shm = SharedMemory(create=True, size=max(1, arr.nbytes))
+        np.ndarray(arr.shape, arr.dtype, buffer=shm.buf)[...] = arr
+        descriptor: tuple[Any, ...] = (shm.name, arr.shape, arr.dtype.str)
+    else:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        shm = SharedMemory(create=True, size=len(data))
+        shm.buf[: len(data)] = data
+        descriptor = (shm.name, len(data))
+
+    try:
+        yield Published(value, descriptor)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# Values published to this worker, by shared memory name, most recent last. The
+# shared memory is kept open for arrays, which are views of it.
+MAX_ATTACHED = 8
+_attached: dict[str, tuple[Any, Any]] = {}
+
+
+def _attach(descriptor: tuple[Any, ...]) -> Published[Any]:
+    name = descriptor[0]
+    if name in _attached:
+        return Published(_attached[name][1])
+
+    from multiprocessing.shared_memory import SharedMemory
+
+    shm = SharedMemory(name=name)
+    if len(descriptor) == 3:
+        import numpy as np
+
+        _, shape, dtype = descriptor
+        value: Any = np.ndarray(shape, dtype, buffer=shm.buf)
+        value.flags.writeable = False
+    else:
+        import pickle
+
+        value = pickle.loads(bytes(shm.buf[: descriptor[1]]))
+        shm.close()
+
+    while len(_attached) >= MAX_ATTACHED:
+        del _attached[next(iter(_attached))]
+    _attached[name] = (shm, value)
+    return Published(value)
+
+
+def run_chunk(fn: Callable[..., R], chunk: list[T], args: tuple[Any, ...]) -> list[R]:
+    return [fn(item, *args) for item in chunk]
+
+
+def run_chunk_remote(
+    fn: Callable[..., R],
+    chunk: list[T],
+    args: tuple[Any, ...],
+    counting: bool,
+    deadline: Optional[float],
+) -> tuple[list[R], Optional[stats.Snapshot]]:
+    """
+    Run a chunk in a worker process under the parent's time budget, returning what
+    was counted along the way if the parent is counting
+    """
+    if counting:
+        stats.enable()
+    with budget.until(deadline):
+        results = run_chunk(fn, chunk, args)
+    return results, stats.snapshot() if counting else None
+
+
+def chunked(items: list[T], size: int) -> Iterator[list[T]]:
+    for start in range(0, len(items), size):
+        end = start + size
+        yield items[start:end]
+
+
+def map_chunked(
+    fn: Callable[..., R],
+    items: Iterable[T],
+    *args: Any,
+    chunksize: Optional[int] = None,
+) -> Iterator[R]:
+    """
+    Yield fn(item, *args) for each item, in no particular order. Items are submitted
+    in chunks, so `args` is pickled once per chunk rather than once per item.
+    """
+    from concurrent.futures import FIRST_COMPLETED, as_completed, wait
+
+    items = list(items)
+    if chunksize is None:
+        chunksize = max(1, ceil(len(items) / (num_workers() * CHUNKS_PER_WORKER)))
+
+    # Other kinds of executor share this process's stats and budget. They're fed
+    # chunks as results are taken, so that a caller tracking progress or saving
+    # checkpoints sees each result as soon as it's ready.
+    if _kind == "serial":
+        for chunk in chunked(items, chunksize):
+            yield from run_chunk(fn, chunk, args)
+        return
+
+    with pool() as ex:
+        if _kind == "thread":
+            chunks = chunked(items, chunksize)
+            in_flight = {
+                ex.submit(run_chunk, fn, chunk, args)
+                for chunk in islice(chunks, num_workers() * MAX_IN_FLIGHT_PER_WORKER)
+            }
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for f in done:
+                    if (chunk := next(chunks, None)) is not None:
+                        in_flight.add(ex.submit(run_chunk, fn, chunk, args))
+                    yield from f.result()
+            return
+
+        counting = stats.is_enabled()
+        remote_fs = [
+            ex.submit(run_chunk_remote, fn, chunk, args, counting, budget.deadline())
+            for chunk in chunked(items, chunksize)
+        ]
+        for remote_f in as_completed(remote_fs):
+            results, counts = remote_f.result()
+            if counts is not None:
+                stats.merge(counts)
+            yield from results
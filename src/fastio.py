@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import io
+import mmap
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional, TextIO
+
+if TYPE_CHECKING:
+    # numpy is imported on first use, so that text-only runs don't pay for it
+    import numpy as np
+    from numpy.typing import NDArray
+
+NEWLINE = ord("\n")
+MINUS = ord("-")
+SPACE = ord(" ")
+TAB = ord("\t")
+CR = ord("\r")
+ZERO = ord("0")
+
+# The most digits an integer line may have, so that every value fits in an int64
+MAX_DIGITS = 18
+
+# Inputs are parsed numerically in chunks of about this many bytes, which bounds the
+# size of the temporary arrays regardless of how large the input is
+CHUNK_SIZE = 1 << 24
+
+
+class MappedInput:
+    """
+    Zero-copy view of an input's raw bytes. Files are memory-mapped, so nothing is
+    read until it's touched and nothing is decoded at all. Unlike a file object, the
+    iterators here can be used any number of times.
+    """
+
+    def __init__(self, data: bytes | mmap.mmap, path: Optional[Path] = None):
+        self._data = data
+        self.path = path
+
+    @classmethod
+    def open(cls, path: str | Path) -> "MappedInput":
+        "Map the file at `path`, or read all of stdin if it is '-'"
+        if str(path) == "-":
+            return cls(sys.stdin.buffer.read())
+
+        path = Path(path)
+        with open(path, "rb") as f:
+            if path.stat().st_size == 0:
+                # empty files can't be mapped
+                return cls(b"", path)
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), path)
+
+    def __enter__(self) -> "MappedInput":
+        return self
+
+    def __exit__(self, *_: object):
+        self.close()
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            try:
+                self._data.close()
+            except BufferError:
+                # numpy views of the map are still alive; it's unmapped once they die
+                pass
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def data(self) -> bytes | mmap.mmap:
+        return self._data
+
+    def text(self) -> TextIO:
+        "Decode the whole input, for solutions which take text"
+        return io.StringIO(str(self._data, "utf-8"))
+
+    def lines(self) -> Iterator[bytes]:
+        "Yield each line, without its trailing newline"
+        data = self._data
+        find = data.find
+        pos = 0
+        while (end := find(b"\n", pos)) >= 0:
+            yield data[pos:end]
+            pos = end + 1
+
+        if pos < len(data):
+            yield data[pos:]
+
+    def fields(self, sep: Optional[bytes] = None) -> Iterator[list[bytes]]:
+        "Yield each line split into fields, by whitespace unless `sep` is given"
+        for line in self.lines():
+            yield line.split(sep)
+
+    def _chunks(self) -> Iterator[NDArray[np.uint8]]:
+        "Views of the input of around CHUNK_SIZE bytes, each ending on a line boundary"
+        import numpy as np
+
+        arr = np.frombuffer(self._data, dtype=np.uint8)
+        pos = 0
+        while pos < len(arr):
+            end = self._data.find(b"\n", min(pos + CHUNK_SIZE, len(arr)) - 1)
+            end = len(arr) if end < 0 else end + 1
+            yield arr[pos:end]
+            pos = end
+
+    def ints(self) -> tuple[NDArray[np.int64], NDArray[np.bool_]]:
+        """
+        Parse an input holding one (optionally negative) integer per line. Returns the
+        value of each line along with a mask of which lines were blank, whose values
+        are 0.
+        """
+        import numpy as np
+
+        values: list[NDArray[np.int64]] = []
+        blanks: list[NDArray[np.bool_]] = []
+        for chunk in self._chunks():
+            v, b = parse_int_lines(chunk)
+            values.append(v)
+            blanks.append(b)
+
+        if not values:
+            return (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.bool_))
+        return (np.concatenate(values), np.concatenate(blanks))
+
+
+def parse_int_lines(
+    arr: NDArray[np.uint8],
+) -> tuple[NDArray[np.int64], NDArray[np.bool_]]:
+    """
+    Vectorized parse of whole lines holding one integer each, like int(line.rstrip()),
+    except that leading whitespace isn't allowed and values must have at most
+    MAX_DIGITS digits. Raises ValueError on a line holding anything else. See
+    MappedInput.ints
+    """
+    import numpy as np
+
+    pow10 = 10 ** np.arange(MAX_DIGITS, dtype=np.int64)
+    positions = np.arange(len(arr))
+    is_newline = arr == NEWLINE
+    ends = np.flatnonzero(is_newline)
+    if len(ends) == 0 or ends[-1] != len(arr) - 1:
+        # final line has no trailing newline
+        ends = np.append(ends, len(arr))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+
+    # each line's text stops after its last byte that isn't trailing whitespace, e.g.
+    # the \r of a CRLF line ending
+    is_space = (arr == SPACE) | (arr == TAB) | (arr == CR) | is_newline
+    last_text = np.maximum.accumulate(np.where(is_space, -1, positions))
+    last_text = np.concatenate(([-1], last_text))[ends]
+    text_ends = np.maximum(last_text + 1, starts)
+
+    line_idx = np.cumsum(is_newline) - is_newline
+    in_text = positions < text_ends[line_idx]
+    is_digit = (arr >= ZERO) & (arr <= ZERO + 9)
+    blank = text_ends == starts
+    negative = np.zeros_like(blank)
+    negative[~blank] = arr[starts[~blank]] == MINUS
+    is_sign = np.zeros_like(is_digit)
+    is_sign[starts[negative]] = True
+    valid = ~in_text | is_digit | is_sign
+    valid[starts[negative & (text_ends - starts == 1)]] = False
+    if not valid.all():
+        bad = line_idx[np.argmin(valid)]
+        line = bytes(arr[starts[bad] : ends[bad]])
+        raise ValueError(f"invalid integer line {line!r}")
+    too_long = text_ends - starts - negative > MAX_DIGITS
+    if too_long.any():
+        bad = np.argmax(too_long)
+        line = bytes(arr[starts[bad] : ends[bad]])
+        raise ValueError(f"integer line {line!r} has more than {MAX_DIGITS} digits")
+
+    # each digit contributes digit * 10^(number of bytes between it and end of text)
+    place = np.clip(text_ends[line_idx] - positions - 1, 0, MAX_DIGITS - 1)
+    contrib = np.where(
+        in_text & is_digit, (arr - ZERO).astype(np.int64) * pow10[place], 0
+    )
+
+    # sum each line's contributions via differences of the running total
+    total = np.concatenate(([0], np.cumsum(contrib)))
+    values = total[ends] - total[starts]
+    values[negative] *= -1
+    return (values, blank)
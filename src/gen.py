@@ -0,0 +1,632 @@
+import random
+import string
+import sys
+from math import isqrt
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import click
+
+# Each generator takes a seeded Random and a scale factor, and returns a complete
+# input. Scale 1 is about the size of a real puzzle input, and the size of the input
+# grows roughly in proportion to the scale. Scales below 1 give small inputs, which
+# slow reference solutions can check answers on.
+Generator = Callable[[random.Random, float], str]
+
+GENERATORS: dict[int, Generator] = {}
+
+
+def generator(day: int) -> Callable[[Generator], Generator]:
+    def register(fn: Generator) -> Generator:
+        GENERATORS[day] = fn
+        return fn
+
+    return register
+
+
+def lines(it: Iterable[str]) -> str:
+    return "".join(f"{line}\n" for line in it)
+
+
+def count(base: int, scale: float) -> int:
+    "How many of something there are at this scale, given `base` of it at scale 1"
+    return max(1, round(base * scale))
+
+
+def side(base: int, scale: float) -> int:
+    "Side length of a 2D grid whose area grows in proportion to the scale"
+    return max(2, isqrt(round(base * base * scale)))
+
+
+@generator(1)
+def gen_day1(rng: random.Random, scale: float) -> str:
+    groups = (
+        "\n".join(str(rng.randint(1000, 70000)) for _ in range(rng.randint(1, 15)))
+        for _ in range(count(250, scale))
+    )
+    return "\n\n".join(groups) + "\n"
+
+
+@generator(2)
+def gen_day2(rng: random.Random, scale: float) -> str:
+    return lines(
+        f"{rng.choice('ABC')} {rng.choice('XYZ')}" for _ in range(count(2500, scale))
+    )
+
+
+def gen_rucksack(rng: random.Random, pool: list[str], badge: str) -> str:
+    "A rucksack holding `badge`, whose compartments share exactly one item"
+    items = pool + [badge]
+    shared = rng.choice(items)
+    rest = [c for c in items if c != shared]
+    rng.shuffle(rest)
+    split = rng.randint(1, len(rest) - 1)
+    left = [shared] + rest[:split]
+    right = [shared] + rest[split:]
+    size = rng.randint(max(len(left), len(right)), 24)
+    left += rng.choices(left, k=size - len(left))
+    right += rng.choices(right, k=size - len(right))
+    return "".join(rng.sample(left, size) + rng.sample(right, size))
+
+
+@generator(3)
+def gen_day3(rng: random.Random, scale: float) -> str:
+    rucksacks = []
+    for _ in range(count(100, scale)):
+        # each elf in a group draws from its own items, so only the badge is common
+        badge, *letters = rng.sample(string.ascii_letters, 1 + 3 * 16)
+        for i in range(3):
+            rucksacks.append(gen_rucksack(rng, letters[i::3], badge))
+    return lines(rucksacks)
+
+
+def gen_range(rng: random.Random) -> str:
+    lo = rng.randint(1, 99)
+    return f"{lo}-{rng.randint(lo, 99)}"
+
+
+@generator(4)
+def gen_day4(rng: random.Random, scale: float) -> str:
+    return lines(
+        f"{gen_range(rng)},{gen_range(rng)}" for _ in range(count(1000, scale))
+    )
+
+
+@generator(5)
+def gen_day5(rng: random.Random, scale: float) -> str:
+    # stack labels are a single digit, so there are always nine stacks
+    num_stacks = 9
+    stacks = [
+        rng.choices(string.ascii_uppercase, k=rng.randint(1, max(2, count(8, scale))))
+        for _ in range(num_stacks)
+    ]
+
+    drawing = []
+    for level in range(max(len(stack) for stack in stacks) - 1, -1, -1):
+        drawing.append(
+            " ".join(
+                f"[{stack[level]}]" if level < len(stack) else "   " for stack in stacks
+            ).rstrip()
+        )
+    drawing.append(" ".join(f" {i + 1} " for i in range(num_stacks)).rstrip())
+
+    # moves are checked against the stack heights, which are the same whether crates
+    # are moved one at a time or all at once
+    heights = [len(stack) for stack in stacks]
+    moves = []
+    for _ in range(count(500, scale)):
+        src = rng.choice([i for i, height in enumerate(heights) if height > 1])
+        dest = rng.choice([i for i in range(num_stacks) if i != src])
+        n = rng.randint(1, min(heights[src] - 1, 30))
+        heights[src] -= n
+        heights[dest] += n
+        moves.append(f"move {n} from {src + 1} to {dest + 1}")
+
+    return lines(drawing) + "\n" + lines(moves)
+
+
+@generator(6)
+def gen_day6(rng: random.Random, scale: float) -> str:
+    n = count(4096, scale)
+    # three letters can't hold a start-of-packet marker, and thirteen can't hold a
+    # start-of-message marker, so both markers fall late in the stream
+    stream = rng.choices("abc", k=n // 2) + rng.choices(
+        string.ascii_lowercase[:13], k=n // 2
+    )
+    stream += rng.sample(string.ascii_lowercase, 14)
+    return "".join(stream) + "\n"
+
+
+@generator(7)
+def gen_day7(rng: random.Random, scale: float) -> str:
+    num_dirs = count(200, scale)
+    # about 55MB in total, with 2.5 files a directory, so part 2 has to free some
+    file_size = 55_000_000 * 2 // (num_dirs * 5)
+    out = ["$ cd /"]
+    names = iter(range(sys.maxsize))
+
+    def explore(depth: int, budget: int):
+        "List a directory, then explore `budget` more directories below it"
+        children = []
+        while budget > 0 and len(children) < 4:
+            share = rng.randint(1, budget) if depth < 12 else 1
+            children.append(share)
+            budget -= share
+        children[-1:] = [children[-1] + budget] if children else []
+
+        out.append("$ ls")
+        child_names = [f"d{next(names)}" for _ in children]
+        entries = [f"dir {name}" for name in child_names]
+        for _ in range(rng.randint(0, 5)):
+            size = rng.randint(file_size // 2, file_size * 3 // 2)
+            entries.append(f"{size} f{next(names)}.{rng.choice(['txt', 'dat', 'log'])}")
+        rng.shuffle(entries)
+        out.extend(entries)
+
+        for name, share in zip(child_names, children):
+            out.append(f"$ cd {name}")
+            explore(depth + 1, share - 1)
+            out.append("$ cd ..")
+
+    explore(0, num_dirs)
+    return lines(out)
+
+
+@generator(8)
+def gen_day8(rng: random.Random, scale: float) -> str:
+    n = side(99, scale)
+    return lines("".join(rng.choices(string.digits, k=n)) for _ in range(n))
+
+
+@generator(9)
+def gen_day9(rng: random.Random, scale: float) -> str:
+    return lines(
+        f"{rng.choice('UDLR')} {rng.randint(1, 20)}" for _ in range(count(2000, scale))
+    )
+
+
+@generator(10)
+def gen_day10(rng: random.Random, scale: float) -> str:
+    program = []
+    x = 1
+    for _ in range(count(140, scale)):
+        if rng.random() < 0.3:
+            program.append("noop")
+        else:
+            # keep the sprite roughly on screen
+            v = rng.randint(-5, 5) + (1 if x < 10 else -1 if x > 30 else 0)
+            x += v
+            program.append(f"addx {v}")
+    return lines(program)
+
+
+def primes(n: int) -> list[int]:
+    found: list[int] = []
+    candidate = 2
+    while len(found) < n:
+        if all(candidate % p for p in found):
+            found.append(candidate)
+        candidate += 1
+    return found
+
+
+@generator(11)
+def gen_day11(rng: random.Random, scale: float) -> str:
+    n = max(3, count(8, scale))
+    divisors = primes(n)
+    rng.shuffle(divisors)
+    squarer = rng.randrange(n)
+
+    monkeys = []
+    for i in range(n):
+        items = ", ".join(str(rng.randint(50, 99)) for _ in range(rng.randint(1, 8)))
+        if i == squarer:
+            operation = "old * old"
+        else:
+            operation = f"old {rng.choice('+*')} {rng.randint(1, 8)}"
+        true_target, false_target = rng.sample([j for j in range(n) if j != i], 2)
+        monkeys.append(
+            f"Monkey {i}:\n"
+            f"  Starting items: {items}\n"
+            f"  Operation: new = {operation}\n"
+            f"  Test: divisible by {divisors[i]}\n"
+            f"    If true: throw to monkey {true_target}\n"
+            f"    If false: throw to monkey {false_target}\n"
+        )
+    return "\n".join(monkeys)
+
+
+@generator(12)
+def gen_day12(rng: random.Random, scale: float) -> str:
+    width = side(160, scale)
+    height = max(3, width // 4)
+    # elevation rises by at most one a column, and only ever drops off that ramp, so
+    # the middle row is always a valid path from S to E
+    ramp = [min(25, x * 26 // width) for x in range(width)]
+    rows = []
+    for y in range(height):
+        row = [
+            ramp[x] if y == height // 2 else max(0, ramp[x] - rng.randint(0, 3))
+            for x in range(width)
+        ]
+        rows.append([chr(ord("a") + e) for e in row])
+    rows[height // 2][0] = "S"
+    rows[height // 2][width - 1] = "E"
+    return lines("".join(row) for row in rows)
+
+
+def gen_packet(rng: random.Random, depth: int = 0) -> list | int:
+    if depth > 0 and (depth > 4 or rng.random() < 0.4):
+        return rng.randint(0, 10)
+    return [gen_packet(rng, depth + 1) for _ in range(rng.randint(0, 5))]
+
+
+def compare(lhs: list | int, rhs: list | int) -> int:
+    if isinstance(lhs, int) and isinstance(rhs, int):
+        return (lhs > rhs) - (lhs < rhs)
+    lhs = [lhs] if isinstance(lhs, int) else lhs
+    rhs = [rhs] if isinstance(rhs, int) else rhs
+    for l_item, r_item in zip(lhs, rhs):
+        if order := compare(l_item, r_item):
+            return order
+    return (len(lhs) > len(rhs)) - (len(lhs) < len(rhs))
+
+
+@generator(13)
+def gen_day13(rng: random.Random, scale: float) -> str:
+    dividers: list[list | int] = [[[2]], [[6]]]
+    pairs = []
+    while len(pairs) < count(150, scale):
+        lhs, rhs = gen_packet(rng), gen_packet(rng)
+        # packets which compare equal have no defined order
+        if compare(lhs, rhs) and all(
+            compare(p, d) for p in (lhs, rhs) for d in dividers
+        ):
+            pairs.append(f"{lhs}\n{rhs}\n".replace(" ", ""))
+    return "\n".join(pairs)
+
+
+@generator(14)
+def gen_day14(rng: random.Random, scale: float) -> str:
+    depth = max(20, side(170, scale))
+    paths = []
+    for _ in range(count(150, scale)):
+        x, y = rng.randint(500 - depth // 3, 500 + depth // 3), rng.randint(13, depth)
+        points = [(x, y)]
+        for _ in range(rng.randint(1, 6)):
+            if rng.random() < 0.5:
+                x = max(1, x + rng.randint(-8, 8))
+            else:
+                y = max(1, y + rng.randint(-8, 8))
+            points.append((x, y))
+        paths.append(" -> ".join(f"{x},{y}" for x, y in points))
+    return lines(paths)
+
+
+@generator(15)
+def gen_day15(rng: random.Random, scale: float) -> str:
+    """
+    Sensors sit on a lattice whose diamonds tile the plane exactly, except for the
+    one around the distress beacon, which is replaced by four larger diamonds covering
+    all of it but the beacon. Part 1's row and part 2's search area are the real
+    input's, which the solutions hardcode.
+    """
+    area = 4_000_000
+    # about as many sensors as the real input, per unit of scale
+    r = max(2, isqrt(round(area * area / (36 * scale))))
+    gx, gy = rng.randint(0, area), rng.randint(0, area)
+
+    sensors: list[tuple[int, int, int, int, int]] = []
+    # diamonds of radius r centred on the lattice spanned by (r + 1, r) and
+    # (-r, r + 1) tile the plane
+    n = area // r + 2
+    for a in range(-n, n + 1):
+        for b in range(-n, n + 1):
+            x = gx + a * (r + 1) - b * r
+            y = gy + a * r + b * (r + 1)
+            if (a, b) == (0, 0) or not (-r <= x <= area + r and -r <= y <= area + r):
+                continue
+            # each beacon is on the far side of its diamond from the gap, so none is
+            # inside the larger diamonds around it
+            if abs(x - gx) > abs(y - gy):
+                beacon = (x + r if x > gx else x - r, y)
+            else:
+                beacon = (x, y + r if y > gy else y - r)
+            sensors.append((x, y, *beacon))
+
+    m = (r + 2) // 2
+    for dx, dy in ((m, m), (m, -m), (-m, m), (-m, -m)):
+        sensors.append((gx + dx, gy + dy, gx, gy + (1 if dy > 0 else -1)))
+
+    rng.shuffle(sensors)
+    return lines(
+        f"Sensor at x={x}, y={y}: closest beacon is at x={bx}, y={by}"
+        for x, y, bx, by in sensors
+    )
+
+
+def valve_names(rng: random.Random, n: int) -> list[str]:
+    length = 2
+    while 26**length < n * 2:
+        length += 1
+    names = {"AA"}
+    while len(names) < n:
+        names.add("".join(rng.choices(string.ascii_uppercase, k=length)))
+    # sorted, as a set's order changes from run to run with string hashing
+    return sorted(names)
+
+
+@generator(16)
+def gen_day16(rng: random.Random, scale: float) -> str:
+    """
+    Scales up the number of valves, but keeps the real input's 15 with nonzero flow
+    at larger scales, since the solutions are exponential in those
+    """
+    names = valve_names(rng, max(2, count(58, scale)))
+    rng.shuffle(names)
+    nonzero = set(
+        rng.sample([name for name in names if name != "AA"], min(15, len(names) - 1))
+    )
+
+    # a random spanning tree, plus some extra tunnels
+    edges = {name: set[str]() for name in names}
+    for i in range(1, len(names)):
+        parent = names[rng.randrange(i)]
+        edges[names[i]].add(parent)
+        edges[parent].add(names[i])
+    for _ in range(len(names) // 4):
+        a, b = rng.sample(names, 2)
+        edges[a].add(b)
+        edges[b].add(a)
+
+    out = []
+    for name in names:
+        rate = rng.randint(3, 25) if name in nonzero else 0
+        tunnels = sorted(edges[name])
+        if len(tunnels) == 1:
+            lead = f"tunnel leads to valve {tunnels[0]}"
+        else:
+            lead = f"tunnels lead to valves {', '.join(tunnels)}"
+        out.append(f"Valve {name} has flow rate={rate}; {lead}")
+    return lines(out)
+
+
+@generator(17)
+def gen_day17(rng: random.Random, scale: float) -> str:
+    return "".join(rng.choices("<>", k=count(10091, scale))) + "\n"
+
+
+@generator(18)
+def gen_day18(rng: random.Random, scale: float) -> str:
+    n = max(3, round(20 * scale ** (1 / 3)))
+    # a lumpy ball, dense enough to enclose some air pockets
+    center = n / 2
+    cubes = [
+        f"{x},{y},{z}"
+        for x in range(n)
+        for y in range(n)
+        for z in range(n)
+        if ((x - center) ** 2 + (y - center) ** 2 + (z - center) ** 2) ** 0.5
+        < center * rng.uniform(0.7, 1.1)
+        and rng.random() < 0.65
+    ]
+    rng.shuffle(cubes)
+    return lines(cubes)
+
+
+@generator(19)
+def gen_day19(rng: random.Random, scale: float) -> str:
+    return lines(
+        f"Blueprint {i}: Each ore robot costs {rng.randint(2, 4)} ore. "
+        f"Each clay robot costs {rng.randint(2, 4)} ore. "
+        f"Each obsidian robot costs {rng.randint(2, 4)} ore and "
+        f"{rng.randint(5, 20)} clay. "
+        f"Each geode robot costs {rng.randint(2, 4)} ore and "
+        f"{rng.randint(7, 20)} obsidian."
+        for i in range(1, count(30, scale) + 1)
+    )
+
+
+@generator(20)
+def gen_day20(rng: random.Random, scale: float) -> str:
+    numbers = [
+        rng.randint(-10000, 10000) or 1 for _ in range(max(3, count(5000, scale)) - 1)
+    ]
+    numbers.insert(rng.randrange(len(numbers) + 1), 0)
+    return lines(str(n) for n in numbers)
+
+
+class MonkeyTree:
+    "Builds day 21's monkeys top down, each subtree yielding a chosen value"
+
+    def __init__(self, rng: random.Random, size: int):
+        self.rng = rng
+        self.jobs: dict[str, str] = {}
+        # names are four letters, as in the real input, until there are too many
+        self.name_length = 4
+        while 26**self.name_length < size * 4:
+            self.name_length += 1
+
+    def name(self) -> str:
+        while True:
+            name = "".join(self.rng.choices(string.ascii_lowercase, k=self.name_length))
+            if name not in self.jobs and name not in ("root", "humn"):
+                self.jobs[name] = ""
+                return name
+
+    def build(self, value: int, size: int) -> str:
+        "A monkey yelling `value`, with about `size` monkeys below it"
+        name = self.name()
+        rng = self.rng
+        if size <= 1 or value < 2:
+            self.jobs[name] = str(value)
+            return name
+
+        # only let values grow while they're well within a float's precision
+        ops = "+" if value > 10**9 else "+-/"
+        if divisors := [f for f in range(2, 10) if value % f == 0]:
+            ops += "*"
+        match rng.choice(ops):
+            case "+":
+                a = rng.randint(1, value - 1)
+                lhs, op, rhs = a, "+", value - a
+            case "-":
+                b = rng.randint(1, 20)
+                lhs, op, rhs = value + b, "-", b
+            case "*":
+                f = rng.choice(divisors)
+                lhs, op, rhs = value // f, "*", f
+            case _:
+                f = rng.randint(2, 5)
+                lhs, op, rhs = value * f, "/", f
+
+        left = rng.randint(0, size - 2)
+        self.jobs[
+            name
+        ] = f"{self.build(lhs, left)} {op} {self.build(rhs, size - 2 - left)}"
+        return name
+
+
+@generator(21)
+def gen_day21(rng: random.Random, scale: float) -> str:
+    """
+    Every monkey on the path from root down to humn combines the one below it with an
+    independent subtree, by +, - or *, so root's equality is linear in humn and part
+    2's answer is exact. The path deepens with scale up to a point, after which the
+    subtrees grow instead, as the solutions recurse along it.
+    """
+    size = count(2000, scale)
+    tree = MonkeyTree(rng, size)
+    depth = min(count(70, scale), 600)
+    subtree_size = size // depth
+
+    # build from humn upwards, tracking what each monkey yells for part 1's value of
+    # humn, and for the value part 2 should find. Solutions work in floats, so the
+    # values are kept positive and well within a float's precision.
+    values = [rng.randint(1, 5000), rng.randint(1, 5000)]
+    tree.jobs["humn"] = str(values[0])
+    below = "humn"
+    for _ in range(depth):
+        name = tree.name()
+        if max(values) < 10**9:
+            op = rng.choice("+-*")
+        else:
+            op = "-"
+        const = rng.randint(2, 5) if op == "*" else rng.randint(1, 1000)
+        if op == "-" and min(values) <= const:
+            op = "+"
+        other = tree.build(const, subtree_size)
+
+        if op == "*":
+            values = [v * const for v in values]
+        elif op == "+":
+            values = [v + const for v in values]
+        else:
+            values = [v - const for v in values]
+
+        if op == "-" or rng.random() < 0.5:
+            tree.jobs[name] = f"{below} {op} {other}"
+        else:
+            tree.jobs[name] = f"{other} {op} {below}"
+        below = name
+
+    # root's other side has to equal the humn side given part 2's value of humn
+    other = tree.build(values[1], subtree_size)
+    if rng.random() < 0.5:
+        tree.jobs["root"] = f"{below} + {other}"
+    else:
+        tree.jobs["root"] = f"{other} + {below}"
+
+    jobs = [f"{name}: {job}" for name, job in tree.jobs.items()]
+    rng.shuffle(jobs)
+    return lines(jobs)
+
+
+@generator(22)
+def gen_day22(rng: random.Random, scale: float) -> str:
+    "Part 2 hardcodes the real input's cube net, so only the path scales"
+    size = 50
+    faces = {(1, 0), (2, 0), (1, 1), (0, 2), (1, 2), (0, 3)}
+    board = []
+    for y in range(4 * size):
+        row = ""
+        for fx in range(3):
+            if (fx, y // size) in faces:
+                row += "".join(rng.choices(".#", weights=(10, 1), k=size))
+            else:
+                row += " " * size
+        board.append(row.rstrip())
+
+    path = str(rng.randint(1, 50))
+    for _ in range(count(2000, scale)):
+        path += rng.choice("LR") + str(rng.randint(1, 50))
+    return lines(board) + "\n" + path + "\n"
+
+
+@generator(23)
+def gen_day23(rng: random.Random, scale: float) -> str:
+    n = side(72, scale)
+    return lines("".join(rng.choices(".#", k=n)) for _ in range(n))
+
+
+@generator(24)
+def gen_day24(rng: random.Random, scale: float) -> str:
+    "Wider valleys as scale increases, keeping the real input's height"
+    width = max(3, count(120, scale))
+    height = 25
+    rows = ["#." + "#" * width]
+    for _ in range(height):
+        row = rng.choices(".<>^v", weights=(3, 1, 1, 1, 1), k=width)
+        # nothing blows vertically through the entrance or exit
+        for x in (0, width - 1):
+            if row[x] in "^v":
+                row[x] = rng.choice("<>")
+        rows.append("#" + "".join(row) + "#")
+    rows.append("#" * width + ".#")
+    return lines(rows)
+
+
+SNAFU_DIGITS = "=-012"
+
+
+def to_snafu(n: int) -> str:
+    digits = ""
+    while n:
+        n, rem = divmod(n + 2, 5)
+        digits = SNAFU_DIGITS[rem] + digits
+    return digits or "0"
+
+
+@generator(25)
+def gen_day25(rng: random.Random, scale: float) -> str:
+    return lines(to_snafu(rng.randint(1, 5**19)) for _ in range(count(120, scale)))
+
+
+@click.command()
+@click.option("-d", "--day", required=True, type=click.IntRange(1, 25))
+@click.option(
+    "-s",
+    "--scale",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1,
+    show_default=True,
+    help="Roughly how many times larger than a real input to make it.",
+)
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, writable=True, path_type=Path),
+    help="Where to write the input, rather than stdout.",
+)
+def cli(day: int, scale: float, seed: int, output: Optional[Path]):
+    "Generate a random input for a day, in the same format as the real ones"
+    text = GENERATORS[day](random.Random(seed), scale)
+    if output is None:
+        sys.stdout.write(text)
+    else:
+        output.write_text(text)
+
+
+if __name__ == "__main__":
+    cli()
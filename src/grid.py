@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+
+SPACE = ord(" ")
+
+
+class Grid:
+    """
+    A rectangular grid of bytes, stored row-major in one contiguous bytearray and
+    addressed by flat index. The data is surrounded by `pad` cells of `fill` on each
+    side, so that stepping off the edge of the data lands on a fill cell rather than
+    needing a bounds check (or wrapping around to another row).
+
+    Coordinates (x, y) are relative to the data, so padding cells have x or y out of
+    [0, width) and [0, height).
+    """
+
+    def __init__(self, width: int, height: int, pad: int = 0, fill: int = 0):
+        self.width = width
+        self.height = height
+        self.pad = pad
+        self.fill = fill
+        self.stride = width + 2 * pad
+        self.rows = height + 2 * pad
+        self.cells = bytearray([fill]) * (self.stride * self.rows)
+
+    @classmethod
+    def parse(cls, text: str | bytes, pad: int = 0, fill: int = SPACE) -> Grid:
+        "Parse a grid with a row per line. Short lines are extended with `fill`"
+        if isinstance(text, str):
+            text = text.encode()
+        lines = text.splitlines()
+        width = max((len(line) for line in lines), default=0)
+
+        grid = cls(width, len(lines), pad, fill)
+        fill_byte = bytes([fill])
+        padding = fill_byte * pad
+        start = grid.index(0, 0) - pad
+        grid.cells[start : start + len(lines) * grid.stride] = b"".join(
+            padding + line.ljust(width, fill_byte) + padding for line in lines
+        )
+        return grid
+
+    def index(self, x: int, y: int) -> int:
+        return (y + self.pad) * self.stride + x + self.pad
+
+    def coords(self, i: int) -> tuple[int, int]:
+        y, x = divmod(i, self.stride)
+        return (x - self.pad, y - self.pad)
+
+    def offset(self, dx: int, dy: int) -> int:
+        "The change in flat index from moving by (dx, dy)"
+        return dy * self.stride + dx
+
+    @property
+    def offsets4(self) -> tuple[int, int, int, int]:
+        "Offsets to the orthogonal neighbours, clockwise from up"
+        s = self.stride
+        return (-s, 1, s, -1)
+
+    @property
+    def offsets8(self) -> tuple[int, ...]:
+        "Offsets to all eight neighbours, row by row from the top left"
+        s = self.stride
+        return (-s - 1, -s, -s + 1, -1, 1, s - 1, s, s + 1)
+
+    def __contains__(self, coords: tuple[int, int]) -> bool:
+        x, y = coords
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def on_edge(self, i: int) -> bool:
+        "Whether the cell is on the outermost ring, padding included"
+        y, x = divmod(i, self.stride)
+        return y == 0 or x == 0 or y == self.rows - 1 or x == self.stride - 1
+
+    def __getitem__(self, coords: tuple[int, int]) -> int:
+        return self.cells[self.index(*coords)]
+
+    def __setitem__(self, coords: tuple[int, int], value: int):
+        self.cells[self.index(*coords)] = value
+
+    def find(self, value: int) -> int:
+        "Flat index of the first cell holding `value`, or -1"
+        return self.cells.find(value)
+
+    def indices(self) -> Iterator[int]:
+        "Flat indices of every cell within the data, row by row"
+        for y in range(self.height):
+            start = self.index(0, y)
+            yield from range(start, start + self.width)
+
+    def array(self) -> NDArray[np.uint8]:
+        "A writable 2D numpy view of the data, excluding padding"
+        import numpy as np
+
+        arr = np.frombuffer(self.cells, dtype=np.uint8).reshape(self.rows, self.stride)
+        p = self.pad
+        return arr[p : p + self.height, p : p + self.width]
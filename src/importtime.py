@@ -0,0 +1,88 @@
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence
+
+LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+DAY_RE = re.compile(r"day\d+")
+
+# Imports made before any day module is imported are charged to the CLI itself
+CLI_GROUP = "cli"
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_line(line: str) -> Optional[ImportRecord]:
+    "Parse a line of `python -X importtime` output, if it is one"
+    if (m := LINE_RE.match(line)) is None:
+        return None
+    self_us, cumulative_us, indent, name = m.groups()
+    return ImportRecord(name, int(self_us), int(cumulative_us), len(indent) // 2)
+
+
+def group_by_day(records: Iterable[ImportRecord]) -> dict[str, list[ImportRecord]]:
+    """
+    Assign each import to the day that caused it. -X importtime lists an import's
+    dependencies before the import itself, and anything a day imports lazily, after
+    the day module itself has loaded, is charged to the most recently loaded day.
+    """
+    groups = defaultdict[str, list[ImportRecord]](list)
+    group = CLI_GROUP
+    pending: list[ImportRecord] = []
+    for rec in records:
+        pending.append(rec)
+        if rec.depth > 0:
+            continue
+
+        if DAY_RE.fullmatch(rec.name):
+            group = rec.name
+        groups[group].extend(pending)
+        pending.clear()
+
+    return groups
+
+
+def format_report(groups: dict[str, list[ImportRecord]], top: int = 10) -> str:
+    lines = [f"{'module':<40} {'self':>10} {'cumulative':>12}"]
+    total = 0
+    for group, records in groups.items():
+        group_us = sum(rec.self_us for rec in records)
+        total += group_us
+        lines.append(f"{group + ':':<40} {group_us / 1000:>8.1f}ms")
+        for rec in sorted(records, key=lambda r: r.self_us, reverse=True)[:top]:
+            lines.append(
+                f"  {rec.name:<38} {rec.self_us / 1000:>8.1f}ms "
+                f"{rec.cumulative_us / 1000:>10.1f}ms"
+            )
+    lines.append(f"{'total:':<40} {total / 1000:>8.1f}ms")
+    return "\n".join(lines)
+
+
+def run_with_report(script: str, args: Sequence[str]) -> int:
+    """
+    Re-run `script` under `python -X importtime`, passing its output through, then
+    print a per-day breakdown of its import times. Returns its exit code.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", script, *args],
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+    records: list[ImportRecord] = []
+    for line in proc.stderr.splitlines():
+        if (rec := parse_line(line)) is not None:
+            records.append(rec)
+        elif not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+
+    print(format_report(group_by_day(records)), file=sys.stderr)
+    return proc.returncode
@@ -0,0 +1,136 @@
+import os
+import resource
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+
+@dataclass
+class Site:
+    "Memory held by allocations made from one line of source"
+    location: str
+    size: int
+    count: int
+
+
+@dataclass
+class MemoryReport:
+    peak_rss: int = 0
+    peak_child_rss: int = 0
+    peak_traced: int = 0
+    top: list[Site] = field(default_factory=list)
+
+    def format(self) -> str:
+        lines = [
+            f"peak RSS: {self.peak_rss / 2**20:.1f} MiB",
+            f"peak RSS of any worker process: {self.peak_child_rss / 2**20:.1f} MiB",
+            f"peak traced: {self.peak_traced / 2**20:.1f} MiB",
+            f"{'allocation site':<48} {'size':>12} {'blocks':>10}",
+        ]
+        for site in self.top:
+            lines.append(
+                f"{site.location:<48} {site.size / 1024:>8.0f} KiB {site.count:>10}"
+            )
+        return "\n".join(lines)
+
+
+def maxrss_bytes(who: int) -> int:
+    # ru_maxrss is in bytes on macOS, but KiB everywhere else
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(who).ru_maxrss * scale
+
+
+def reset_peak_rss() -> bool:
+    "Reset this process's peak RSS, where the OS allows it (Linux only)"
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def peak_rss() -> int:
+    "Peak RSS of this process, since the last successful reset_peak_rss()"
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return maxrss_bytes(resource.RUSAGE_SELF)
+
+
+class PeakSnapshotter:
+    """
+    tracemalloc can only say which sites hold memory *now*, and most of what a
+    solution allocates is freed by the time it returns. This polls in the background
+    and keeps the snapshot from closest to the peak.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.snapshot_size = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def check(self):
+        current, _ = tracemalloc.get_traced_memory()
+        # snapshots are expensive, so only retake one on significant growth
+        if current > self.snapshot_size * 1.1:
+            self.snapshot = tracemalloc.take_snapshot()
+            self.snapshot_size = current
+
+    def __enter__(self) -> "PeakSnapshotter":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_: object):
+        self._stop.set()
+        self._thread.join()
+        self.check()
+
+
+@contextmanager
+def tracking(top: int = 10, interval: float = 0.01) -> Iterator[MemoryReport]:
+    """
+    Measure the memory used by the enclosed block. The report is filled in when the
+    block exits. Only this process is traced, so the top sites and traced peak
+    don't include worker processes. Tracing slows allocation down considerably and
+    its bookkeeping counts towards RSS.
+    """
+    report = MemoryReport()
+    reset_peak_rss()
+    tracemalloc.start()
+    try:
+        with PeakSnapshotter(interval) as snapshotter:
+            yield report
+        _, report.peak_traced = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    report.peak_rss = peak_rss()
+    report.peak_child_rss = maxrss_bytes(resource.RUSAGE_CHILDREN)
+    if snapshotter.snapshot is not None:
+        # ignore the snapshotter's own allocations, and the code objects of modules
+        # imported along the way
+        snapshot = snapshotter.snapshot.filter_traces(
+            [
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+            ]
+        )
+        for stat in snapshot.statistics("lineno")[:top]:
+            frame = stat.traceback[0]
+            location = f"{os.path.basename(frame.filename)}:{frame.lineno}"
+            report.top.append(Site(location, stat.size, stat.count))
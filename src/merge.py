@@ -0,0 +1,33 @@
+import json
+from typing import TextIO
+
+import click
+
+import shard
+
+
+@click.command()
+@click.argument("files", nargs=-1, required=True, type=click.File("r"))
+def cli(files: tuple[TextIO, ...]):
+    """
+    Combine the partial answers written by `run --shard i/n` for every i into the
+    whole answer. Each file (or - for stdin) holds one or more shards' JSON lines.
+    """
+    records = [json.loads(line) for f in files for line in f if line.strip()]
+    try:
+        answer, bound = shard.merge(records)
+    except KeyError as e:
+        raise click.ClickException(f"can't merge: a shard has no {e}")
+    except ValueError as e:
+        raise click.ClickException(f"can't merge: {e}")
+
+    # shards run with a time budget might not all have found the best answer
+    if bound != answer:
+        report = {"day": records[0]["day"], "part": records[0]["part"]}
+        report |= {"answer": answer, "bound": bound, "optimal": False}
+        click.echo(json.dumps(report), err=True)
+    print(answer)
+
+
+if __name__ == "__main__":
+    cli()
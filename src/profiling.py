@@ -0,0 +1,133 @@
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from importlib import import_module
+from types import FrameType
+from typing import Any, Iterator, Optional
+
+PROFILERS = ("cprofile", "line", "sample")
+
+# File extensions for each profiler's output. `.prof` files open in snakeviz, `.lprof`
+# files in `python -m line_profiler`, and `.folded` files in flamegraph.pl/speedscope.
+EXTENSIONS = {"cprofile": "prof", "line": "lprof", "sample": "folded"}
+
+
+def default_out(profiler: str, day: int, part: int) -> str:
+    return f"day{day}.part{part}.{EXTENSIONS[profiler]}"
+
+
+def resolve(name: str) -> Any:
+    "Resolve a dotted name such as 'day20.Node.swap' to the object it refers to"
+    mod_name, *attrs = name.split(".")
+    obj: Any = import_module(mod_name)
+    for attr in attrs:
+        obj = getattr(obj, attr)
+    return obj
+
+
+@contextmanager
+def cprofile(out: str) -> Iterator[None]:
+    import cProfile
+
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(out)
+
+
+@contextmanager
+def line_profile(out: str, funcs: tuple[str, ...]) -> Iterator[None]:
+    try:
+        from line_profiler import LineProfiler
+    except ImportError as e:
+        raise ImportError("line profiling requires the line-profiler package") from e
+
+    prof = LineProfiler(*(resolve(func) for func in funcs))
+    prof.enable_by_count()
+    try:
+        yield
+    finally:
+        prof.disable_by_count()
+        prof.dump_stats(out)
+        prof.print_stats(stream=sys.stderr)
+
+
+def frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    qualname = getattr(code, "co_qualname", code.co_name)
+    return f"{frame.f_globals.get('__name__')}.{qualname}"
+
+
+def collapse(frame: Optional[FrameType]) -> str:
+    "Render a stack in the collapsed format used by flamegraph.pl, outermost first"
+    names: list[str] = []
+    while frame is not None:
+        names.append(frame_name(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """
+    Periodically samples the stack of the thread which created it from a background
+    thread. Sampling only happens when that thread yields the GIL, which it does at
+    least every `sys.getswitchinterval()` seconds.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.stacks = Counter[str]()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if (frame := sys._current_frames().get(self._target)) is not None:
+                self.stacks[collapse(frame)] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def dump(self, out: str):
+        with open(out, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+@contextmanager
+def sample(out: str, interval: float) -> Iterator[None]:
+    prof = SamplingProfiler(interval)
+    prof.start()
+    try:
+        yield
+    finally:
+        prof.stop()
+        prof.dump(out)
+
+
+@contextmanager
+def profiled(
+    profiler: str, out: str, funcs: tuple[str, ...] = (), interval: float = 0.005
+) -> Iterator[None]:
+    "Run the enclosed block under the named profiler, writing its results to `out`"
+    match profiler:
+        case "cprofile":
+            cm = cprofile(out)
+        case "line":
+            cm = line_profile(out, funcs)
+        case "sample":
+            cm = sample(out, interval)
+        case _:
+            raise ValueError(profiler)
+
+    with cm:
+        yield
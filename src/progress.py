@@ -0,0 +1,124 @@
+import json
+import sys
+import time
+from typing import IO, Iterable, Iterator, Optional, Protocol, TypeVar
+
+T = TypeVar("T")
+
+MODES = ("auto", "bar", "json", "off")
+
+# Seconds between reports. The clock is only read every so many items, with the
+# stride growing until reads are about this far apart divided by CHECKS_PER_REPORT.
+INTERVAL = 0.5
+CHECKS_PER_REPORT = 8
+
+
+class Sink(Protocol):
+    "Somewhere to report how far through a long-running loop a solution is"
+
+    def update(self, label: str, done: int, total: Optional[int], elapsed: float):
+        ...
+
+    def close(self, label: str, done: int, total: Optional[int], elapsed: float):
+        ...
+
+
+class BarSink:
+    "A single status line, redrawn in place, for a human watching a terminal"
+
+    def __init__(self, out: IO[str]):
+        self.out = out
+
+    def _draw(self, label: str, done: int, total: Optional[int], elapsed: float):
+        rate = done / elapsed if elapsed else 0.0
+        if total:
+            status = f"{label}: {done}/{total} ({100 * done / total:.0f}%)"
+        else:
+            status = f"{label}: {done}"
+        self.out.write(f"\r{status} {elapsed:.1f}s {rate:,.0f}/s\x1b[K")
+        self.out.flush()
+
+    def update(self, label: str, done: int, total: Optional[int], elapsed: float):
+        self._draw(label, done, total, elapsed)
+
+    def close(self, label: str, done: int, total: Optional[int], elapsed: float):
+        self._draw(label, done, total, elapsed)
+        self.out.write("\n")
+        self.out.flush()
+
+
+class JsonSink:
+    "A JSON line per report, for collecting as metrics"
+
+    def __init__(self, out: IO[str]):
+        self.out = out
+
+    def _write(self, label: str, done: int, total: Optional[int], elapsed: float):
+        res = {"label": label, "done": done, "total": total, "elapsed": elapsed}
+        self.out.write(json.dumps(res) + "\n")
+        self.out.flush()
+
+    update = _write
+    close = _write
+
+
+# Off unless configured, so worker processes and library callers stay quiet
+_sink: Optional[Sink] = None
+
+
+def configure(sink: Optional[Sink]):
+    "Send progress to `sink` from now on in this process, or nowhere if None"
+    global _sink
+    _sink = sink
+
+
+def sink_for(mode: str, out: IO[str] = sys.stderr) -> Optional[Sink]:
+    "The sink for one of MODES. auto draws a bar only if `out` is a terminal."
+    if mode == "auto":
+        mode = "bar" if out.isatty() else "off"
+    if mode == "bar":
+        return BarSink(out)
+    if mode == "json":
+        return JsonSink(out)
+    return None
+
+
+def _tracked(
+    sink: Sink, items: Iterable[T], total: Optional[int], label: str
+) -> Iterator[T]:
+    start = last_report = last_check = time.monotonic()
+    done = 0
+    stride = 1
+    next_check = stride
+    try:
+        for item in items:
+            yield item
+            done += 1
+            if done < next_check:
+                continue
+
+            now = time.monotonic()
+            if now - last_check < INTERVAL / CHECKS_PER_REPORT:
+                stride *= 2
+            elif now - last_check > INTERVAL and stride > 1:
+                stride //= 2
+            last_check = now
+            next_check = done + stride
+            if now - last_report >= INTERVAL:
+                sink.update(label, done, total, now - start)
+                last_report = now
+    finally:
+        sink.close(label, done, total, time.monotonic() - start)
+
+
+def track(
+    items: Iterable[T], total: Optional[int] = None, label: str = "progress"
+) -> Iterable[T]:
+    """
+    Iterate over `items`, reporting progress to the configured sink every INTERVAL
+    seconds or so. The clock is sampled rather than read per item, so tight loops
+    pay little, and with no sink configured `items` is returned untouched.
+    """
+    if _sink is None:
+        return items
+    return _tracked(_sink, items, total, label)
@@ -0,0 +1,105 @@
+from heapq import heapify, heappop, heappush
+from typing import AbstractSet, Callable, Iterable, Iterator, Optional
+
+# States are ints in [0, size), so that whether one has been visited is a byte in a
+# bytearray rather than an entry in a set, and nothing is allocated per state beyond
+# the int itself. Searches take a function giving the states reachable from each.
+Expand = Callable[[int], Iterable[int]]
+Edges = Callable[[int], Iterable[tuple[int, int]]]  # (state, cost) pairs
+Heuristic = Callable[[int], int]
+
+
+def levels(
+    size: int,
+    sources: Iterable[int],
+    expand: Expand,
+    visited: Optional[bytearray] = None,
+) -> Iterator[list[int]]:
+    """
+    Breadth-first search from every source at once, yielding the states first reached
+    at each distance in turn, starting with the sources. States already marked in
+    `visited`, if given, are never entered; it's updated as the search goes, so
+    callers can use it to see everything reached.
+    """
+    if visited is None:
+        visited = bytearray(size)
+
+    frontier = []
+    for state in sources:
+        if not visited[state]:
+            visited[state] = 1
+            frontier.append(state)
+
+    while frontier:
+        yield frontier
+        reached = []
+        for state in frontier:
+            for next_state in expand(state):
+                if not visited[next_state]:
+                    visited[next_state] = 1
+                    reached.append(next_state)
+        frontier = reached
+
+
+def bfs(
+    size: int, sources: Iterable[int], expand: Expand, targets: AbstractSet[int]
+) -> Optional[int]:
+    "The fewest steps from any source to any target, or None if none can be reached"
+    for dist, frontier in enumerate(levels(size, sources, expand)):
+        if not targets.isdisjoint(frontier):
+            return dist
+    return None
+
+
+def flood(
+    size: int, sources: Iterable[int], expand: Expand, blocked: Iterable[int] = ()
+) -> bytearray:
+    """
+    Every state reachable from the sources, as a bytearray holding 1 for each, 2 for
+    each of the `blocked` states, which are never entered, and 0 for the rest
+    """
+    visited = bytearray(size)
+    for state in blocked:
+        visited[state] = 2
+    for _ in levels(size, sources, expand, visited):
+        pass
+    return visited
+
+
+def dijkstra(
+    size: int,
+    sources: Iterable[int],
+    edges: Edges,
+    targets: AbstractSet[int],
+    heuristic: Optional[Heuristic] = None,
+) -> Optional[int]:
+    """
+    The least total cost of a path from any source to any target, or None if none can
+    be reached. Given a heuristic which never overestimates the cost left to reach a
+    target, and never drops by more than the cost of an edge, this is A*.
+    """
+    closed = bytearray(size)
+    best: dict[int, int] = {}
+    queue = []
+    for state in sources:
+        best[state] = 0
+        queue.append((heuristic(state) if heuristic else 0, 0, state))
+    heapify(queue)
+
+    while queue:
+        _, cost, state = heappop(queue)
+        if closed[state]:
+            continue
+        elif state in targets:
+            return cost
+        closed[state] = 1
+
+        for next_state, step in edges(state):
+            next_cost = cost + step
+            if closed[next_state] or best.get(next_state, next_cost + 1) <= next_cost:
+                continue
+            best[next_state] = next_cost
+            estimate = next_cost + (heuristic(next_state) if heuristic else 0)
+            heappush(queue, (estimate, next_cost, next_state))
+
+    return None
@@ -0,0 +1,217 @@
+import base64
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Optional
+
+import click
+
+from cache import DEFAULT_DIR, DEFAULT_MAX_BYTES, ResultCache, is_stale
+from cli import ALL_PARTS, Part, parse_part
+
+DEFAULT_SOCKET = (
+    Path(os.environ.get("XDG_RUNTIME_DIR", "/tmp"))
+    / f"adventofcode2022-{os.getuid()}.sock"
+)
+
+Request = dict[str, Any]
+Response = dict[str, Any]
+
+
+class SolverServer(socketserver.UnixStreamServer):
+    """
+    Serves solutions over a Unix socket, one request at a time. Each request and
+    response is a single line of JSON. A request names a day and part, which may be
+    ALL_PARTS, along with either a `path` to the input or the input itself,
+    base64-encoded, as `data`. Responses carry a list of `results`, each with the
+    fields of `cli.Result`, or an `error` if the request was bad.
+    """
+
+    def __init__(self, path: Path, cache: Optional[ResultCache]):
+        self.cache = cache
+        super().__init__(str(path), RequestHandler)
+
+    def solve(self, req: Request) -> Response:
+        from cli import day_parts, get_mod, run_parts
+
+        try:
+            day = int(req["day"])
+            part: Part = ALL_PARTS if req["part"] == ALL_PARTS else int(req["part"])
+            if "data" in req:
+                source = base64.b64decode(req["data"])
+            else:
+                source = Path(req["path"])
+            # checks the day exists, and has its parts looked up before solving
+            day_parts(day)
+        except (KeyError, TypeError, ValueError, ModuleNotFoundError) as e:
+            return {"error": f"Bad request: {e!r}"}
+
+        # Days run as imported at startup. Their results are keyed by that source, but
+        # don't fill the cache with answers from code that's since been edited.
+        cache = self.cache
+        if cache is not None and is_stale(get_mod(day)):
+            click.echo(
+                f"day{day} has changed since the server started, so its results won't "
+                f"be cached. Restart the server to pick up the change.",
+                err=True,
+            )
+            cache = None
+        results = run_parts(day, part, source, cache)
+        return {"results": [asdict(res) for res in results]}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    server: SolverServer
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                res = self.server.solve(json.loads(line))
+            except json.JSONDecodeError as e:
+                res = {"error": f"Bad request: {e}"}
+            self.wfile.write(json.dumps(res).encode() + b"\n")
+
+
+def is_listening(path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(path))
+        except OSError:
+            return False
+        return True
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_SOCKET,
+    envvar="AOC_SOCKET",
+    show_default=True,
+)
+@click.option("--no-cache", is_flag=True, help="Always recompute, bypassing the cache.")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=DEFAULT_DIR,
+    envvar="AOC_CACHE_DIR",
+    show_default=True,
+)
+@click.option("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024))
+@click.option(
+    "--executor",
+    "executor_kind",
+    type=click.Choice(("serial", "thread", "process")),
+    default="process",
+    show_default=True,
+)
+@click.option("--workers", type=int)
+def serve(
+    socket_path: Path,
+    no_cache: bool,
+    cache_dir: Path,
+    cache_size: int,
+    executor_kind: str,
+    workers: Optional[int],
+):
+    "Keep every day's module, and a worker pool, resident to serve `client` calls"
+    import executor
+    from cli import iter_solutions
+
+    if is_listening(socket_path):
+        raise click.ClickException(f"A server is already listening on {socket_path}")
+    socket_path.unlink(missing_ok=True)
+
+    # importing every day up front is what makes later requests fast
+    num_sols = len(list(iter_solutions()))
+    executor.configure(executor_kind, workers)
+    executor.keep_alive()
+
+    cache = None if no_cache else ResultCache(cache_dir, cache_size * 1024 * 1024)
+
+    # make SIGTERM unwind like Ctrl-C, so the socket is cleaned up either way
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        with SolverServer(socket_path, cache) as server:
+            click.echo(f"Serving {num_sols} solutions on {socket_path}", err=True)
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        socket_path.unlink(missing_ok=True)
+        executor.shutdown()
+
+
+@click.command()
+@click.option("-d", "--day", required=True, type=int)
+@click.option(
+    "-p",
+    "--part",
+    required=True,
+    callback=parse_part,
+    help=f"A part number, or {ALL_PARTS!r} to solve every part of the day together.",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=DEFAULT_SOCKET,
+    envvar="AOC_SOCKET",
+    show_default=True,
+)
+@click.option(
+    "--send-data",
+    is_flag=True,
+    help="Send the input's contents rather than its path. Implied for stdin.",
+)
+@click.option("-t", "--timing", is_flag=True, help="Report the server's timings.")
+@click.argument(
+    "input",
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True, path_type=Path),
+)
+def client(
+    day: int, part: Part, socket_path: Path, send_data: bool, timing: bool, input: Path
+):
+    "Drop-in replacement for `run -d DAY -p PART INPUT` which asks a `serve` process"
+    req: Request = {"day": day, "part": part}
+    if str(input) == "-":
+        req["data"] = base64.b64encode(sys.stdin.buffer.read()).decode()
+    elif send_data:
+        req["data"] = base64.b64encode(input.read_bytes()).decode()
+    else:
+        req["path"] = str(input.resolve())
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(str(socket_path))
+        except OSError as e:
+            raise click.ClickException(
+                f"Can't reach a server on {socket_path} ({e}); start one with `serve`"
+            )
+        sock.sendall(json.dumps(req).encode() + b"\n")
+        res: Response = json.loads(sock.makefile("rb").readline())
+
+    if res.get("error") is not None:
+        raise click.ClickException(res["error"])
+    results: list[Response] = res["results"]
+    for result in results:
+        if result["error"] is not None:
+            raise click.ClickException(result["error"])
+
+    for result in results:
+        print(result["output"], end="")
+        print(result["answer"])
+    if timing:
+        # parts solved together share their timings
+        first = results[0]
+        click.echo(
+            f"wall {first['wall']:.3f}s, cpu {first['cpu']:.3f}s"
+            + (" (cached)" if all(result["cached"] for result in results) else ""),
+            err=True,
+        )
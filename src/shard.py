@@ -0,0 +1,107 @@
+import math
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Sequence, TypeVar
+
+from cache import CacheKey
+
+T = TypeVar("T")
+
+# How each sharded part's partial answers combine into the whole answer. Days opt in
+# to sharding by naming one of these for each part that supports it, in `SHARDS`.
+COMBINE: dict[str, Callable[[Iterable[int]], int]] = {
+    "max": lambda answers: max(answers, default=0),
+    "sum": sum,
+    "prod": math.prod,
+}
+
+
+@dataclass(frozen=True)
+class Shard:
+    """
+    The `index`th of `count` slices of a solution's work items, counting from 0.
+    Every shard takes every `count`th item, so the slices are the same however and
+    wherever they're run, without any coordination between them.
+    """
+
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, s: str) -> "Shard":
+        "Parse a shard given as i/n"
+        index, sep, count = s.partition("/")
+        if not sep:
+            raise ValueError(f"expected i/n, not {s!r}")
+        shard = cls(int(index), int(count))
+        if not 0 <= shard.index < shard.count:
+            raise ValueError(f"shard index must be in [0, {shard.count})")
+        return shard
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+_shard: Optional[Shard] = None
+
+
+def configure(shard: Optional[Shard] = None):
+    "Only work on the given shard of each sharded loop, or on all of them if None"
+    global _shard
+    _shard = shard
+
+
+def select(items: Sequence[T]) -> Sequence[T]:
+    "The work items belonging to this shard, which is all of them when not sharded"
+    if _shard is None:
+        return items
+    return items[_shard.index :: _shard.count]
+
+
+def record(
+    shard: Shard, key: CacheKey, combine: str, answer: int, bound: int
+) -> dict[str, Any]:
+    "A shard's partial answer, as written for merging with the others"
+    return {
+        "day": key.day,
+        "part": key.part,
+        "input_hash": key.input_hash,
+        "source_hash": key.source_hash,
+        "shard": str(shard),
+        "combine": combine,
+        "answer": answer,
+        "bound": bound,
+    }
+
+
+def merge(records: Iterable[dict[str, Any]]) -> tuple[int, int]:
+    """
+    Combine every shard's partial answer and bound into the whole answer and its
+    bound. Raises ValueError unless the records are for the same part, input and
+    source, and between them cover every shard exactly once.
+    """
+    by_index: dict[int, dict[str, Any]] = {}
+    first: Optional[dict[str, Any]] = None
+    count = 0
+    for rec in records:
+        shard = Shard.parse(rec["shard"])
+        if first is None:
+            first, count = rec, shard.count
+        for field in ("day", "part", "input_hash", "source_hash", "combine"):
+            if rec[field] != first[field]:
+                raise ValueError(f"shards disagree on {field}")
+        if shard.count != count:
+            raise ValueError("shards disagree on how many there are")
+        if shard.index in by_index:
+            raise ValueError(f"shard {shard} given more than once")
+        by_index[shard.index] = rec
+
+    if first is None:
+        raise ValueError("no shards given")
+    if missing := [str(Shard(i, count)) for i in range(count) if i not in by_index]:
+        raise ValueError(f"missing shards {', '.join(missing)}")
+
+    combine = COMBINE[first["combine"]]
+    return (
+        combine(rec["answer"] for rec in by_index.values()),
+        combine(rec["bound"] for rec in by_index.values()),
+    )
@@ -0,0 +1,80 @@
+import threading
+from typing import Any
+
+# Counters, like states explored, are summed; peaks, like the size of a visited set,
+# keep the largest value seen
+_enabled = False
+_lock = threading.Lock()
+_counters: dict[str, int] = {}
+_peaks: dict[str, int] = {}
+
+Snapshot = dict[str, dict[str, int]]
+
+
+def add(name: str, n: int = 1):
+    """
+    Add `n` to the named counter, e.g. "day19.states". Searches should tally in a
+    local and add it once at the end, rather than calling this in their inner loop.
+    Does nothing unless stats have been enabled.
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def peak(name: str, n: int):
+    "Record `n` for the named peak, if it's the largest so far"
+    if not _enabled:
+        return
+    with _lock:
+        if n > _peaks.get(name, -1):
+            _peaks[name] = n
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _peaks.clear()
+
+
+def enable():
+    "Start counting in this process, discarding anything counted before"
+    global _enabled
+    reset()
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def snapshot() -> Snapshot:
+    with _lock:
+        return {"counters": dict(_counters), "peaks": dict(_peaks)}
+
+
+def merge(other: Snapshot):
+    "Fold in what was counted elsewhere, e.g. in a worker process"
+    for name, n in other["counters"].items():
+        add(name, n)
+    for name, n in other["peaks"].items():
+        peak(name, n)
+
+
+def report(seconds: float) -> dict[str, Any]:
+    "Everything counted so far, with each counter's rate over `seconds`"
+    counts = snapshot()
+    rates = {
+        name: n / seconds if seconds else 0.0 for name, n in counts["counters"].items()
+    }
+    return {
+        "counters": dict(sorted(counts["counters"].items())),
+        "peaks": dict(sorted(counts["peaks"].items())),
+        "per_second": dict(sorted(rates.items())),
+    }
@@ -0,0 +1,80 @@
+import json
+import time
+from typing import BinaryIO, Iterator, Optional, Protocol, TextIO
+
+
+class Stream(Protocol):
+    "A day's running answers, updated a line at a time in constant memory"
+
+    def feed(self, line: bytes) -> None:
+        ...
+
+    def answers(self) -> tuple[int, ...]:
+        "The answer to each part, given every line fed so far"
+        ...
+
+
+def iter_lines(
+    f: BinaryIO, follow: bool, poll_interval: float
+) -> Iterator[Optional[bytes]]:
+    """
+    Lines from `f`, without their line endings. When following, reaching the end
+    waits for more to be appended, like `tail -f`, yielding None on each poll so that
+    the caller can report progress while idle. A trailing line without a newline
+    might still be being written, so it's held back until it has one.
+    """
+    partial = b""
+    while True:
+        line = f.readline()
+        if line.endswith(b"\n"):
+            yield (partial + line).rstrip(b"\r\n")
+            partial = b""
+        elif not follow:
+            if partial + line:
+                yield partial + line
+            return
+        else:
+            partial += line
+            yield None
+            time.sleep(poll_interval)
+
+
+def run(
+    stream: Stream,
+    f: BinaryIO,
+    parts: list[int],
+    out: TextIO,
+    interval: float,
+    follow: bool = False,
+):
+    """
+    Feed every line of `f` to `stream`, writing a JSON line of the running answers to
+    `out` at most every `interval` seconds, and once more at the end of the input
+    (or on interrupt, when following) if anything is left unreported.
+    """
+    lines = 0
+    reported = -1
+
+    def report():
+        nonlocal reported
+        answers = stream.answers()
+        res = {"lines": lines} | {f"part{part}": answers[part - 1] for part in parts}
+        out.write(json.dumps(res) + "\n")
+        out.flush()
+        reported = lines
+
+    next_report = time.monotonic() + interval
+    try:
+        for line in iter_lines(f, follow, min(interval, 0.1)):
+            if line is not None:
+                stream.feed(line)
+                lines += 1
+            if lines != reported and time.monotonic() >= next_report:
+                report()
+                next_report = time.monotonic() + interval
+    except KeyboardInterrupt:
+        if not follow:
+            raise
+
+    if lines != reported:
+        report()
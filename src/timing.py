@@ -0,0 +1,131 @@
+import threading
+import time
+from functools import wraps
+from inspect import isgeneratorfunction
+from typing import Any, Callable, Generator, TypeVar
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# The conventional phases. Any name may be used, but these are what the solutions use.
+PARSE = "parse"
+PRECOMPUTE = "precompute"
+SOLVE = "solve"
+
+_enabled = False
+_lock = threading.Lock()
+_seconds: dict[str, float] = {}
+_calls: dict[str, int] = {}
+_local = threading.local()
+
+
+class Frame:
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.children = 0.0
+
+
+def _stack() -> list[Frame]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+class Phase:
+    """
+    Times the enclosed block, or each call of the decorated function, as a named
+    phase. Time is charged to the innermost phase only, so a parse nested inside a
+    solve isn't counted twice and the phases add up to the total. Decorated
+    generators are timed only while producing items, not while their consumer
+    works. Does nothing unless timing has been enabled.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self) -> "Phase":
+        if _enabled:
+            _stack().append(Frame(self.name))
+        return self
+
+    def __exit__(self, *_: object):
+        stack = _stack() if _enabled else None
+        if not stack or stack[-1].name != self.name:
+            # timing was enabled or reset part way through this phase
+            return
+
+        frame = stack.pop()
+        elapsed = time.perf_counter() - frame.start
+        if stack:
+            stack[-1].children += elapsed
+        with _lock:
+            _seconds[self.name] = (
+                _seconds.get(self.name, 0.0) + elapsed - frame.children
+            )
+            _calls[self.name] = _calls.get(self.name, 0) + 1
+
+    def _timed_gen(self, gen: Generator[Any, None, Any]) -> Generator[Any, None, Any]:
+        while True:
+            with self:
+                try:
+                    item = next(gen)
+                except StopIteration as e:
+                    return e.value
+            yield item
+
+    def __call__(self, fn: F) -> F:
+        if isgeneratorfunction(fn):
+
+            @wraps(fn)
+            def gen_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not _enabled:
+                    return fn(*args, **kwargs)
+                return self._timed_gen(fn(*args, **kwargs))
+
+            return gen_wrapper  # type: ignore
+
+        @wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with self:
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore
+
+
+def phase(name: str) -> Phase:
+    "Mark a block or function as part of the named phase, e.g. timing.phase(PARSE)"
+    return Phase(name)
+
+
+def reset():
+    with _lock:
+        _seconds.clear()
+        _calls.clear()
+    _stack().clear()
+
+
+def enable():
+    "Start timing phases in this process, discarding anything recorded before"
+    global _enabled
+    reset()
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def results() -> dict[str, dict[str, float | int]]:
+    "Seconds spent in, and number of entries to, each phase so far"
+    with _lock:
+        return {
+            name: {"seconds": _seconds[name], "calls": _calls[name]}
+            for name in sorted(_seconds, key=_seconds.__getitem__, reverse=True)
+        }
@@ -0,0 +1,39 @@
+import re
+from pathlib import Path
+
+import pytest
+
+from cli import adapt_input, get_sol
+from fastio import MappedInput
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+
+def day_of(name: str) -> int:
+    "The day a data file is for, given its name, like day9test2"
+    m = re.match(r"day(\d+)", name)
+    assert m is not None
+    return int(m[1])
+
+
+def solve(name: str, part: int) -> int:
+    "Run the current solution on a data file, whatever kind of input it takes"
+    day = day_of(name)
+    with MappedInput.open(DATA_DIR / f"{name}.txt") as inp:
+        return get_sol(day, part)(adapt_input(day, inp))
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.addoption(
+        "--runslow", action="store_true", help="Also run tests marked as slow."
+    )
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]):
+    if config.getoption("--runslow"):
+        return
+
+    skip_slow = pytest.mark.skip(reason="slow; use --runslow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
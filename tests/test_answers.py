@@ -0,0 +1,191 @@
+import time
+from typing import Any, Optional
+
+import pytest
+
+from cli import call_all, call_sol
+from conftest import DATA_DIR, day_of
+from fastio import MappedInput
+
+# Seconds any one solution may take, unless its case says otherwise. Generous, so
+# that only algorithmic regressions trip it rather than a slow machine.
+DEFAULT_CEILING = 10.0
+
+
+def case(
+    name: str,
+    part: int,
+    answer: int,
+    output: Optional[str] = None,
+    ceiling: float = DEFAULT_CEILING,
+    slow: bool = False,
+) -> Any:
+    marks = [pytest.mark.slow] if slow else []
+    return pytest.param(
+        name, part, answer, output, ceiling, id=f"{name}-part{part}", marks=marks
+    )
+
+
+EXAMPLE_CRT = (
+    "##..##..##..##..##..##..##..##..##..##..\n"
+    "###...###...###...###...###...###...###.\n"
+    "####....####....####....####....####....\n"
+    "#####.....#####.....#####.....#####.....\n"
+    "######......######......######......####\n"
+    "#######.......#######.......#######.....\n"
+)
+
+# day 10 part 2's answer is the letters drawn on the CRT, ECZUZALR here
+CRT = (
+    "####..##..####.#..#.####..##..#....###..\n"
+    "#....#..#....#.#..#....#.#..#.#....#..#.\n"
+    "###..#......#..#..#...#..#..#.#....#..#.\n"
+    "#....#.....#...#..#..#...####.#....###..\n"
+    "#....#..#.#....#..#.#....#..#.#....#.#..\n"
+    "####..##..####..##..####.#..#.####.#..#.\n"
+)
+
+
+EXAMPLES = [
+    case("day1test", 1, 24000),
+    case("day1test", 2, 45000),
+    case("day2test", 1, 15),
+    case("day2test", 2, 12),
+    case("day3test", 1, 157),
+    case("day3test", 2, 70),
+    case("day4test", 1, 2),
+    case("day4test", 2, 4),
+    # day 5's answers are printed rather than returned
+    case("day5test", 1, 0, "CMZ\n"),
+    case("day5test", 2, 0, "MCD\n"),
+    case("day6test", 1, 7),
+    case("day6test", 2, 19),
+    case("day7test", 1, 95437),
+    case("day7test", 2, 24933642),
+    case("day8test", 1, 21),
+    case("day8test", 2, 8),
+    case("day9test", 1, 13),
+    case("day9test", 2, 1),
+    case("day9test2", 1, 88),
+    case("day9test2", 2, 36),
+    case("day10test2", 1, 13140),
+    case("day10test2", 2, 0, EXAMPLE_CRT),
+    case("day11test", 1, 10605),
+    case("day11test", 2, 2713310158),
+    case("day12test", 1, 31),
+    case("day12test", 2, 29),
+    case("day13test", 1, 13),
+    case("day13test", 2, 140),
+    case("day14test", 1, 24),
+    case("day14test", 2, 93),
+    # day 15 has the real input's row and search area hardcoded, so its example
+    # doesn't give the example's answers
+    case("day16test", 1, 1651),
+    case("day16test", 2, 1707),
+    case("day17test", 1, 3068),
+    case("day17test", 2, 1514285714288),
+    case("day18test", 1, 64),
+    case("day18test", 2, 58),
+    case("day19test", 1, 33, ceiling=120),
+    case("day19test", 2, 3472, ceiling=600, slow=True),
+    case("day20test", 1, 3),
+    case("day20test", 2, 1623178306),
+    case("day21test", 1, 152),
+    case("day21test", 2, 301),
+    # day 22 part 2 has the real input's cube layout hardcoded
+    case("day22test", 1, 6032),
+    case("day23test", 1, 110),
+    case("day23test", 2, 20),
+    case("day23test2", 1, 25),
+    case("day23test2", 2, 4),
+    case("day24test", 1, 18),
+    case("day24test", 2, 54),
+    case("day25test", 1, 4890, "2=-1=0\n"),
+]
+
+INPUTS = [
+    case("day1", 1, 66487),
+    case("day1", 2, 197301),
+    case("day2", 1, 10718),
+    case("day2", 2, 14652),
+    case("day3", 1, 8493),
+    case("day3", 2, 2552),
+    case("day4", 1, 487),
+    case("day4", 2, 849),
+    case("day5", 1, 0, "FWSHSPJWM\n"),
+    case("day5", 2, 0, "PWPWHGFZS\n"),
+    case("day6", 1, 1356),
+    case("day6", 2, 2564),
+    case("day7", 1, 1232307),
+    case("day7", 2, 7268994),
+    case("day8", 1, 1818),
+    case("day8", 2, 368368),
+    case("day9", 1, 6037),
+    case("day9", 2, 2485),
+    case("day10", 1, 16020),
+    case("day10", 2, 0, CRT),
+    case("day11", 1, 107822),
+    case("day11", 2, 27267163742),
+    case("day12", 1, 352),
+    case("day12", 2, 345),
+    case("day13", 1, 5717),
+    case("day13", 2, 25935),
+    case("day14", 1, 892),
+    case("day14", 2, 27155),
+    case("day15", 1, 4748135),
+    case("day15", 2, 13743542639657, ceiling=60, slow=True),
+    case("day16", 1, 1720),
+    case("day16", 2, 2582, ceiling=900, slow=True),
+    case("day17", 1, 3098),
+    case("day17", 2, 1525364431487),
+    case("day18", 1, 4390),
+    case("day18", 2, 2534),
+    case("day19", 1, 1653, ceiling=200, slow=True),
+    case("day20", 1, 10763),
+    case("day20", 2, 4979911042808, ceiling=90, slow=True),
+    case("day21", 1, 75147370123646),
+    case("day21", 2, 3423279932937),
+    case("day22", 1, 75388),
+    case("day22", 2, 182170),
+    case("day23", 1, 3940),
+    case("day23", 2, 990),
+    case("day24", 1, 326),
+    case("day24", 2, 976),
+    case("day25", 1, 35677038780996, "2-2--02=1---1200=0-1\n"),
+]
+
+
+# Days with a `solve` hook, which answers both parts from one parse, and a day without
+# one, which falls back to running each part in turn
+JOINT = [
+    pytest.param("day1test", (24000, 45000)),
+    pytest.param("day11test", (10605, 2713310158)),
+    pytest.param("day15", (4748135, 13743542639657), marks=pytest.mark.slow),
+    pytest.param("day16test", (1651, 1707)),
+    pytest.param("day22", (75388, 182170)),
+    pytest.param("day23test", (110, 20)),
+]
+
+
+@pytest.mark.parametrize("name, part, answer, output, ceiling", EXAMPLES + INPUTS)
+def test_answer(
+    name: str, part: int, answer: int, output: Optional[str], ceiling: float
+):
+    day = day_of(name)
+    with MappedInput.open(DATA_DIR / f"{name}.txt") as inp:
+        start = time.perf_counter()
+        entry, _ = call_sol(day, part, inp)
+        elapsed = time.perf_counter() - start
+
+    assert entry.answer == answer
+    if output is not None:
+        assert entry.output == output
+    assert elapsed < ceiling, f"took {elapsed:.2f}s, over the {ceiling}s ceiling"
+
+
+@pytest.mark.parametrize("name, answers", JOINT)
+def test_all_parts(name: str, answers: tuple[int, ...]):
+    with MappedInput.open(DATA_DIR / f"{name}.txt") as inp:
+        solved = call_all(day_of(name), inp)
+
+    assert tuple(entry.answer for entry, _ in solved) == answers
@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import artifacts
+from artifacts import ArtifactStore
+from cache import CacheKey, ResultCache
+from cli import call_sol
+from conftest import DATA_DIR
+from fastio import MappedInput
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> ArtifactStore:
+    return ArtifactStore(tmp_path, 1 << 20)
+
+
+def test_computes_once(store: ArtifactStore):
+    key = CacheKey(1, 1, "input", "source")
+    calls = []
+
+    def compute(n: int) -> np.ndarray:
+        calls.append(n)
+        return np.arange(n)
+
+    with artifacts.bound(store, key):
+        first = artifacts.cached("table", compute, 5)
+        second = artifacts.cached("table", compute, 5)
+
+    assert calls == [5]
+    assert isinstance(second, np.memmap)
+    assert second.tolist() == first.tolist() == [0, 1, 2, 3, 4]
+
+
+def test_shared_between_parts_only(store: ArtifactStore):
+    def compute() -> np.ndarray:
+        return np.zeros(3)
+
+    with artifacts.bound(store, CacheKey(1, 1, "input", "source")):
+        artifacts.cached("table", compute)
+
+    assert store.load(CacheKey(1, 2, "input", "source"), "table") is not None
+    assert store.load(CacheKey(1, 1, "other", "source"), "table") is None
+    assert store.load(CacheKey(2, 1, "input", "source"), "table") is None
+
+
+def test_stale_source_dropped(store: ArtifactStore):
+    old = CacheKey(1, 1, "input", "old")
+    store.save(old, "table", np.zeros(3))
+    store.save(CacheKey(1, 1, "input", "new"), "table", np.zeros(3))
+    assert store.load(old, "table") is None
+
+
+def test_unbound_computes():
+    assert artifacts.cached("table", np.arange, 3).tolist() == [0, 1, 2]
+
+
+def test_part2_reuses_part1(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    import day16
+
+    cache = ResultCache(tmp_path)
+    with MappedInput.open(DATA_DIR / "day16test.txt") as inp:
+        assert call_sol(16, 1, inp, cache)[0].answer == 1651
+
+    def recompute(*args):
+        raise AssertionError("distances should have been loaded")
+
+    monkeypatch.setattr(day16, "get_distances", recompute)
+    with MappedInput.open(DATA_DIR / "day16test.txt") as inp:
+        assert call_sol(16, 2, inp, cache)[0].answer == 1707
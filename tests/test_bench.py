@@ -0,0 +1,64 @@
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+import bench
+from bench import Measurement, check_regression, iter_benchmarks
+from conftest import DATA_DIR
+
+NAME = "day2.part1:day2test.txt"
+
+
+def test_skips_examples_of_real_input_only_parts():
+    names = [name for name, *_ in iter_benchmarks(DATA_DIR, (15, 22), ())]
+    assert names == [
+        "day15.part1:day15.txt",
+        "day15.part2:day15.txt",
+        "day22.part1:day22.txt",
+        "day22.part1:day22test.txt",
+        "day22.part2:day22.txt",
+    ]
+
+
+@pytest.mark.parametrize("median, regressed", [(1.0, False), (1.2, False), (1.3, True)])
+def test_check_regression(median: float, regressed: bool):
+    baseline = {NAME: {"median": 1.0}}
+    found = check_regression(NAME, Measurement(median, median, 0, 0), baseline, 0.25)
+    assert (found is not None) == regressed
+    if found is not None:
+        assert NAME in found
+
+
+def run_bench(baseline: Path, *args: str):
+    return CliRunner().invoke(
+        bench.cli,
+        ["-d", "2", "-p", "1", "--data-dir", str(DATA_DIR), "--warmup", "0"]
+        + ["--repeat", "1", "--baseline", str(baseline), *args],
+    )
+
+
+@pytest.mark.parametrize("median, exit_code", [(60.0, 0), (0.0, 1)])
+def test_against_baseline(tmp_path: Path, median: float, exit_code: int):
+    path = tmp_path / "baseline.json"
+    names = [name for name, *_ in iter_benchmarks(DATA_DIR, (2,), (1,))]
+    path.write_text(json.dumps({name: {"median": median} for name in names}))
+
+    result = run_bench(path)
+    assert result.exit_code == exit_code
+    assert ("Regressions:" in result.output) == bool(exit_code)
+    assert "No baseline" not in result.output
+
+
+def test_missing_baseline_reported(tmp_path: Path):
+    path = tmp_path / "baseline.json"
+    result = run_bench(path)
+    assert result.exit_code == 0
+    assert "No baseline for (record one with --save):\n  day2.part1:day2.txt\n" in (
+        result.output
+    )
+
+    assert run_bench(path, "--save").exit_code == 0
+    assert "No baseline" not in run_bench(path).output
+    assert NAME in json.loads(path.read_text())
@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+
+import budget
+from cache import ResultCache, make_key
+from cli import call_sol, get_mod
+from conftest import DATA_DIR, solve
+from fastio import MappedInput
+
+
+@pytest.mark.parametrize(
+    "name, part, answer", [("day16test", 1, 1651), ("day16test", 2, 1707)]
+)
+def test_optimal_within_budget(name: str, part: int, answer: int):
+    with budget.limited(60):
+        assert solve(name, part) == answer
+        assert budget.outcome(answer) == budget.Outcome(answer, answer)
+
+
+@pytest.mark.parametrize(
+    "name, part, answer",
+    [
+        ("day16test", 1, 1651),
+        ("day16test", 2, 1707),
+        ("day16", 1, 1720),
+        ("day19", 1, 1653),
+    ],
+)
+def test_bounded_when_out_of_time(name: str, part: int, answer: int):
+    with budget.limited(0):
+        found = solve(name, part)
+        outcome = budget.outcome(found)
+
+    assert outcome.answer == found
+    assert found <= answer <= outcome.bound
+    assert not outcome.optimal
+
+
+def test_exhausted_without_answer():
+    with budget.limited(0), pytest.raises(budget.Exhausted) as e:
+        solve("day24", 1)
+
+    assert e.value.outcome.answer is None
+    assert 0 < e.value.outcome.bound <= 326
+
+
+def test_unbudgeted_ignores_settle():
+    assert budget.settle(1, 2) == 1
+    assert budget.outcome(1).optimal
+
+
+def test_cut_short_not_cached(tmp_path: Path):
+    cache = ResultCache(tmp_path)
+    with MappedInput.open(DATA_DIR / "day16test.txt") as inp:
+        with budget.limited(0):
+            entry, _ = call_sol(16, 1, inp, cache)
+        assert entry.answer < 1651
+        assert cache.get(make_key(16, 1, inp.data, get_mod(16))) is None
+
+
+def test_unbudgeted_after_budgeted_is_cached(tmp_path: Path):
+    cache = ResultCache(tmp_path)
+    with MappedInput.open(DATA_DIR / "day16test.txt") as inp:
+        with budget.limited(0):
+            call_sol(16, 1, inp, cache)
+        entry, _ = call_sol(16, 1, inp, cache)
+        assert entry.answer == 1651
+        assert cache.get(make_key(16, 1, inp.data, get_mod(16))) == entry
@@ -0,0 +1,51 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+from cache import is_stale, make_key, source_digest, source_files
+
+
+def write_modules(root: Path, **sources: str):
+    for name, source in sources.items():
+        (root / f"{name}.py").write_text(source)
+
+
+def test_source_files_follow_local_imports(tmp_path: Path):
+    write_modules(
+        tmp_path,
+        day1="import os\nimport grid\n\n\ndef part1():\n    from coords import x\n",
+        grid="from coords import y\nimport numpy as np\n",
+        coords="import grid\n",
+        day2="",
+    )
+    found = source_files(tmp_path / "day1.py")
+    assert [p.name for p in found] == ["coords.py", "day1.py", "grid.py"]
+
+
+def test_helper_changes_digest(tmp_path: Path):
+    write_modules(tmp_path, day1="import grid\n", day2="", grid="SIZE = 1\n")
+    day1, day2 = source_digest(tmp_path / "day1.py"), source_digest(
+        tmp_path / "day2.py"
+    )
+
+    write_modules(tmp_path, grid="SIZE = 2\n")
+    assert source_digest(tmp_path / "day1.py") != day1
+    assert source_digest(tmp_path / "day2.py") == day2
+
+
+def test_keyed_by_source_as_imported(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    write_modules(tmp_path, day99="import helper99\n", helper99="ANSWER = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    mod = importlib.import_module("day99")
+    try:
+        key = make_key(99, 1, b"", mod)
+        assert not is_stale(mod)
+
+        write_modules(tmp_path, helper99="ANSWER = 2\n")
+        assert is_stale(mod)
+        # still the code that's running
+        assert make_key(99, 1, b"", mod) == key
+    finally:
+        del sys.modules["day99"], sys.modules["helper99"]
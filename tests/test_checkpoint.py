@@ -0,0 +1,131 @@
+import json
+from dataclasses import replace
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from click.testing import CliRunner
+
+import checkpoint
+import executor
+import shard
+import day20
+from cache import make_key
+from checkpoint import CheckpointStore
+from cli import cli, get_mod
+from conftest import DATA_DIR, day_of, solve
+from shard import Shard
+
+
+def key_for(name: str, part: int):
+    day = day_of(name)
+    return make_key(day, part, (DATA_DIR / f"{name}.txt").read_bytes(), get_mod(day))
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> CheckpointStore:
+    return CheckpointStore(tmp_path)
+
+
+def test_round_trip(store: CheckpointStore):
+    key = key_for("day20test", 2)
+    assert store.load(key) is None
+    store.save(key, (3, [0, 1, 2]))
+    assert store.load(key) == (3, [0, 1, 2])
+    store.clear(key)
+    assert store.load(key) is None
+
+
+def test_stale_source_ignored(store: CheckpointStore):
+    key = key_for("day20test", 2)
+    store.save(key, (3, [0, 1, 2]))
+    assert store.load(replace(key, source_hash="changed")) is None
+
+
+def test_corrupt_ignored(store: CheckpointStore):
+    key = key_for("day20test", 2)
+    store.save(key, 1)
+    next(store.root.rglob("*.pickle")).write_bytes(b"not a pickle")
+    assert store.load(key) is None
+
+
+def test_unbound_does_nothing():
+    assert checkpoint.load() is None
+    assert not checkpoint.due()
+    checkpoint.save(1)
+
+
+def test_only_loaded_when_resuming(store: CheckpointStore):
+    key = key_for("day20test", 2)
+    store.save(key, 1)
+    with checkpoint.bound(store, key, resume=False):
+        assert checkpoint.load() is None
+    with checkpoint.bound(store, key, resume=True):
+        assert checkpoint.load() == 1
+
+
+def test_day20_resumes_part_way(store: CheckpointStore):
+    key = key_for("day20test", 2)
+    with checkpoint.bound(store, key, resume=False, interval=0):
+        with open(DATA_DIR / "day20test.txt") as inp:
+            day20.decode(inp, 811589153, 4)
+    rounds, _ = store.load(key)
+    assert rounds == 4
+
+    with checkpoint.bound(store, key, resume=True):
+        assert solve("day20test", 2) == 1623178306
+
+
+def test_day16_skips_done_partitions(store: CheckpointStore):
+    key = key_for("day16test", 2)
+    with checkpoint.bound(store, key, resume=False, interval=0):
+        assert solve("day16test", 2) == 1707
+    done, best = store.load(key)
+    assert all(done) and best == 1707
+
+    # had the partitions done been redone, the made up best would be beaten
+    store.save(key, (done, 1000))
+    with checkpoint.bound(store, key, resume=True):
+        assert solve("day16test", 2) == 1000
+
+
+def test_day15_resumes_from_row(store: CheckpointStore):
+    key = key_for("day15", 2)
+    # the row the distress beacon is on
+    store.save(key, 2639657)
+    with checkpoint.bound(store, key, resume=True):
+        assert solve("day15", 2) == 13743542639657
+
+
+@pytest.fixture
+def isolated() -> Iterator[None]:
+    "Undo the process-wide settings running the CLI leaves behind"
+    try:
+        yield
+    finally:
+        executor.configure()
+        shard.configure()
+
+
+def test_shards_resume_their_own(tmp_path: Path, isolated: None):
+    key = key_for("day16test", 2)
+    store = CheckpointStore(tmp_path / checkpoint.DIR_NAME)
+    # as if shard 0 was interrupted, having done every partition, with a made up best
+    store.save(key, (bytearray([1]) * 64, 9999), Shard(0, 2))
+
+    def run_shard(index: int) -> dict:
+        args = ["-d", "16", "-p", "2", "--shard", f"{index}/2", "--resume"]
+        args += ["--checkpoint-interval", "0", "--executor", "serial"]
+        args += ["--progress", "off", "--cache-dir", str(tmp_path)]
+        result = CliRunner().invoke(cli, args + [str(DATA_DIR / "day16test.txt")])
+        assert result.exit_code == 0, result.output
+        return json.loads(result.stdout)
+
+    second = run_shard(1)
+    assert second["answer"] < 9999
+    assert store.load(key, Shard(1, 2)) is None
+    assert store.load(key, Shard(0, 2)) is not None
+
+    first = run_shard(0)
+    assert first["answer"] == 9999
+    assert shard.merge([first, second]) == (9999, 9999)
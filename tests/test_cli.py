@@ -0,0 +1,35 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import cli
+import executor
+import profiling
+import progress
+from conftest import DATA_DIR
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+
+def test_mirrored_choices():
+    assert cli.EXECUTOR_KINDS == executor.KINDS
+    assert cli.PROFILERS == profiling.PROFILERS
+    assert cli.PROGRESS_MODES == progress.MODES
+
+
+def test_no_cache_run_imports_little(tmp_path: Path):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "cli.py", "-d", "2", "-p", "1"]
+        + ["--no-cache", str(DATA_DIR / "day2.txt")],
+        cwd=SRC_DIR,
+        env={"AOC_CACHE_DIR": str(tmp_path)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    imported = {
+        line.rsplit("|", 1)[1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert imported.isdisjoint({"hashlib", "json", "shard", "profiling", "progress"})
@@ -0,0 +1,152 @@
+import io
+import random
+from types import ModuleType
+from typing import Callable
+
+import pytest
+
+import coords
+from cli import adapt_input, get_mod, get_sol
+from fastio import MAX_DIGITS, MappedInput
+from gen import GENERATORS
+from grid import Grid
+from reference import day1, day2, day3, day4, day8, day9, day12, day14, day22, day23
+from reference import day16, day18, day24
+
+# Every test runs against a handful of seeds, on inputs generated at a scale small
+# enough for the reference solutions
+SEEDS = range(5)
+SCALE = 0.1
+
+
+def solve(day: int, part: int, text: str) -> int:
+    "Run the current solution, whatever kind of input it takes"
+    return get_sol(day, part)(adapt_input(day, MappedInput(text.encode())))
+
+
+CASES = [
+    (1, day1),
+    (2, day2),
+    (3, day3),
+    (4, day4),
+    (8, day8),
+    (9, day9),
+    (12, day12),
+    (14, day14),
+    (16, day16),
+    (18, day18),
+    (22, day22),
+    (23, day23),
+    (24, day24),
+]
+
+
+def outcome(fn: Callable[[], int]) -> int | str:
+    "The answer, or the type of exception raised, which must also match"
+    try:
+        return fn()
+    except Exception as e:
+        return type(e).__name__
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("part", [1, 2])
+@pytest.mark.parametrize("day, reference", CASES, ids=[f"day{day}" for day, _ in CASES])
+def test_matches_reference(day: int, reference: ModuleType, part: int, seed: int):
+    if part in getattr(get_mod(day), "REAL_INPUT_ONLY", ()):
+        pytest.skip(f"day {day} part {part} only works with the real input")
+
+    text = GENERATORS[day](random.Random(f"{day}-{seed}"), SCALE)
+    expected = outcome(lambda: getattr(reference, f"part{part}")(io.StringIO(text)))
+    assert outcome(lambda: solve(day, part, text)) == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("trailing", ["", "\r", " ", " \t\r"])
+def test_ints_matches_int(seed: int, trailing: str):
+    rng = random.Random(seed)
+    lines = [
+        ("" if rng.random() < 0.2 else str(rng.randint(-(10**15), 10**15)))
+        + rng.choice(["", trailing])
+        for _ in range(rng.randint(1, 1000))
+    ]
+    text = "\n".join(lines) + rng.choice(["", "\n"])
+
+    values, blank = MappedInput(text.encode()).ints()
+    assert values.tolist() == [int(line) if line.strip() else 0 for line in lines]
+    assert blank.tolist() == [not line.strip() for line in lines]
+
+
+@pytest.mark.parametrize("line", ["-1x2", "1 2", "12a", "-", "--3"])
+def test_ints_rejects_non_integers(line: str):
+    with pytest.raises(ValueError):
+        int(line.rstrip())
+    with pytest.raises(ValueError):
+        MappedInput(f"1\n{line}\n2\n".encode()).ints()
+
+
+@pytest.mark.parametrize("line", [" 4", "\t-4"])
+def test_ints_rejects_leading_whitespace(line: str):
+    with pytest.raises(ValueError):
+        MappedInput(f"1\n{line}\n".encode()).ints()
+
+
+@pytest.mark.parametrize("sign", ["", "-"])
+def test_ints_digit_limit(sign: str):
+    longest = sign + "9" * MAX_DIGITS
+    values, _ = MappedInput(f"{longest}\n1\n".encode()).ints()
+    assert values.tolist() == [int(longest), 1]
+
+    with pytest.raises(ValueError):
+        MappedInput(f"1\n{sign}1{'0' * MAX_DIGITS}\n".encode()).ints()
+
+
+def test_day1_crlf():
+    text = GENERATORS[1](random.Random(0), SCALE)
+    assert solve(1, 1, text.replace("\n", "\r\n")) == solve(1, 1, text)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_lines_matches_splitlines(seed: int):
+    rng = random.Random(seed)
+    text = "".join(
+        rng.choice(["\n", "a", "bc", " d e "]) for _ in range(rng.randint(0, 200))
+    )
+    assert [
+        line.decode() for line in MappedInput(text.encode()).lines()
+    ] == text.splitlines()
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("pad", [0, 1, 3])
+def test_grid_matches_lists(seed: int, pad: int):
+    rng = random.Random(seed)
+    lines = ["".join(rng.choices("#.", k=rng.randint(1, 20))) for _ in range(20)]
+    grid = Grid.parse("\n".join(lines), pad=pad)
+
+    width = max(len(line) for line in lines)
+    for y in range(-pad, len(lines) + pad):
+        for x in range(-pad, width + pad):
+            if (x, y) in grid and x < len(lines[y]):
+                expected = ord(lines[y][x])
+            else:
+                expected = grid.fill
+            i = grid.index(x, y)
+            assert grid.cells[i] == expected
+            assert grid.coords(i) == (x, y)
+
+    i = grid.index(1, 1)
+    for offset, (dx, dy) in zip(grid.offsets4, [(0, -1), (1, 0), (0, 1), (-1, 0)]):
+        assert grid.coords(i + offset) == (1 + dx, 1 + dy)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_coords_matches_tuples(seed: int):
+    rng = random.Random(seed)
+    limit = coords.BIAS // 2
+    for _ in range(1000):
+        x, y, dx, dy = (rng.randint(-limit, limit) for _ in range(4))
+        p = coords.pack(x, y)
+        assert coords.unpack(p) == (x, y)
+        assert coords.unpack(p + coords.offset(dx, dy)) == (x + dx, y + dy)
+        assert coords.manhattan(p, coords.pack(dx, dy)) == abs(x - dx) + abs(y - dy)
@@ -0,0 +1,86 @@
+import pickle
+from typing import Any, Iterator
+
+import numpy as np
+import pytest
+
+import executor
+from executor import Published
+
+
+@pytest.fixture
+def process_pool() -> Iterator[None]:
+    executor.configure("process", 2)
+    executor.keep_alive()
+    try:
+        yield
+    finally:
+        executor.configure()
+
+
+def lookup(index: int, table: Published[Any]) -> Any:
+    value = table.get()[index]
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def writable(_: int, table: Published[np.ndarray]) -> bool:
+    return table.get().flags.writeable
+
+
+def test_array(process_pool: None):
+    arr = np.arange(1000, dtype=np.int32) * 3
+    with executor.publish(arr) as table:
+        assert len(pickle.dumps(table)) < 200
+        found = executor.map_chunked(lookup, range(0, 1000, 100), table, chunksize=1)
+        assert sorted(found) == list(range(0, 3000, 300))
+        assert not any(executor.map_chunked(writable, range(4), table))
+
+
+def test_object(process_pool: None):
+    graph = {i: (i, {i + 1}) for i in range(100)}
+    with executor.publish(graph) as table:
+        found = executor.map_chunked(lookup, [3, 50], table, chunksize=1)
+        assert sorted(found) == [(3, {4}), (50, {51})]
+
+
+def test_many_publishes_reuse_pool(process_pool: None):
+    for n in range(executor.MAX_ATTACHED * 2):
+        with executor.publish([n]) as table:
+            assert list(executor.map_chunked(lookup, [0], table)) == [n]
+
+
+def test_unlinked_after(process_pool: None):
+    from multiprocessing.shared_memory import SharedMemory
+
+    with executor.publish(np.zeros(10)) as table:
+        assert list(executor.map_chunked(lookup, [0], table)) == [0.0]
+        name = table._descriptor[0]
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+@pytest.mark.parametrize("kind", ["serial", "thread"])
+def test_shared_in_process(kind: str):
+    executor.configure(kind)
+    value = [1, 2, 3]
+    try:
+        with executor.publish(value) as table:
+            assert table.get() is value
+            with pytest.raises(TypeError):
+                pickle.dumps(table)
+    finally:
+        executor.configure()
+
+
+@pytest.mark.parametrize("kind", ["serial", "thread"])
+def test_results_before_all_chunks_run(kind: str):
+    executor.configure(kind, 1)
+    ran: list[int] = []
+    try:
+        results = executor.map_chunked(ran.append, range(10), chunksize=1)
+        next(results)
+        assert len(ran) < 10
+        assert sum(1 for _ in results) == 9
+        assert sorted(ran) == list(range(10))
+    finally:
+        executor.configure()
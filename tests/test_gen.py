@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from cli import adapt_input, get_sol
+from fastio import MappedInput
+from gen import GENERATORS
+
+DAYS = sorted(GENERATORS)
+
+# parts which take more than a few seconds on a scale 1 input
+SLOW = {(15, 2), (16, 1), (16, 2), (19, 1), (19, 2), (20, 2)}
+
+
+def generate(day: int, scale: int = 1, seed: int = 0) -> str:
+    return GENERATORS[day](random.Random(seed), scale)
+
+
+@pytest.mark.parametrize("day", DAYS)
+def test_deterministic(day: int):
+    assert generate(day, seed=1) == generate(day, seed=1)
+    assert generate(day, seed=1) != generate(day, seed=2)
+
+
+@pytest.mark.parametrize("day", DAYS)
+def test_grows_with_scale(day: int):
+    assert len(generate(day, scale=3)) > len(generate(day))
+
+
+@pytest.mark.parametrize("part", [1, 2])
+@pytest.mark.parametrize("day", DAYS)
+def test_solutions_accept(day: int, part: int):
+    if day == 25 and part == 2:
+        pytest.skip("day 25 has no part 2")
+    if (day, part) in SLOW:
+        pytest.skip("too slow to solve")
+
+    inp = adapt_input(day, MappedInput(generate(day).encode()))
+    answer = get_sol(day, part)(inp)
+    assert int(answer) == answer
@@ -0,0 +1,84 @@
+import io
+import json
+from typing import Iterator, Optional
+
+import pytest
+
+import progress
+from conftest import solve
+from progress import JsonSink
+
+
+class RecordingSink:
+    def __init__(self):
+        self.updates: list[int] = []
+        self.closed: Optional[tuple[str, int, Optional[int]]] = None
+
+    def update(self, label: str, done: int, total: Optional[int], elapsed: float):
+        self.updates.append(done)
+
+    def close(self, label: str, done: int, total: Optional[int], elapsed: float):
+        self.closed = (label, done, total)
+
+
+@pytest.fixture
+def sink() -> Iterator[RecordingSink]:
+    sink = RecordingSink()
+    progress.configure(sink)
+    try:
+        yield sink
+    finally:
+        progress.configure(None)
+
+
+def test_off_passes_through():
+    items = [1, 2, 3]
+    assert progress.track(items, len(items)) is items
+
+
+def test_reports_on_close(sink: RecordingSink):
+    assert sum(progress.track(range(100), 100, "count")) == 4950
+    assert sink.closed == ("count", 100, 100)
+
+
+def test_sampled_by_time(sink: RecordingSink, monkeypatch: pytest.MonkeyPatch):
+    # a clock which advances a second each time it's read
+    clock = iter(range(1 << 20))
+    monkeypatch.setattr(progress.time, "monotonic", lambda: next(clock))
+
+    list(progress.track(range(10)))
+    assert sink.updates == list(range(1, 11))
+
+
+def test_sampling_backs_off(sink: RecordingSink, monkeypatch: pytest.MonkeyPatch):
+    # a clock which never advances, so the stride between reads keeps doubling
+    reads = []
+    monkeypatch.setattr(progress.time, "monotonic", lambda: reads.append(0) or 0.0)
+
+    list(progress.track(range(1 << 16)))
+    assert sink.updates == []
+    assert sink.closed == ("progress", 1 << 16, None)
+    assert len(reads) < 20
+
+
+def test_json_sink():
+    out = io.StringIO()
+    progress.configure(JsonSink(out))
+    try:
+        list(progress.track("abc", 3, "letters"))
+    finally:
+        progress.configure(None)
+
+    report = json.loads(out.getvalue().splitlines()[-1])
+    assert (report["label"], report["done"], report["total"]) == ("letters", 3, 3)
+
+
+def test_auto_is_off_without_terminal():
+    assert progress.sink_for("auto", io.StringIO()) is None
+    assert progress.sink_for("off") is None
+
+
+def test_solution_reports(sink: RecordingSink):
+    assert solve("day16test", 2) == 1707
+    assert sink.closed is not None
+    assert sink.closed[0] == "partitions"
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+import search
+
+# A WIDTH x WIDTH grid of states, numbered row by row
+WIDTH = 20
+
+
+def grid_moves(state: int) -> list[int]:
+    row, col = divmod(state, WIDTH)
+    moves = []
+    if col > 0:
+        moves.append(state - 1)
+    if col < WIDTH - 1:
+        moves.append(state + 1)
+    if row > 0:
+        moves.append(state - WIDTH)
+    if row < WIDTH - 1:
+        moves.append(state + WIDTH)
+    return moves
+
+
+def manhattan(a: int, b: int) -> int:
+    return abs(a // WIDTH - b // WIDTH) + abs(a % WIDTH - b % WIDTH)
+
+
+def test_levels():
+    reached = list(search.levels(WIDTH * WIDTH, [0], grid_moves))
+    assert reached[:3] == [[0], [1, WIDTH], [2, WIDTH + 1, 2 * WIDTH]]
+    assert len(reached) == 2 * WIDTH - 1
+    assert sum(map(len, reached)) == WIDTH * WIDTH
+
+
+def test_bfs_nearest_of_many():
+    sources = [0, WIDTH - 1]
+    targets = {WIDTH * WIDTH - 1, (WIDTH - 1) * WIDTH}
+    assert search.bfs(WIDTH * WIDTH, sources, grid_moves, targets) == WIDTH - 1
+    assert search.bfs(WIDTH * WIDTH, sources, grid_moves, {0}) == 0
+
+
+def test_bfs_unreachable():
+    assert search.bfs(3, [0], lambda state: [1], {2}) is None
+
+
+def test_flood_blocked():
+    # a wall down the middle column, with a gap at the bottom
+    wall = [row * WIDTH + WIDTH // 2 for row in range(WIDTH - 1)]
+    reached = search.flood(WIDTH * WIDTH, [0], grid_moves, wall)
+    assert reached.count(1) == WIDTH * WIDTH - len(wall)
+    assert reached.count(2) == len(wall)
+
+    wall.append((WIDTH - 1) * WIDTH + WIDTH // 2)
+    reached = search.flood(WIDTH * WIDTH, [0], grid_moves, wall)
+    assert reached.count(1) == WIDTH * (WIDTH // 2)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_dijkstra_and_a_star(seed: int):
+    rng = random.Random(seed)
+    # entering each state costs between 1 and 9
+    costs = [rng.randint(1, 9) for _ in range(WIDTH * WIDTH)]
+
+    def edges(state: int) -> list[tuple[int, int]]:
+        return [(next_state, costs[next_state]) for next_state in grid_moves(state)]
+
+    def expected() -> int:
+        # Bellman-Ford, for something independent to compare against
+        best = [0] + [1 << 30] * (WIDTH * WIDTH - 1)
+        changed = True
+        while changed:
+            changed = False
+            for state in range(WIDTH * WIDTH):
+                for next_state, cost in edges(state):
+                    if best[state] + cost < best[next_state]:
+                        best[next_state] = best[state] + cost
+                        changed = True
+        return best[-1]
+
+    end = WIDTH * WIDTH - 1
+    found = search.dijkstra(WIDTH * WIDTH, [0], edges, {end})
+    assert found == expected()
+    assert found == search.dijkstra(
+        WIDTH * WIDTH, [0], edges, {end}, lambda state: manhattan(state, end)
+    )
+
+
+def test_dijkstra_unreachable():
+    assert search.dijkstra(3, [0], lambda state: [(1, 1)], {2}) is None
@@ -0,0 +1,80 @@
+from typing import Any
+
+import pytest
+
+import shard
+from cache import make_key
+from cli import adapt_input, get_mod, get_sol
+from conftest import DATA_DIR, day_of
+from fastio import MappedInput
+from shard import Shard
+
+
+def solve_shard(name: str, part: int, selected: Shard) -> dict[str, Any]:
+    day = day_of(name)
+    shard.configure(selected)
+    try:
+        with MappedInput.open(DATA_DIR / f"{name}.txt") as inp:
+            answer = get_sol(day, part)(adapt_input(day, inp))
+            key = make_key(day, part, inp.data, get_mod(day))
+    finally:
+        shard.configure()
+    combine = get_mod(day).SHARDS[part]
+    return shard.record(selected, key, combine, answer, answer)
+
+
+@pytest.mark.parametrize("s, expected", [("0/1", Shard(0, 1)), ("2/3", Shard(2, 3))])
+def test_parse(s: str, expected: Shard):
+    assert Shard.parse(s) == expected
+    assert str(expected) == s
+
+
+@pytest.mark.parametrize("s", ["1", "3/3", "-1/2", "a/b"])
+def test_parse_invalid(s: str):
+    with pytest.raises(ValueError):
+        Shard.parse(s)
+
+
+def test_select_partitions():
+    items = range(10)
+    assert shard.select(items) == items
+
+    selected = []
+    for index in range(3):
+        shard.configure(Shard(index, 3))
+        try:
+            selected.extend(shard.select(items))
+        finally:
+            shard.configure()
+    assert sorted(selected) == list(items)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 50])
+def test_day16_merged(count: int):
+    records = [solve_shard("day16test", 2, Shard(i, count)) for i in range(count)]
+    assert shard.merge(records) == (1707, 1707)
+
+
+def test_merge_combines():
+    def rec(index: int, answer: int) -> dict[str, Any]:
+        return {
+            "day": 19,
+            "part": 2,
+            "input_hash": "input",
+            "source_hash": "source",
+            "shard": f"{index}/3",
+            "combine": "prod",
+            "answer": answer,
+            "bound": answer + 1,
+        }
+
+    assert shard.merge([rec(2, 4), rec(0, 2), rec(1, 3)]) == (24, 60)
+
+    with pytest.raises(ValueError, match="missing"):
+        shard.merge([rec(0, 2), rec(1, 3)])
+    with pytest.raises(ValueError, match="more than once"):
+        shard.merge([rec(0, 2), rec(1, 3), rec(1, 3), rec(2, 4)])
+    with pytest.raises(ValueError, match="input_hash"):
+        shard.merge([rec(0, 2), rec(1, 3), rec(2, 4) | {"input_hash": "other"}])
+    with pytest.raises(ValueError, match="no shards"):
+        shard.merge([])
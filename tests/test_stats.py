@@ -0,0 +1,65 @@
+from typing import Iterator
+
+import pytest
+
+import executor
+import stats
+from conftest import solve
+
+
+@pytest.fixture
+def counting() -> Iterator[None]:
+    stats.enable()
+    try:
+        yield
+    finally:
+        stats.disable()
+        stats.reset()
+
+
+def count_item(item: int) -> int:
+    stats.add("items")
+    stats.peak("largest", item)
+    return item
+
+
+def test_off_by_default():
+    stats.add("items", 3)
+    assert stats.snapshot() == {"counters": {}, "peaks": {}}
+
+
+def test_merge(counting: None):
+    stats.add("items", 2)
+    stats.peak("largest", 5)
+    stats.merge({"counters": {"items": 3}, "peaks": {"largest": 4}})
+    assert stats.snapshot() == {"counters": {"items": 5}, "peaks": {"largest": 5}}
+
+
+@pytest.mark.parametrize("kind", executor.KINDS)
+def test_workers_merged(counting: None, kind: str):
+    executor.configure(kind, 2)
+    try:
+        assert sorted(executor.map_chunked(count_item, range(10), chunksize=3)) == list(
+            range(10)
+        )
+    finally:
+        executor.configure()
+
+    assert stats.snapshot() == {"counters": {"items": 10}, "peaks": {"largest": 9}}
+
+
+@pytest.mark.parametrize("day", [12, 16, 24])
+def test_searches_counted(counting: None, day: int):
+    solve(f"day{day}test", 1)
+
+    report = stats.report(1.0)
+    assert all(n > 0 for n in report["counters"].values())
+    assert report["counters"] and report["peaks"]
+    assert report["per_second"] == report["counters"]
+
+
+def test_day16_memo_hits(counting: None):
+    assert solve("day16test", 1) == 1651
+    counters = stats.snapshot()["counters"]
+    assert counters["day16.calls"] == 817
+    assert counters["day16.memo_hits"] == 415
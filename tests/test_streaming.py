@@ -0,0 +1,57 @@
+import io
+import json
+
+import pytest
+
+from cli import day_parts, get_mod, get_sol
+from conftest import DATA_DIR
+from fastio import MappedInput
+from streaming import iter_lines, run
+
+
+def stream_reports(day: int, text: bytes, interval: float) -> list[dict]:
+    out = io.StringIO()
+    run(get_mod(day).Stream(), io.BytesIO(text), day_parts(day), out, interval)
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+@pytest.mark.parametrize("day", [1, 2, 3, 4, 25])
+@pytest.mark.parametrize("suffix", ["", "test"])
+def test_final_matches_parts(day: int, suffix: str):
+    path = DATA_DIR / f"day{day}{suffix}.txt"
+    text = path.read_bytes()
+    final = stream_reports(day, text, interval=60)[-1]
+
+    assert final["lines"] == len(text.splitlines())
+    # every streamable day takes the mapped input, which can be read repeatedly
+    with MappedInput.open(path) as inp:
+        for part in day_parts(day):
+            assert final[f"part{part}"] == get_sol(day, part)(inp)
+
+
+def test_running_answers():
+    text = (DATA_DIR / "day1test.txt").read_bytes()
+    reports = stream_reports(1, text, interval=0)
+
+    assert [r["lines"] for r in reports] == list(range(1, 15))
+    # the first elf's items are 1000, 2000 and 3000
+    assert [r["part1"] for r in reports[:3]] == [1000, 3000, 6000]
+    assert reports[-1] == {"lines": 14, "part1": 24000, "part2": 45000}
+
+
+def test_partial_last_line():
+    f = io.BytesIO(b"a\r\nb\nc")
+    assert list(iter_lines(f, follow=False, poll_interval=0)) == [b"a", b"b", b"c"]
+
+
+def test_follow_waits_for_newline():
+    f = io.BytesIO(b"a\nb")
+    lines = iter_lines(f, follow=True, poll_interval=0)
+    assert next(lines) == b"a"
+    assert next(lines) is None
+
+    pos = f.tell()
+    f.seek(0, io.SEEK_END)
+    f.write(b"c\n")
+    f.seek(pos)
+    assert next(lines) == b"bc"